@@ -20,7 +20,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-from app.routes import upload, analysis, auth
+from app.routes import upload, analysis, auth, admin, jobs
+from app.services.ocr_engine import shutdown_ocr_engine
+from app.services.executor import shutdown_pools
+from app.services.jobs import job_manager
+from app.services.retention import retention_manager
+from app.services.prewarm import cancel_prewarm
+from app.services.llm_client import llm_clients
 
 logger.info("TIPSMAX 1.0 Backend 시작 중...")
 
@@ -70,13 +76,33 @@ async def log_requests(request: Request, call_next):
 try:
     app.include_router(upload.router, prefix="/api", tags=["upload"])
     app.include_router(analysis.router, prefix="/api", tags=["analysis"])
+    app.include_router(jobs.router, prefix="/api", tags=["jobs"])
     app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(admin.router, prefix="/api", tags=["admin"])
     logger.info("라우트 등록 완료")
 except Exception as e:
     logger.error(f"라우트 등록 오류: {e}", exc_info=True)
     raise
 
 
+@app.on_event("startup")
+async def start_background_tasks():
+    """업로드/캐시 보존 정책 정리 시작"""
+    retention_manager.attach_upload_sessions(upload.upload_sessions)
+    retention_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    """분석 작업 워커, 보존 정책 정리, 미리 계산, 작업 풀, LLM 연결 풀 및 OCR 워커 프로세스 정리"""
+    await retention_manager.stop()
+    await cancel_prewarm()
+    await job_manager.shutdown()
+    await llm_clients.aclose()
+    shutdown_pools()
+    shutdown_ocr_engine()
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 
 class TipsCategoryScore(BaseModel):
@@ -27,9 +27,30 @@ class AnalysisResult(BaseModel):
 
 class AnalysisRequest(BaseModel):
     file_id: str
+    force_refresh: bool = False  # True이면 저장된 결과/LLM 응답 캐시를 쓰지 않고 다시 분석
 
 
 class UploadResponse(BaseModel):
     file_id: str
     filename: str
     file_size: int
+    sha256: Optional[str] = None
+    deduplicated: bool = False  # 같은 내용의 파일이 이미 업로드되어 있었는지
+    ref_id: Optional[str] = None  # 이 업로드의 참조 토큰 (DELETE /upload/{file_id}?ref_id=...에 필요)
+
+
+class BatchUploadItem(BaseModel):
+    filename: str
+    file_id: Optional[str] = None
+    file_size: Optional[int] = None
+    sha256: Optional[str] = None
+    deduplicated: bool = False
+    ref_id: Optional[str] = None
+    status_code: int = 200
+    error: Optional[str] = None  # 실패한 경우 사유
+
+
+class BatchUploadResponse(BaseModel):
+    files: List[BatchUploadItem]
+    succeeded: int
+    failed: int
@@ -0,0 +1,71 @@
+"""
+관리용 라우트
+작업 풀, 캐시, 열린 PDF 메모리 맵, 저장 공간 상태 조회
+
+설정 (환경 변수):
+- ADMIN_TOKEN: 관리용 라우트 접근 토큰, 요청 헤더 X-Admin-Token으로 전달
+  (설정하지 않으면 관리용 라우트 전체 비활성화)
+"""
+
+import os
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.services.executor import pool_stats
+from app.services.llm_client import llm_clients
+from app.services.page_cache import page_text_cache
+from app.services.llm_cache import llm_response_cache
+from app.services.pdf_document import pdf_mapping_stats
+from app.services.retention import retention_manager
+from app.services.prewarm import prewarm_stats
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """X-Admin-Token 헤더 확인 (ADMIN_TOKEN이 없으면 항상 거부)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리용 API가 비활성화되어 있습니다.")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+def _cache_stats() -> dict:
+    # 디스크 캐시 통계는 디렉터리를 훑을 수 있으므로 스레드에서 실행
+    return {"page_text": page_text_cache.stats(), "llm": llm_response_cache.stats(), "prewarm": prewarm_stats()}
+
+
+@router.get("/admin/executor")
+async def executor_status():
+    """작업 풀별 대기열 길이, 대기/실행 시간 지표 (llm: 비동기 LLM 호출 동시성 지표)"""
+    return {**pool_stats(), "llm": llm_clients.stats()}
+
+
+@router.get("/admin/cache")
+async def cache_status():
+    """페이지 텍스트/LLM 응답 캐시 적중률 및 사용량, 업로드 직후 미리 계산 현황"""
+    return await asyncio.to_thread(_cache_stats)
+
+
+@router.get("/admin/pdf")
+async def pdf_status():
+    """열려 있는 PDF 메모리 맵별 크기, 공유 중인 핸들 수, 상주 메모리(RSS)"""
+    return await asyncio.to_thread(pdf_mapping_stats)
+
+
+@router.get("/admin/storage")
+async def storage_status():
+    """업로드/캐시 사용량, 보존 정책, 정리 통계"""
+    return await asyncio.to_thread(retention_manager.status)
+
+
+@router.post("/admin/storage/sweep")
+async def storage_sweep():
+    """보존 정책 즉시 적용"""
+    return await asyncio.to_thread(retention_manager.run_once)
@@ -2,11 +2,14 @@
 분석 라우트
 """
 
-import os
+import json
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.models.analysis import AnalysisRequest, AnalysisResult
@@ -15,12 +18,62 @@ from app.services.llm_analyzer import LLMAnalyzer
 from app.services.business_registration_extractor import extract_business_registration_fields
 from app.services.shareholder_extractor import extract_shareholder_fields
 from app.services.financial_statement_extractor import extract_financial_statement_fields
+from app.services.executor import run_in_pool, PoolSaturatedError
+from app.services.progress import report_progress, progress_reporter, STAGE_LLM
+from app.services.pdf_document import pdf_document_scope
+from app.services.upload_index import upload_index
+from app.services.document_classifier import (
+    KIND_BUSINESS_REGISTRATION,
+    KIND_FINANCIAL_STATEMENT,
+    KIND_SHAREHOLDER,
+    classify_document,
+    parse_company_name,
+)
 
 router = APIRouter()
-UPLOAD_DIR = "uploads"
 logger = logging.getLogger(__name__)
 
 
+def find_uploaded_file(file_id: str) -> tuple[Optional[str], Optional[str]]:
+    """업로드된 파일의 로컬 경로와 확장자 반환 (없으면 (None, None))"""
+    record = upload_index.resolve(file_id)
+    if record is None:
+        return None, None
+    return record.path, record.ext
+
+
+async def resolve_uploaded_file(file_id: str) -> tuple[str, str]:
+    """
+    업로드된 파일의 로컬 경로와 확장자 반환 (없으면 404).
+    S3 저장소면 이 노드의 스필 캐시로 내려받으므로 스레드에서 실행.
+    """
+    file_path, file_ext = await asyncio.to_thread(find_uploaded_file, file_id)
+    if not file_path:
+        logger.error(f"파일을 찾을 수 없음: {file_id}")
+        raise HTTPException(
+            status_code=404,
+            detail="파일을 찾을 수 없습니다."
+        )
+    return file_path, file_ext
+
+
+async def _reuse_result(file_id: str, kind: str) -> Optional[dict]:
+    """같은 내용의 파일에 대해 이전에 저장된 분석 결과 반환 (SQLite 조회는 스레드에서 실행)"""
+    cached = await asyncio.to_thread(upload_index.get_result, file_id, kind)
+    if cached is not None:
+        logger.info(f"저장된 분석 결과 재사용: {file_id} ({kind})")
+    return cached
+
+
+async def _store_result(file_id: str, kind: str, result) -> None:
+    await asyncio.to_thread(upload_index.put_result, file_id, kind, jsonable_encoder(result))
+
+
+def _pool_saturated(e: PoolSaturatedError) -> HTTPException:
+    """작업 대기열이 가득 찬 경우 503 응답"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
 class BusinessRegistrationRequest(BaseModel):
     file_id: str
     filename: Optional[str] = None  # 파일명 추가 (기업명 추출용)
@@ -63,6 +116,17 @@ class FinancialStatementResult(BaseModel):
     revenue: Optional[str] = None  # 매출액
 
 
+class AutoAnalysisRequest(BaseModel):
+    file_id: str
+    filename: Optional[str] = None  # 없으면 업로드 시 파일명 사용
+
+
+class AutoAnalysisResult(BaseModel):
+    kind: str  # business-registration | shareholder | financial-statement | general
+    confidence: Optional[float] = None  # 업로드 시 분류 결과를 쓴 경우 None
+    result: Any
+
+
 @router.post("/analyze", response_model=AnalysisResult)
 async def analyze_document(request: AnalysisRequest):
     """문서 분석 엔드포인트"""
@@ -70,26 +134,19 @@ async def analyze_document(request: AnalysisRequest):
     file_id = request.file_id
     
     # 업로드된 파일 찾기
-    file_path = None
-    file_ext = None
-    
-    for ext in [".pdf", ".docx", ".doc", ".txt"]:
-        candidate_path = os.path.join(UPLOAD_DIR, f"{file_id}{ext}")
-        if os.path.exists(candidate_path):
-            file_path = candidate_path
-            file_ext = ext
-            break
+    file_path, file_ext = await resolve_uploaded_file(file_id)
     
-    if not file_path:
-        raise HTTPException(
-            status_code=404,
-            detail="파일을 찾을 수 없습니다."
-        )
+    analyzer = LLMAnalyzer()
+    result_kind = f"analysis:{analyzer.provider}:{analyzer.model}"
+    cached = None if request.force_refresh else await _reuse_result(file_id, result_kind)
+    if cached is not None:
+        return AnalysisResult(**cached)
     
     try:
         # 문서 파싱
         parser = DocumentParser()
-        document_text = parser.parse(file_path, file_ext)
+        with pdf_document_scope():
+            document_text = await run_in_pool("ocr", parser.parse, file_path, file_ext)
         
         if not document_text or len(document_text.strip()) < 100:
             raise HTTPException(
@@ -98,11 +155,18 @@ async def analyze_document(request: AnalysisRequest):
             )
         
         # LLM 분석
-        analyzer = LLMAnalyzer()
-        result = analyzer.analyze(document_text)
+        report_progress(STAGE_LLM, status="started", provider=analyzer.provider)
+        result = await analyzer.analyze_async(document_text, force_refresh=request.force_refresh)
+        report_progress(STAGE_LLM, status="completed", provider=analyzer.provider)
+        
+        # Mock 결과(API 키 없음/호출 실패)와 일부 구간이 실패한 결과는 재사용하지 않음
+        if analyzer.reusable:
+            await _store_result(file_id, result_kind, result)
         
         return result
     
+    except PoolSaturatedError as e:
+        raise _pool_saturated(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -112,6 +176,92 @@ async def analyze_document(request: AnalysisRequest):
         )
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_document_stream(request: AnalysisRequest):
+    """
+    문서 분석 SSE 스트림 (POST 본문은 /analyze와 동일).
+    event: progress - 파싱/OCR/LLM 단계 진행 상황
+    event: field    - 완성된 결과 필드 ({"name": "companySummary", "value": ...}), 생성되는 순서대로
+    event: result   - 전체 AnalysisResult
+    event: error    - 오류 ({"status_code", "detail"})
+    """
+    file_id = request.file_id
+    file_path, file_ext = await resolve_uploaded_file(file_id)
+
+    analyzer = LLMAnalyzer()
+    result_kind = f"analysis:{analyzer.provider}:{analyzer.model}"
+    cached = None if request.force_refresh else await _reuse_result(file_id, result_kind)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        # 작업 풀 스레드에서 보고되는 진행 상황도 이벤트 루프의 큐로 전달
+        with progress_reporter(lambda event: loop.call_soon_threadsafe(queue.put_nowait, ("progress", event))):
+            try:
+                if cached is not None:
+                    result = AnalysisResult(**cached)
+                    for name, value in result.dict().items():
+                        await queue.put(("field", {"name": name, "value": value}))
+                    await queue.put(("result", result))
+                    return
+
+                parser = DocumentParser()
+                with pdf_document_scope():
+                    document_text = await run_in_pool("ocr", parser.parse, file_path, file_ext)
+                if not document_text or len(document_text.strip()) < 100:
+                    raise HTTPException(status_code=400, detail="문서에서 충분한 텍스트를 추출할 수 없습니다.")
+
+                report_progress(STAGE_LLM, status="started", provider=analyzer.provider)
+                result = None
+                async for event in analyzer.analyze_stream(document_text, force_refresh=request.force_refresh):
+                    if event["type"] == "field":
+                        await queue.put(("field", {"name": event["name"], "value": event["value"]}))
+                    else:
+                        result = event["result"]
+                if result is None:
+                    # 스트림이 결과 없이 끝나면 저장하지 않고 오류로 알림
+                    raise HTTPException(status_code=502, detail="분석 결과를 받지 못했습니다.")
+                report_progress(STAGE_LLM, status="completed", provider=analyzer.provider)
+
+                # Mock 결과(API 키 없음)와 일부 구간이 실패한 결과는 재사용하지 않음
+                if analyzer.reusable:
+                    await _store_result(file_id, result_kind, result)
+                await queue.put(("result", result))
+            except HTTPException as e:
+                await queue.put(("error", {"status_code": e.status_code, "detail": e.detail}))
+            except PoolSaturatedError as e:
+                await queue.put(("error", {"status_code": 503, "detail": str(e)}))
+            except Exception as e:
+                logger.error(f"스트리밍 분석 오류: {e}", exc_info=True)
+                await queue.put(("error", {"status_code": 500, "detail": f"분석 중 오류가 발생했습니다: {str(e)}"}))
+            finally:
+                await queue.put(None)
+
+    async def event_stream():
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                event, data = item
+                yield _sse(event, data)
+        finally:
+            # 클라이언트가 연결을 끊으면 LLM 스트리밍도 중단
+            task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/analyze/business-registration", response_model=BusinessRegistrationResult)
 async def analyze_business_registration(request: BusinessRegistrationRequest):
     """사업자등록증에서 개업연월일 및 본점소재지를 추출하는 엔드포인트"""
@@ -120,48 +270,23 @@ async def analyze_business_registration(request: BusinessRegistrationRequest):
     filename = request.filename or ""
 
     # 파일명에서 기업명 추출 ("사업자등록증_" 뒤의 부분, 첫 번째 언더바까지만)
-    company_name = None
-    if filename:
-        # "사업자등록증_기업명_2025.pdf" 형식에서 기업명 추출
-        # 예: "사업자등록증_아크론에코_2025" → "아크론에코"
-        import re
-        # 파일 확장자 제거
-        name_without_ext = os.path.splitext(filename)[0]
-        # "사업자등록증_" 또는 "사업자등록증 "으로 시작하는지 확인
-        # 첫 번째 언더바 이후 부분에서, 다음 언더바 전까지 추출
-        match = re.search(r'사업자등록증[_\s]+([^_]+)', name_without_ext, re.IGNORECASE)
-        if match:
-            # 첫 번째 언더바 이후 부분에서, 다음 언더바 전까지
-            company_name = match.group(1).strip()
-        else:
-            # "사업자등록증_"이 없으면 전체 파일명 사용 (확장자 제외)
-            # 하지만 언더바가 있으면 첫 번째 언더바까지만
-            if '_' in name_without_ext:
-                company_name = name_without_ext.split('_')[0]
-            else:
-                company_name = name_without_ext
-
-    # 업로드된 파일 찾기 (기존 로직 재사용)
-    file_path = None
-    file_ext = None
-
-    for ext in [".pdf", ".docx", ".doc", ".txt"]:
-        candidate_path = os.path.join(UPLOAD_DIR, f"{file_id}{ext}")
-        if os.path.exists(candidate_path):
-            file_path = candidate_path
-            file_ext = ext
-            break
+    company_name = parse_company_name(filename)
 
-    if not file_path:
-        raise HTTPException(
-            status_code=404,
-            detail="파일을 찾을 수 없습니다."
-        )
+    # 업로드된 파일 찾기
+    file_path, file_ext = await resolve_uploaded_file(file_id)
+
+    # 기업명은 파일명에서 오므로 문서 내용에서 추출한 필드만 재사용
+    cached = await _reuse_result(file_id, "business-registration")
+    if cached is not None:
+        return BusinessRegistrationResult(**cached, company_name=company_name)
 
     try:
         parser = DocumentParser()
         # 사업자등록증은 OCR 전용, 상단 50%만 분석
-        document_text = parser.parse(file_path, file_ext, ocr_only=True, top_half_only=True)
+        with pdf_document_scope():
+            document_text = await run_in_pool(
+                "ocr", parser.parse, file_path, file_ext, ocr_only=True, top_half_only=True
+            )
 
         if not document_text or len(document_text.strip()) < 10:
             raise HTTPException(
@@ -178,11 +303,16 @@ async def analyze_business_registration(request: BusinessRegistrationRequest):
         logger.info(f"사업자등록증 텍스트 앞 500자:\n{document_text[:500]}")
         
         fields = extract_business_registration_fields(document_text)
+        # 아무 필드도 찾지 못한 결과(OCR 실패 등)는 저장하지 않아 다음 요청에서 다시 시도
+        if any(value is not None for value in fields.values()):
+            await _store_result(file_id, "business-registration", fields)
         fields["company_name"] = company_name
         logger.info(f"추출된 필드: {fields}")
         
         return BusinessRegistrationResult(**fields)
 
+    except PoolSaturatedError as e:
+        raise _pool_saturated(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -199,40 +329,31 @@ async def analyze_shareholder(request: ShareholderRequest):
     file_id = request.file_id
 
     # 업로드된 파일 찾기
-    file_path = None
-    file_ext = None
-
-    for ext in [".pdf", ".docx", ".doc", ".txt"]:
-        candidate_path = os.path.join(UPLOAD_DIR, f"{file_id}{ext}")
-        if os.path.exists(candidate_path):
-            file_path = candidate_path
-            file_ext = ext
-            break
+    file_path, file_ext = await resolve_uploaded_file(file_id)
 
-    if not file_path:
-        raise HTTPException(
-            status_code=404,
-            detail="파일을 찾을 수 없습니다."
-        )
+    cached = await _reuse_result(file_id, "shareholder")
+    if cached is not None:
+        return ShareholderResult(**cached)
 
     try:
-        parser = DocumentParser()
-        document_text = parser.parse(file_path, file_ext)
-
-        if not document_text or len(document_text.strip()) < 10:
-            raise HTTPException(
-                status_code=400,
-                detail="문서에서 텍스트를 추출할 수 없습니다."
-            )
-
-        # 디버깅: 추출된 텍스트의 일부를 로그로 출력
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"주주명부 텍스트 길이: {len(document_text)}")
-        logger.info(f"주주명부 텍스트 앞 500자:\n{document_text[:500]}")
+        with pdf_document_scope():
+            parser = DocumentParser()
+            document_text = await run_in_pool("ocr", parser.parse, file_path, file_ext)
+
+            if not document_text or len(document_text.strip()) < 10:
+                raise HTTPException(
+                    status_code=400,
+                    detail="문서에서 텍스트를 추출할 수 없습니다."
+                )
+
+            # 디버깅: 추출된 텍스트의 일부를 로그로 출력
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.info(f"주주명부 텍스트 길이: {len(document_text)}")
+            logger.info(f"주주명부 텍스트 앞 500자:\n{document_text[:500]}")
         
-        # 주주명부 추출 (파일 경로와 텍스트 둘 다 전달)
-        result = extract_shareholder_fields(file_path, file_ext, document_text)
+            # 주주명부 추출 (파일 경로와 텍스트 둘 다 전달)
+            result = await run_in_pool("ocr", extract_shareholder_fields, file_path, file_ext, document_text)
         logger.info(f"추출된 주주 수: {len(result['shareholders'])}")
         logger.info(f"추출된 주주 목록: {result['shareholders']}")
         
@@ -241,9 +362,14 @@ async def analyze_shareholder(request: ShareholderRequest):
             ShareholderItem(name=item["name"], share_ratio=item["share_ratio"])
             for item in result["shareholders"]
         ]
+        shareholder_result = ShareholderResult(shareholders=shareholder_items)
+        if shareholder_items:
+            await _store_result(file_id, "shareholder", shareholder_result)
         
-        return ShareholderResult(shareholders=shareholder_items)
+        return shareholder_result
 
+    except PoolSaturatedError as e:
+        raise _pool_saturated(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -273,35 +399,20 @@ async def analyze_financial_statement(request: FinancialStatementRequest):
     file_id = request.file_id
 
     # 업로드된 파일 찾기
-    file_path = None
-    file_ext = None
+    file_path, file_ext = await resolve_uploaded_file(file_id)
+    logger.info(f"파일 찾음: {file_path}")
+    print(f"파일 찾음: {file_path}")
 
-    logger.info(f"파일 찾기 시작: {file_id}")
-    print(f"파일 찾기 시작: {file_id}")
-    
-    for ext in [".pdf", ".docx", ".doc", ".txt"]:
-        candidate_path = os.path.join(UPLOAD_DIR, f"{file_id}{ext}")
-        logger.info(f"확인 중: {candidate_path}")
-        if os.path.exists(candidate_path):
-            file_path = candidate_path
-            file_ext = ext
-            logger.info(f"파일 찾음: {file_path}")
-            print(f"파일 찾음: {file_path}")
-            break
-
-    if not file_path:
-        logger.error(f"파일을 찾을 수 없음: {file_id}")
-        print(f"파일을 찾을 수 없음: {file_id}")
-        raise HTTPException(
-            status_code=404,
-            detail="파일을 찾을 수 없습니다."
-        )
+    cached = await _reuse_result(file_id, "financial-statement")
+    if cached is not None:
+        return FinancialStatementResult(**cached)
 
     try:
         logger.info("재무제표 페이지 분류 시작...")
         print("재무제표 페이지 분류 시작...")
         # 재무제표 페이지 분류 (텍스트 파싱 없이 직접 PDF 분석)
-        result = extract_financial_statement_fields(file_path, file_ext, None)
+        with pdf_document_scope():
+            result = await run_in_pool("ocr", extract_financial_statement_fields, file_path, file_ext, None)
         logger.info(f"분류된 페이지 수: {len(result['pages'])}")
         logger.info(f"페이지 분류 결과: {result['pages']}")
         logger.info(f"매출액: {result.get('revenue')}")
@@ -335,11 +446,19 @@ async def analyze_financial_statement(request: FinancialStatementRequest):
         logger.info(f"최종 반환할 매출액: {revenue}")
         print(f"최종 반환할 매출액: {revenue}")
         
-        return FinancialStatementResult(
+        financial_result = FinancialStatementResult(
             pages=page_items,
             revenue=revenue
         )
+        # 추출기는 내부 오류 시 빈 목록을 반환하므로 결과가 있을 때만 저장
+        if page_items:
+            await _store_result(file_id, "financial-statement", financial_result)
+        
+        return financial_result
 
+    except PoolSaturatedError as e:
+        logger.warning(f"재무제표 분석 거절: {e}")
+        raise _pool_saturated(e)
     except ValueError as e:
         logger.error(f"재무제표 분석 오류 (ValueError): {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -349,3 +468,48 @@ async def analyze_financial_statement(request: FinancialStatementRequest):
             status_code=500,
             detail=f"재무제표 분석 중 오류가 발생했습니다: {str(e)}"
         )
+
+
+async def classify_uploaded_file(file_id: str, filename: Optional[str] = None) -> tuple[str, Optional[float]]:
+    """
+    업로드된 파일의 문서 종류 반환.
+    업로드 시 분류해 둔 종류가 있으면 그대로 사용하고, 없으면 지금 분류해서 인덱스에 기록.
+    """
+    file_path, file_ext = await resolve_uploaded_file(file_id)
+    record = await asyncio.to_thread(upload_index.get, file_id)
+    if record is not None and record.doc_kind:
+        return record.doc_kind, None
+
+    filename = filename or (record.filename if record else None)
+    with pdf_document_scope():
+        classification = await run_in_pool("ocr", classify_document, file_path, file_ext, filename)
+    await asyncio.to_thread(upload_index.update_metadata, file_id, doc_kind=classification.kind)
+    return classification.kind, classification.confidence
+
+
+@router.post("/analyze/auto", response_model=AutoAnalysisResult)
+async def analyze_auto(request: AutoAnalysisRequest):
+    """문서 종류를 판별해서 알맞은 추출기로 분석하는 엔드포인트"""
+
+    try:
+        kind, confidence = await classify_uploaded_file(request.file_id, request.filename)
+    except PoolSaturatedError as e:
+        raise _pool_saturated(e)
+    logger.info(f"자동 분석: {request.file_id} → {kind}")
+
+    if kind == KIND_BUSINESS_REGISTRATION:
+        filename = request.filename
+        if not filename:
+            record = await asyncio.to_thread(upload_index.get, request.file_id)
+            filename = record.filename if record else None
+        result = await analyze_business_registration(
+            BusinessRegistrationRequest(file_id=request.file_id, filename=filename)
+        )
+    elif kind == KIND_SHAREHOLDER:
+        result = await analyze_shareholder(ShareholderRequest(file_id=request.file_id))
+    elif kind == KIND_FINANCIAL_STATEMENT:
+        result = await analyze_financial_statement(FinancialStatementRequest(file_id=request.file_id))
+    else:
+        result = await analyze_document(AnalysisRequest(file_id=request.file_id))
+
+    return AutoAnalysisResult(kind=kind, confidence=confidence, result=result)
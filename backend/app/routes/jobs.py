@@ -0,0 +1,131 @@
+"""
+분석 작업(Job) 라우트
+분석 요청을 백그라운드 작업으로 등록하고 상태/진행 상황(SSE)을 조회
+"""
+
+import json
+import logging
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.models.analysis import AnalysisRequest
+from app.routes.analysis import (
+    AutoAnalysisRequest,
+    BusinessRegistrationRequest,
+    FinancialStatementRequest,
+    ShareholderRequest,
+    analyze_auto,
+    analyze_business_registration,
+    analyze_document,
+    analyze_financial_statement,
+    analyze_shareholder,
+    resolve_uploaded_file,
+)
+from app.services.jobs import Job, job_manager
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# SSE 연결 유지용 heartbeat 간격 (초)
+SSE_HEARTBEAT_SECONDS = 15
+
+JobKind = Literal["analysis", "business-registration", "shareholder", "financial-statement", "auto"]
+
+
+class JobCreateRequest(BaseModel):
+    file_id: str
+    kind: JobKind
+    filename: Optional[str] = None  # 사업자등록증 기업명 추출용
+    force_refresh: bool = False  # 문서 분석: 저장된 결과/LLM 응답 캐시를 쓰지 않고 다시 분석
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    file_id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+def _build_runner(request: JobCreateRequest):
+    """작업 종류에 맞는 분석 엔드포인트 로직을 그대로 실행하는 runner 생성"""
+    if request.kind == "analysis":
+        return lambda: analyze_document(
+            AnalysisRequest(file_id=request.file_id, force_refresh=request.force_refresh)
+        )
+    if request.kind == "business-registration":
+        return lambda: analyze_business_registration(
+            BusinessRegistrationRequest(file_id=request.file_id, filename=request.filename)
+        )
+    if request.kind == "auto":
+        return lambda: analyze_auto(AutoAnalysisRequest(file_id=request.file_id, filename=request.filename))
+    if request.kind == "shareholder":
+        return lambda: analyze_shareholder(ShareholderRequest(file_id=request.file_id))
+    return lambda: analyze_financial_statement(FinancialStatementRequest(file_id=request.file_id))
+
+
+def _to_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        file_id=job.file_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        progress=job.progress,
+        result=jsonable_encoder(job.result) if job.result is not None else None,
+        error=job.error,
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(request: JobCreateRequest):
+    """분석 작업 등록 (즉시 job id 반환)"""
+    await resolve_uploaded_file(request.file_id)
+
+    job = job_manager.submit(request.kind, request.file_id, _build_runner(request))
+    logger.info(f"분석 작업 등록: {job.id} ({request.kind}, 파일 ID: {request.file_id})")
+    return _to_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """작업 상태 및 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _to_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    작업 진행 상황 SSE 스트림.
+    event: status   - queued / running / succeeded / failed
+    event: progress - 단계(render, ocr, classify, extract, llm)와 페이지 번호
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+
+    async def event_stream():
+        async for event in job_manager.subscribe(job_id, heartbeat_seconds=SSE_HEARTBEAT_SECONDS):
+            if event["type"] == "heartbeat":
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,51 +3,328 @@
 """
 
 import os
-import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import re
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import JSONResponse
-from app.models.analysis import UploadResponse
-import aiofiles
+from pydantic import BaseModel
+from app.models.analysis import UploadResponse, BatchUploadItem, BatchUploadResponse
+from app.services.upload_stream import (
+    save_upload_stream,
+    inspect_file,
+    StoredUpload,
+    UploadTooLargeError,
+    FileTypeMismatchError,
+)
+from app.services.upload_index import upload_index
+from app.services.storage import storage
+from app.services.prewarm import schedule_prewarm
+from app.services.upload_sessions import (
+    UploadSessionStore,
+    UploadSessionError,
+    UPLOAD_SESSION_CHUNK_SIZE,
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# 업로드 디렉토리
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# 업로드 임시 파일 디렉토리 (저장소로 옮기기 쉽도록 저장소가 정한 로컬 디렉토리 사용)
+UPLOAD_DIR = storage.staging_dir
 
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# 단일 요청 업로드 최대 크기
+MAX_FILE_SIZE = int(float(os.getenv("MAX_UPLOAD_SIZE_MB", "10")) * 1024 * 1024)
+# 재개 가능한 업로드(세션) 최대 크기 (감사보고서, 스캔 주주명부 등 큰 파일용)
+MAX_RESUMABLE_FILE_SIZE = int(float(os.getenv("MAX_RESUMABLE_UPLOAD_SIZE_MB", "200")) * 1024 * 1024)
+
+# 배치 업로드: 요청당 최대 파일 수, 동시에 저장하는 파일 수
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "20"))
+UPLOAD_BATCH_CONCURRENCY = int(os.getenv("UPLOAD_BATCH_CONCURRENCY", "4"))
+
+upload_sessions = UploadSessionStore(os.path.join(UPLOAD_DIR, ".sessions"))
+
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadSessionCreateRequest(BaseModel):
+    filename: str
+    size: int
+    sha256: Optional[str] = None  # 지정하면 finalize 시 전체 파일 해시와 비교
+
+
+def _validate_extension(filename: str) -> str:
+    """파일 확장자 검증 후 반환"""
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 파일 형식입니다. 허용 형식: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return file_ext
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"파일 크기가 너무 큽니다. 최대 크기: {max_bytes / 1024 / 1024}MB"
+    )
+
+
+def _finalizing_conflict() -> HTTPException:
+    return HTTPException(status_code=409, detail="이미 완료 처리 중인 업로드 세션입니다.")
+
+
+def _count_pdf_pages(file_path: str) -> Optional[int]:
+    """PDF 페이지 수 (열 수 없는 PDF면 None)"""
+    try:
+        with fitz.open(file_path) as doc:
+            return len(doc)
+    except Exception as e:
+        logger.warning(f"PDF 페이지 수 확인 실패: {e}")
+        return None
 
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_file(file: UploadFile = File(...)):
     """파일 업로드 엔드포인트"""
     
-    # 파일 확장자 검증
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
+    return await _store_upload(file)
+
+
+async def _store_upload(file: UploadFile) -> UploadResponse:
+    """업로드 파일 하나를 검증/저장/등록 (실패 시 HTTPException)"""
+    file_ext = _validate_extension(file.filename)
+    
+    # 파일 저장 (청크 단위 스트리밍: 크기 제한/해시/형식 검사를 저장과 동시에 수행)
+    try:
+        stored = await save_upload_stream(
+            file,
+            UPLOAD_DIR,
+            None,
+            max_bytes=MAX_FILE_SIZE,
+            extension=file_ext,
+        )
+    except UploadTooLargeError:
+        raise _too_large(MAX_FILE_SIZE)
+    except FileTypeMismatchError:
         raise HTTPException(
             status_code=400,
-            detail=f"지원하지 않는 파일 형식입니다. 허용 형식: {', '.join(ALLOWED_EXTENSIONS)}"
+            detail=f"파일 내용이 확장자({file_ext})와 일치하지 않습니다."
         )
+    finally:
+        await file.close()
     
-    # 파일 크기 검증
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
+    return await _register_stored_upload(stored, file_ext, file.filename)
+
+
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_files_batch(files: List[UploadFile] = File(...)):
+    """
+    여러 파일을 한 번에 업로드 (사업자등록증, 주주명부, 재무제표, IR 자료 등).
+    파일별로 동시에 저장하고, 실패한 파일은 해당 항목의 error에 사유를 담아 반환.
+    """
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
         raise HTTPException(
             status_code=400,
-            detail=f"파일 크기가 너무 큽니다. 최대 크기: {MAX_FILE_SIZE / 1024 / 1024}MB"
+            detail=f"한 번에 업로드할 수 있는 파일은 최대 {UPLOAD_BATCH_MAX_FILES}개입니다."
         )
-    
-    # 파일 저장
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_ext}")
-    
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(file_content)
+
+    semaphore = asyncio.Semaphore(UPLOAD_BATCH_CONCURRENCY)
+
+    async def store(file: UploadFile) -> BatchUploadItem:
+        async with semaphore:
+            try:
+                result = await _store_upload(file)
+                return BatchUploadItem(
+                    filename=result.filename,
+                    file_id=result.file_id,
+                    file_size=result.file_size,
+                    sha256=result.sha256,
+                    deduplicated=result.deduplicated,
+                    ref_id=result.ref_id,
+                )
+            except HTTPException as e:
+                return BatchUploadItem(filename=file.filename, status_code=e.status_code, error=e.detail)
+            except Exception as e:
+                logger.error(f"배치 업로드 실패 ({file.filename}): {e}", exc_info=True)
+                return BatchUploadItem(filename=file.filename, status_code=500, error="파일 업로드 중 오류가 발생했습니다.")
+
+    items = await asyncio.gather(*(store(file) for file in files))
+    return BatchUploadResponse(
+        files=list(items),
+        succeeded=sum(1 for item in items if item.error is None),
+        failed=sum(1 for item in items if item.error is not None),
+    )
+
+
+def _register_in_storage(stored: StoredUpload, file_ext: str, filename: str) -> tuple[str, str, bool, str]:
+    """저장소에 넣고 인덱스에 등록 (동기 함수, S3 업로드가 있으므로 스레드에서 실행)"""
+    # 내용 해시를 file_id로 사용: 같은 파일은 기존 저장본과 분석 결과를 공유
+    file_id, file_path, deduplicated, ref_id = upload_index.register_upload(
+        stored.path, stored.sha256, file_ext, stored.size,
+        filename=filename, detected_type=stored.detected_type,
+    )
+    if not deduplicated and file_ext == ".pdf":
+        upload_index.update_metadata(file_id, page_count=_count_pdf_pages(file_path))
+    return file_id, file_path, deduplicated, ref_id
+
+
+async def _register_stored_upload(stored: StoredUpload, file_ext: str, filename: str) -> UploadResponse:
+    """저장이 끝난 임시 파일을 업로드 인덱스에 등록하고 응답 생성"""
+    try:
+        file_id, file_path, deduplicated, ref_id = await asyncio.to_thread(
+            _register_in_storage, stored, file_ext, filename
+        )
+    except Exception:
+        if os.path.exists(stored.path):
+            os.remove(stored.path)
+        raise
+    # 문서 종류 분류 및 페이지 텍스트/OCR 캐시 미리 채우기 (백그라운드)
+    schedule_prewarm(file_path, file_ext, file_id=file_id, filename=filename)
     
     return UploadResponse(
         file_id=file_id,
-        filename=file.filename,
-        file_size=len(file_content)
+        filename=filename,
+        file_size=stored.size,
+        sha256=stored.sha256,
+        deduplicated=deduplicated,
+        ref_id=ref_id,
     )
+
+
+@router.post("/upload/sessions", status_code=201)
+async def create_upload_session(request: UploadSessionCreateRequest):
+    """재개 가능한 업로드 세션 생성"""
+    file_ext = _validate_extension(request.filename)
+    if request.size < 0:
+        raise HTTPException(status_code=400, detail="파일 크기가 올바르지 않습니다.")
+    try:
+        # 전체 크기만큼 파일을 미리 할당하므로 스레드에서 실행
+        session = await asyncio.to_thread(
+            upload_sessions.create,
+            request.filename, file_ext, request.size, MAX_RESUMABLE_FILE_SIZE, sha256=request.sha256,
+        )
+    except UploadTooLargeError:
+        raise _too_large(MAX_RESUMABLE_FILE_SIZE)
+    return {**session.to_dict(), "chunk_size": UPLOAD_SESSION_CHUNK_SIZE}
+
+
+@router.get("/upload/sessions/{session_id}")
+async def get_upload_session(session_id: str):
+    """받은 바이트 범위 조회 (클라이언트는 빠진 범위만 다시 전송)"""
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    return session.to_dict()
+
+
+@router.put("/upload/sessions/{session_id}")
+async def put_upload_range(session_id: str, request: Request):
+    """
+    바이트 범위 업로드. 헤더 예: Content-Range: bytes 0-4194303/52428800
+    범위는 어떤 순서로 보내도 되고, 같은 범위를 다시 보내면 덮어씀.
+    """
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+
+    if upload_sessions.is_finalizing(session_id):
+        raise _finalizing_conflict()
+
+    match = CONTENT_RANGE_PATTERN.match(request.headers.get("content-range", ""))
+    if not match:
+        raise HTTPException(status_code=400, detail="Content-Range 헤더가 필요합니다. 예: bytes 0-1023/4096")
+    start, last, total = (int(value) for value in match.groups())
+    if total != session.size:
+        raise HTTPException(status_code=400, detail=f"전체 크기가 세션과 다릅니다: {total} != {session.size}")
+
+    try:
+        session = await upload_sessions.write_range(session_id, start, last + 1, request.stream())
+    except KeyError:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    except UploadSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.to_dict()
+
+
+@router.post("/upload/sessions/{session_id}/finalize", response_model=UploadResponse)
+async def finalize_upload_session(session_id: str):
+    """모든 범위를 받은 세션을 검증(해시/형식)하고 업로드로 등록"""
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    if not session.complete:
+        raise HTTPException(
+            status_code=409,
+            detail=f"아직 받지 못한 범위가 있습니다. 받은 범위: {session.received}, 전체 크기: {session.size}"
+        )
+
+    # 같은 세션에 대한 동시 finalize는 하나만 진행 (나머지는 데이터 파일이 옮겨지는 중이므로 409)
+    if not upload_sessions.begin_finalize(session_id):
+        raise _finalizing_conflict()
+    try:
+        # 표시를 얻기 전에 다른 요청이 완료 처리를 끝냈을 수 있으므로 다시 조회
+        session = upload_sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+
+        # 전체 파일을 청크 단위로 읽어 검증 (이벤트 루프를 막지 않도록 스레드에서 실행)
+        try:
+            stored = await asyncio.to_thread(inspect_file, upload_sessions.data_path(session), session.ext)
+        except FileTypeMismatchError:
+            upload_sessions.discard(session_id)
+            raise HTTPException(
+                status_code=400,
+                detail=f"파일 내용이 확장자({session.ext})와 일치하지 않습니다."
+            )
+        if session.sha256 and session.sha256 != stored.sha256:
+            upload_sessions.discard(session_id)
+            raise HTTPException(
+                status_code=422,
+                detail=f"파일 해시가 일치하지 않습니다. 기대값: {session.sha256}, 실제: {stored.sha256}"
+            )
+
+        upload_sessions.discard(session_id, keep_data=True)
+        return await _register_stored_upload(stored, session.ext, session.filename)
+    finally:
+        upload_sessions.end_finalize(session_id)
+
+
+@router.delete("/upload/sessions/{session_id}")
+async def abort_upload_session(session_id: str):
+    """업로드 세션 취소"""
+    if upload_sessions.get(session_id) is None:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    if upload_sessions.is_finalizing(session_id):
+        raise _finalizing_conflict()
+    upload_sessions.discard(session_id)
+    return {"session_id": session_id, "deleted": True}
+
+
+@router.get("/upload/{file_id}")
+async def get_upload(file_id: str):
+    """업로드 파일 메타데이터 조회"""
+    record = await asyncio.to_thread(upload_index.resolve, file_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    metadata = asdict(record)
+    metadata.pop("path")
+    return metadata
+
+
+@router.delete("/upload/{file_id}")
+async def delete_upload(file_id: str, ref_id: str):
+    """
+    업로드 참조 해제 (ref_id: 업로드 응답의 참조 토큰, 토큰당 한 번만 해제).
+    다른 업로드가 같은 파일을 참조하면 파일은 유지.
+    """
+    # SQLite/저장소 삭제가 있으므로 스레드에서 실행
+    remaining = await asyncio.to_thread(upload_index.release, file_id, ref_id)
+    if remaining is None:
+        raise HTTPException(status_code=404, detail="업로드 참조를 찾을 수 없습니다.")
+    return {"file_id": file_id, "ref_count": remaining, "deleted": remaining == 0}
@@ -0,0 +1,177 @@
+"""
+문서 종류 분류 서비스
+업로드된 파일이 어떤 문서인지(사업자등록증, 주주명부, 재무제표, 일반 문서) 첫 페이지만 보고 빠르게 판별
+
+판별 근거 (점수 합산):
+1. 첫 페이지(들)의 텍스트 레이어 키워드
+2. 텍스트 레이어가 없으면 첫 페이지 제목 영역만 저해상도로 OCR (재무제표 분류와 같은 캐시 키 사용)
+3. 파일명 힌트 (예: "사업자등록증_아크론에코_2025.pdf")
+"""
+
+import os
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.services.ocr_engine import get_ocr_engine
+from app.services.pdf_document import acquire_pdf
+from app.services.financial_statement_extractor import FS_TITLE_BAND, FS_CLASSIFY_ZOOM
+
+logger = logging.getLogger(__name__)
+
+KIND_BUSINESS_REGISTRATION = "business-registration"
+KIND_SHAREHOLDER = "shareholder"
+KIND_FINANCIAL_STATEMENT = "financial-statement"
+KIND_GENERAL = "general"  # 사업계획서, IR 자료 등 (일반 분석)
+
+DOC_KINDS = (KIND_BUSINESS_REGISTRATION, KIND_SHAREHOLDER, KIND_FINANCIAL_STATEMENT, KIND_GENERAL)
+
+# 종류별 키워드와 가중치 (제목에 나오는 키워드는 가중치가 높음)
+KIND_KEYWORDS: Dict[str, Dict[str, int]] = {
+    KIND_BUSINESS_REGISTRATION: {
+        "사업자등록증": 5, "개업연월일": 2, "사업장소재지": 2, "본점소재지": 2,
+        "법인등록번호": 1, "등록번호": 1, "세무서장": 2, "사업의종류": 1,
+    },
+    KIND_SHAREHOLDER: {
+        "주주명부": 5, "주주명": 2, "주식수": 2, "주식비율": 2, "지분율": 2, "소유주식": 1,
+    },
+    KIND_FINANCIAL_STATEMENT: {
+        "표준재무제표증명": 5, "재무제표증명": 4, "표준재무상태표": 4, "표준손익계산서": 4,
+        "재무상태표": 2, "손익계산서": 2, "부채총계": 1, "자본총계": 1, "매출액": 1,
+    },
+}
+
+# 파일명 힌트 (공백/밑줄 제거 후 비교)
+FILENAME_HINTS: Dict[str, Tuple[str, ...]] = {
+    KIND_BUSINESS_REGISTRATION: ("사업자등록증", "사업자"),
+    KIND_SHAREHOLDER: ("주주명부", "주주"),
+    KIND_FINANCIAL_STATEMENT: ("재무제표", "재무상태표", "손익계산서", "표준재무"),
+}
+FILENAME_HINT_SCORE = 3
+
+# 이 점수 미만이면 일반 문서로 취급
+MIN_KIND_SCORE = int(os.getenv("CLASSIFIER_MIN_SCORE", "4"))
+
+# 텍스트 레이어를 볼 앞쪽 페이지 수
+CLASSIFY_PAGES = 2
+TEXT_LAYER_MIN_CHARS = 20
+
+
+@dataclass
+class ClassificationResult:
+    kind: str
+    confidence: float
+    scores: Dict[str, int] = field(default_factory=dict)
+    source: str = "text"  # text | ocr | filename | none
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", "", text or "").replace("_", "")
+
+
+def parse_company_name(filename: str) -> Optional[str]:
+    """
+    파일명에서 기업명 추출 ("사업자등록증_" 뒤의 부분, 첫 번째 언더바까지만).
+
+    예: "사업자등록증_아크론에코_2025.pdf" → "아크론에코"
+    """
+    if not filename:
+        return None
+    # 파일 확장자 제거
+    name_without_ext = os.path.splitext(filename)[0]
+    # "사업자등록증_" 또는 "사업자등록증 "으로 시작하는지 확인
+    # 첫 번째 언더바 이후 부분에서, 다음 언더바 전까지 추출
+    match = re.search(r'사업자등록증[_\s]+([^_]+)', name_without_ext, re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
+    # "사업자등록증_"이 없으면 전체 파일명 사용 (확장자 제외)
+    # 하지만 언더바가 있으면 첫 번째 언더바까지만
+    if '_' in name_without_ext:
+        return name_without_ext.split('_')[0]
+    return name_without_ext
+
+
+def filename_hint(filename: Optional[str]) -> Optional[str]:
+    """파일명 키워드로 추정한 문서 종류 (없으면 None)"""
+    if not filename:
+        return None
+    normalized = _normalize(os.path.splitext(filename)[0])
+    for kind, hints in FILENAME_HINTS.items():
+        if any(hint in normalized for hint in hints):
+            return kind
+    return None
+
+
+def score_text(text: str) -> Dict[str, int]:
+    """텍스트의 종류별 키워드 점수"""
+    normalized = _normalize(text)
+    return {
+        kind: sum(weight for keyword, weight in keywords.items() if keyword in normalized)
+        for kind, keywords in KIND_KEYWORDS.items()
+    }
+
+
+def _first_pages_text(file_path: str, file_ext: str) -> Tuple[str, str]:
+    """
+    분류에 쓸 앞부분 텍스트와 출처.
+    PDF는 텍스트 레이어를 먼저 보고, 없으면 첫 페이지 제목 영역만 저해상도 OCR.
+    """
+    if file_ext == ".pdf":
+        with acquire_pdf(file_path) as pdf:
+            pages = min(CLASSIFY_PAGES, pdf.page_count)
+            text = "\n".join(pdf.page_text(i) for i in range(pages))
+            if len(_normalize(text)) >= TEXT_LAYER_MIN_CHARS or pages == 0:
+                return text, "text"
+        ocr_text = get_ocr_engine().ocr_pages(
+            file_path, [0], zoom=FS_CLASSIFY_ZOOM, clip=FS_TITLE_BAND, lang="kor+eng"
+        )[0]
+        return ocr_text, "ocr"
+
+    # docx/txt는 앞부분 텍스트만 사용
+    from app.services.document_parser import DocumentParser
+    return DocumentParser.parse(file_path, file_ext)[:4000], "text"
+
+
+def classify_document(file_path: str, file_ext: str, filename: Optional[str] = None) -> ClassificationResult:
+    """
+    문서 종류 분류 (동기 함수, 작업 풀에서 실행).
+
+    Returns:
+        ClassificationResult (판별 근거가 부족하면 kind="general")
+    """
+    try:
+        text, source = _first_pages_text(file_path, file_ext)
+    except Exception as e:
+        logger.warning(f"분류용 텍스트 추출 실패 ({file_path}): {e}")
+        text, source = "", "none"
+
+    scores = score_text(text)
+    hint = filename_hint(filename)
+    if hint:
+        scores[hint] += FILENAME_HINT_SCORE
+        if not any(score_text(text).values()):
+            source = "filename"
+
+    best_kind, best_score = max(scores.items(), key=lambda item: item[1])
+    if best_score < MIN_KIND_SCORE and not (hint and best_kind == hint):
+        return ClassificationResult(kind=KIND_GENERAL, confidence=0.0, scores=scores, source=source)
+
+    total = sum(scores.values())
+    confidence = round(best_score / total, 3) if total else 0.0
+    logger.info(f"문서 종류 분류: {filename or file_path} → {best_kind} (점수 {scores}, 근거 {source})")
+    return ClassificationResult(kind=best_kind, confidence=confidence, scores=scores, source=source)
+
+
+__all__ = [
+    "KIND_BUSINESS_REGISTRATION",
+    "KIND_SHAREHOLDER",
+    "KIND_FINANCIAL_STATEMENT",
+    "KIND_GENERAL",
+    "DOC_KINDS",
+    "ClassificationResult",
+    "classify_document",
+    "filename_hint",
+    "parse_company_name",
+    "score_text",
+]
@@ -7,15 +7,14 @@ import os
 from typing import Optional
 
 import PyPDF2
-import pdfplumber
 from docx import Document
-import fitz  # PyMuPDF
-from PIL import Image
-import pytesseract
 
-# 윈도우 환경에서 Tesseract 실행 파일 경로를 명시적으로 지정
-# (환경변수 PATH에 추가했더라도, 프로세스가 갱신된 PATH를 못 볼 수 있어서 예방 차원)
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+from app.services.ocr_engine import get_ocr_engine, TOP_HALF
+from app.services.pdf_document import acquire_pdf
+from app.services.progress import report_progress, STAGE_EXTRACT
+
+# 공백을 제외한 글자 수가 이보다 적은 페이지는 텍스트 레이어가 없다고 보고 OCR 대상으로 분류
+TEXT_LAYER_MIN_CHARS = int(os.getenv("TEXT_LAYER_MIN_CHARS", "20"))
 
 
 class DocumentParser:
@@ -26,44 +25,28 @@ class DocumentParser:
         """
         PyMuPDF로 PDF 페이지를 이미지로 렌더링한 뒤
         Tesseract OCR으로 텍스트 추출 (이미지 기반 PDF 대응).
+        페이지들은 OCR 엔진의 프로세스 풀에서 병렬로 처리되고 페이지 순서대로 합쳐짐.
         
         Args:
             top_half_only: True인 경우 상단 50%만 OCR 수행 (사업자등록증 등)
         """
-        text_chunks: list[str] = []
         try:
-            doc = fitz.open(file_path)
-            for page_index in range(len(doc)):
-                page = doc[page_index]
-                # 해상도 조절 (dpi 비슷한 효과) - 2배 확대
-                zoom = 2.0
-                mat = fitz.Matrix(zoom, zoom)
-                
-                if top_half_only:
-                    # 상단 50%만 추출
-                    page_rect = page.rect
-                    top_half_rect = fitz.Rect(
-                        page_rect.x0,
-                        page_rect.y0,
-                        page_rect.x1,
-                        page_rect.y0 + (page_rect.height * 0.5)
-                    )
-                    pix = page.get_pixmap(matrix=mat, clip=top_half_rect)
-                    print(f"페이지 {page_index + 1}: 상단 50%만 OCR 수행")
-                else:
-                    pix = page.get_pixmap(matrix=mat)
-
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                # 한국어 + 영어 OCR
-                ocr_text = pytesseract.image_to_string(img, lang="kor+eng")
-                if ocr_text:
-                    text_chunks.append(ocr_text)
+            engine = get_ocr_engine()
+            if top_half_only:
+                print("상단 50%만 OCR 수행")
+            # 해상도 조절 (dpi 비슷한 효과) - 2배 확대, 한국어 + 영어 OCR
+            page_texts = engine.ocr_pages(
+                file_path,
+                zoom=2.0,
+                clip=TOP_HALF if top_half_only else None,
+                lang="kor+eng",
+            )
         except Exception as e:
             # OCR 실패 시 조용히 무시하고 빈 문자열 반환
             print(f"OCR 파싱 실패: {e}")
             return ""
 
+        text_chunks: list[str] = [text for text in page_texts if text]
         full_text = "\n".join(text_chunks).strip()
         print(f"OCR로 추출한 텍스트 길이: {len(full_text)}")
         return full_text
@@ -86,40 +69,125 @@ class DocumentParser:
             else:
                 raise Exception("PDF 파싱 실패: OCR 실패")
         
-        # 일반 모드: 텍스트 기반 파싱 먼저 시도
-        text = ""
+        # 일반 모드: 페이지별로 텍스트 레이어를 확인하고 부족한 페이지만 OCR
+        pages = DocumentParser.parse_pdf_pages(file_path, top_half_only=top_half_only)
+        text = "\n".join(page["text"] for page in pages if page["text"]).strip()
+        if not text:
+            raise Exception("PDF 파싱 실패: 텍스트 및 OCR 모두 실패")
+
+        method_counts: dict[str, int] = {}
+        for page in pages:
+            method_counts[page["method"]] = method_counts.get(page["method"], 0) + 1
+        print(f"PDF 텍스트 길이: {len(text)} (페이지별 처리 방식: {method_counts})")
+        return text
+
+    @staticmethod
+    def _text_density(text: Optional[str]) -> int:
+        """공백을 제외한 글자 수"""
+        if not text:
+            return 0
+        return len("".join(text.split()))
+
+    @staticmethod
+    def parse_pdf_pages(file_path: str, top_half_only: bool = False) -> list[dict]:
+        """
+        PDF를 페이지별로 파싱하여 페이지 순서대로 반환.
+        텍스트 레이어가 충분한 페이지는 그대로 사용하고, 이미지 위주 페이지만 OCR.
+
+        Args:
+            top_half_only: True인 경우 OCR 대상 페이지의 상단 50%만 OCR
+
+        Returns:
+            [{"page_number": 1, "method": "text" | "ocr" | "empty", "text": "..."}, ...]
+        """
+        # 1) pdfplumber로 페이지별 텍스트 레이어와 이미지 여부 확인 (더 정확함)
+        #    요청 범위의 공유 문서 핸들을 사용하므로 다른 추출기와 파싱 결과를 공유
+        layer_texts: list[str] = []
+        has_images: list[bool] = []
         try:
-            # pdfplumber로 먼저 시도 (더 정확함)
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            with acquire_pdf(file_path) as pdf:
+                for page_index in range(pdf.page_count):
+                    layer_texts.append(pdf.page_text(page_index))
+                    has_images.append(pdf.page_has_images(page_index))
         except Exception as e:
             print(f"pdfplumber 파싱 실패: {e}")
-
-        # pdfplumber 결과가 너무 짧으면 PyPDF2 시도
-        if not text.strip() or len(text.strip()) < 10:
+            layer_texts, has_images = [], []
+
+        # 2) 텍스트가 부족한 페이지는 PyPDF2로 한 번 더 시도 (pdfplumber가 실패했으면 전체 페이지)
+        sparse = [
+            i for i, page_text in enumerate(layer_texts)
+            if DocumentParser._text_density(page_text) < TEXT_LAYER_MIN_CHARS
+        ]
+        if not layer_texts or sparse:
             try:
                 with open(file_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text() or ""
-                        text += page_text + "\n"
+                    if not layer_texts:
+                        layer_texts = [page.extract_text() or "" for page in pdf_reader.pages]
+                        # 이미지 여부를 알 수 없으므로 모두 OCR 후보로 취급
+                        has_images = [True] * len(layer_texts)
+                    else:
+                        for i in sparse:
+                            page_text = pdf_reader.pages[i].extract_text() or ""
+                            if DocumentParser._text_density(page_text) > DocumentParser._text_density(layer_texts[i]):
+                                layer_texts[i] = page_text
             except Exception as e2:
                 print(f"PyPDF2 파싱 실패: {e2}")
 
-        # 여전히 텍스트가 없거나 너무 짧으면 OCR 시도
-        if not text.strip() or len(text.strip()) < 10:
-            print("텍스트 기반 파싱 결과가 부족하여 OCR 시도...")
-            ocr_text = DocumentParser._ocr_pdf_with_tesseract(file_path, top_half_only=top_half_only)
-            if ocr_text:
-                return ocr_text.strip()
+        # 3) 여전히 텍스트가 부족한 페이지 중 OCR이 필요한 페이지 선택
+        #    이미지가 없는 빈 페이지는 건너뛰되, 문서 전체에 텍스트 레이어가 없으면
+        #    (외곽선 글꼴 등) 기존처럼 모든 페이지를 OCR
+        document_has_text = any(
+            DocumentParser._text_density(page_text) >= TEXT_LAYER_MIN_CHARS for page_text in layer_texts
+        )
+        ocr_indices = [
+            i for i, page_text in enumerate(layer_texts)
+            if DocumentParser._text_density(page_text) < TEXT_LAYER_MIN_CHARS
+            and (has_images[i] or not document_has_text)
+        ]
+
+        # pdfplumber/PyPDF2 모두 실패한 경우 페이지 수를 알 수 없으므로 전체 OCR
+        if not layer_texts:
+            print("텍스트 기반 파싱 실패, 전체 페이지 OCR 시도...")
+            try:
+                ocr_texts = get_ocr_engine().ocr_pages(
+                    file_path, zoom=2.0, clip=TOP_HALF if top_half_only else None, lang="kor+eng"
+                )
+            except Exception as e:
+                # OCR 실패 시 빈 결과 반환 (호출한 쪽에서 텍스트 없음으로 처리)
+                print(f"OCR 파싱 실패: {e}")
+                return []
+            return [
+                {"page_number": i + 1, "method": "ocr", "text": page_text.strip()}
+                for i, page_text in enumerate(ocr_texts)
+            ]
+
+        ocr_results: dict[int, str] = {}
+        if ocr_indices:
+            print(f"텍스트 레이어가 부족한 페이지 OCR 시도: {[i + 1 for i in ocr_indices]}")
+            try:
+                ocr_texts = get_ocr_engine().ocr_pages(
+                    file_path, ocr_indices, zoom=2.0, clip=TOP_HALF if top_half_only else None, lang="kor+eng"
+                )
+                ocr_results = dict(zip(ocr_indices, ocr_texts))
+            except Exception as e:
+                # OCR 실패(tesseract 없음, 워커 종료 등) 시 텍스트 레이어 결과만 사용
+                print(f"OCR 파싱 실패, 텍스트 레이어만 사용: {e}")
+
+        total_pages = len(layer_texts)
+        pages: list[dict] = []
+        for i, layer_text in enumerate(layer_texts):
+            ocr_text = ocr_results.get(i, "")
+            if i in ocr_results and ocr_text.strip():
+                method, page_text = "ocr", ocr_text
+            elif layer_text.strip():
+                method, page_text = "text", layer_text
             else:
-                raise Exception("PDF 파싱 실패: 텍스트 및 OCR 모두 실패")
-
-        print(f"PDF 텍스트 길이: {len(text.strip())}")
-        return text.strip()
+                method, page_text = "empty", ""
+            if method != "ocr":
+                report_progress(STAGE_EXTRACT, page=i + 1, total=total_pages, method=method)
+            pages.append({"page_number": i + 1, "method": method, "text": page_text.strip()})
+        return pages
 
     @staticmethod
     def parse_docx(file_path: str) -> str:
@@ -0,0 +1,184 @@
+"""
+작업 실행 계층
+동기(blocking) 파싱/OCR 호출을 이벤트 루프 밖의 제한된 스레드 풀에서 실행
+(LLM 호출은 비동기 클라이언트 계층 app.services.llm_client에서 동시 호출 수를 제한)
+
+- 단계별로 풀을 분리 (ocr: 파싱/OCR, prewarm: 업로드 직후 미리 계산)
+- 대기열이 가득 차면 즉시 거절 (PoolSaturatedError → 503 응답)
+- 풀별 대기열 길이, 대기 시간, 실행 시간 지표 수집
+
+설정 (환경 변수):
+- OCR_POOL_WORKERS / OCR_POOL_QUEUE: ocr 풀 동시 실행 수 / 최대 대기 수 (기본값: 4 / 16)
+- PREWARM_POOL_WORKERS / PREWARM_POOL_QUEUE: prewarm 풀 동시 실행 수 / 최대 대기 수 (기본값: 1 / 64)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _percentile(sorted_values: list, ratio: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(ratio * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class PoolSaturatedError(Exception):
+    """풀의 대기열이 가득 차서 작업을 받을 수 없음"""
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        super().__init__(f"'{pool_name}' 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+
+class BoundedPool:
+    """동시 실행 수와 대기열 길이가 제한된 스레드 풀"""
+
+    # 지표 계산에 사용할 최근 작업 수
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 + 실행 중
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+        self._run_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturatedError(self.name)
+            self._pending += 1
+            self._submitted += 1
+
+    def _wrap(self, fn: Callable[..., Any], submitted_at: float) -> Callable[[], Any]:
+        def runner():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_times.append(started_at - submitted_at)
+            ok = False
+            try:
+                result = fn()
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._run_times.append(time.perf_counter() - started_at)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+        return runner
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        동기 함수를 풀에서 실행하고 결과를 기다림.
+        대기열이 가득 차 있으면 PoolSaturatedError 발생.
+        """
+        self._admit()
+        # 진행 상황 보고 등 호출한 쪽의 컨텍스트를 작업 스레드로 전달
+        context = contextvars.copy_context()
+        runner = self._wrap(lambda: context.run(fn, *args, **kwargs), time.perf_counter())
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, runner)
+        except RuntimeError:
+            # 풀이 종료된 뒤 제출된 경우 (runner가 실행되지 않았으므로 직접 정리)
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 길이 및 대기/실행 시간 지표"""
+        with self._lock:
+            wait_times = sorted(self._wait_times)
+            run_times = list(self._run_times)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_ms_avg": _ms(sum(wait_times) / len(wait_times)) if wait_times else 0.0,
+                "wait_ms_p95": _ms(_percentile(wait_times, 0.95)),
+                "wait_ms_max": _ms(wait_times[-1]) if wait_times else 0.0,
+                "run_ms_avg": _ms(sum(run_times) / len(run_times)) if run_times else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[str, BoundedPool] = {
+    "ocr": BoundedPool(
+        "ocr",
+        max_workers=int(os.getenv("OCR_POOL_WORKERS", "4")),
+        max_queue=int(os.getenv("OCR_POOL_QUEUE", "16")),
+    ),
+    "prewarm": BoundedPool(
+        "prewarm",
+        max_workers=int(os.getenv("PREWARM_POOL_WORKERS", "1")),
+        max_queue=int(os.getenv("PREWARM_POOL_QUEUE", "64")),
+    ),
+}
+
+
+def get_pool(name: str) -> BoundedPool:
+    """이름으로 풀 조회"""
+    return _pools[name]
+
+
+async def run_in_pool(name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """지정한 풀에서 동기 함수를 실행 (예: await run_in_pool("ocr", parser.parse, path, ext))"""
+    return await _pools[name].run(fn, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """전체 풀 지표"""
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+
+def shutdown_pools() -> None:
+    """전체 풀 종료 (애플리케이션 종료 시 호출)"""
+    for pool in _pools.values():
+        pool.shutdown()
+
+
+__all__ = [
+    "BoundedPool",
+    "PoolSaturatedError",
+    "get_pool",
+    "run_in_pool",
+    "pool_stats",
+    "shutdown_pools",
+]
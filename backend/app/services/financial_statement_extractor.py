@@ -22,9 +22,20 @@
 }
 """
 
+import os
 import re
 from typing import List, Dict, Optional
 
+from app.services.pdf_document import acquire_pdf
+from app.services.progress import report_progress, STAGE_CLASSIFY, STAGE_EXTRACT
+
+# 2단계 OCR 모드: 제목 영역 저해상도 OCR로 분류 → 추출 대상 페이지만 고해상도 전체 OCR
+FS_TWO_TIER_OCR = os.getenv("FS_TWO_TIER_OCR", "true").lower() in ("1", "true", "yes")
+# 분류용 제목 영역 (페이지 기준 비율 좌표, 상단 25%)과 렌더링 배율
+# (1.0 = 72dpi는 스캔 문서의 제목을 자주 놓쳐 전체 OCR로 넘어가므로 기본 2.0 = 144dpi)
+FS_TITLE_BAND = (0.0, 0.0, 1.0, float(os.getenv("FS_TITLE_BAND_RATIO", "0.25")))
+FS_CLASSIFY_ZOOM = float(os.getenv("FS_CLASSIFY_ZOOM", "2.0"))
+
 
 class FinancialStatementExtractor:
     """재무제표 추출 클래스"""
@@ -470,6 +481,9 @@ class FinancialStatementExtractor:
         PDF 파일에서 각 페이지를 분석하여 문서 타입을 분류.
         각 페이지의 상단 텍스트만 빠르게 확인 (처음 10줄 정도만).
         배경 이미지가 있어도 텍스트는 추출 가능.
+        
+        2단계 모드(FS_TWO_TIER_OCR)에서는 제목 영역만 저해상도로 OCR 하여 분류하고,
+        금액을 추출할 페이지만 전체 페이지를 고해상도로 OCR.
         """
         pages: List[Dict[str, str]] = []
         import logging
@@ -477,17 +491,14 @@ class FinancialStatementExtractor:
 
         try:
             # OCR만 사용 (pdfplumber, PyPDF2 제거)
-            import fitz
-            from PIL import Image
-            import pytesseract
+            from app.services.ocr_engine import get_ocr_engine
             
-            # Tesseract 경로 설정
-            pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+            engine = get_ocr_engine()
             
             logger.info(f"PDF 파일 열기: {file_path}")
             print(f"PDF 파일 열기: {file_path}")
-            doc = fitz.open(file_path)
-            total_pages = len(doc)
+            with acquire_pdf(file_path) as pdf:
+                total_pages = pdf.page_count
             logger.info(f"재무제표 PDF 총 페이지 수: {total_pages}")
             print(f"재무제표 PDF 총 페이지 수: {total_pages}")
             
@@ -500,28 +511,71 @@ class FinancialStatementExtractor:
             logger.info("역순으로 페이지 분석 시작 (마지막 페이지부터)")
             print("역순으로 페이지 분석 시작 (마지막 페이지부터)")
             
-            for page_idx in range(len(doc) - 1, -1, -1):  # 역순
+            # 역순 페이지 목록을 OCR 워커 수만큼 묶어서 병렬로 미리 OCR
+            # (둘 다 찾으면 중단하므로 한 번에 전체를 OCR 하지 않음)
+            page_order = list(range(total_pages - 1, -1, -1))  # 역순
+            ocr_texts: Dict[int, str] = {}
+            title_texts: Dict[int, str] = {}
+            
+            def needs_full_ocr(title_type: Optional[str]) -> bool:
+                # 금액을 추출할 페이지(아직 찾지 못한 손익계산서/재무상태표)나 제목으로 분류하지 못한 페이지
+                return (
+                    title_type is None
+                    or (title_type == "표준손익계산서" and not found_income_statement)
+                    or (title_type == "표준재무상태표" and not found_balance_sheet)
+                )
+            
+            for order_pos, page_idx in enumerate(page_order):
                 try:
                     logger.info(f"=== 페이지 {page_idx + 1} 처리 시작 ===")
                     print(f"=== 페이지 {page_idx + 1} 처리 시작 ===")
                     
-                    # OCR로 텍스트 추출
-                    logger.info(f"페이지 {page_idx + 1}: 이미지 렌더링 중...")
-                    print(f"페이지 {page_idx + 1}: 이미지 렌더링 중...")
-                    page_obj = doc[page_idx]
-                    zoom = 2.0
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page_obj.get_pixmap(matrix=mat)
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    
-                    logger.info(f"페이지 {page_idx + 1}: OCR 실행 중...")
-                    print(f"페이지 {page_idx + 1}: OCR 실행 중...")
-                    page_text = pytesseract.image_to_string(img, lang="kor+eng")
+                    title_type = None
+                    if FS_TWO_TIER_OCR:
+                        # 1단계: 제목 영역만 저해상도로 OCR 하여 분류 (다음 묶음을 병렬 처리)
+                        if page_idx not in title_texts:
+                            batch = page_order[order_pos:order_pos + engine.max_workers]
+                            logger.info(f"페이지 {[i + 1 for i in batch]}: 제목 영역 저해상도 OCR 병렬 실행 중...")
+                            print(f"페이지 {[i + 1 for i in batch]}: 제목 영역 저해상도 OCR 병렬 실행 중...")
+                            title_texts.update(zip(batch, engine.ocr_pages(
+                                file_path, batch, zoom=FS_CLASSIFY_ZOOM, clip=FS_TITLE_BAND, lang="kor+eng"
+                            )))
+                            # 2단계: 묶음에서 전체 OCR이 필요한 페이지를 모아 한 번에 고해상도 OCR (병렬 처리)
+                            # (찾은 문서는 늘어나기만 하므로 이후 페이지별 판단은 이 목록의 부분집합)
+                            full_batch = [
+                                i for i in batch
+                                if needs_full_ocr(FinancialStatementExtractor._classify_page_text(title_texts[i]))
+                            ]
+                            if full_batch:
+                                logger.info(f"페이지 {[i + 1 for i in full_batch]}: 전체 페이지 고해상도 OCR 병렬 실행 중...")
+                                print(f"페이지 {[i + 1 for i in full_batch]}: 전체 페이지 고해상도 OCR 병렬 실행 중...")
+                                ocr_texts.update(zip(full_batch, engine.ocr_pages(
+                                    file_path, full_batch, zoom=2.0, lang="kor+eng"
+                                )))
+                        title_text = title_texts[page_idx]
+                        title_type = FinancialStatementExtractor._classify_page_text(title_text)
+                        
+                        if needs_full_ocr(title_type):
+                            logger.info(f"페이지 {page_idx + 1}: 고해상도 OCR 결과 사용 (제목 분류: {title_type})")
+                            page_text = ocr_texts[page_idx]
+                        else:
+                            logger.info(f"페이지 {page_idx + 1}: 제목 영역만으로 '{title_type}' 분류, 고해상도 OCR 생략")
+                            page_text = title_text
+                    else:
+                        # OCR로 텍스트 추출 (아직 OCR 하지 않은 페이지면 다음 묶음을 병렬 처리)
+                        if page_idx not in ocr_texts:
+                            batch = page_order[order_pos:order_pos + engine.max_workers]
+                            logger.info(f"페이지 {[i + 1 for i in batch]}: 렌더링 및 OCR 병렬 실행 중...")
+                            print(f"페이지 {[i + 1 for i in batch]}: 렌더링 및 OCR 병렬 실행 중...")
+                            ocr_texts.update(zip(batch, engine.ocr_pages(file_path, batch, zoom=2.0, lang="kor+eng")))
+                        page_text = ocr_texts[page_idx]
                     logger.info(f"페이지 {page_idx + 1}: OCR 텍스트 길이 = {len(page_text) if page_text else 0}")
                     print(f"페이지 {page_idx + 1}: OCR 텍스트 길이 = {len(page_text) if page_text else 0}")
                     
-                    if not page_text or len(page_text.strip()) < 10:
+                    # (제목 영역만으로 분류된 페이지는 텍스트가 짧아도 정상)
+                    if (not page_text or len(page_text.strip()) < 10) and not title_type:
                         logger.warning(f"페이지 {page_idx + 1}: OCR 텍스트 추출 실패")
+                        report_progress(STAGE_CLASSIFY, page=page_idx + 1, total=total_pages, doc_type=None)
                         pages.append({
                             "page_number": page_idx + 1,
                             "type": "분류 불가"
@@ -544,6 +598,7 @@ class FinancialStatementExtractor:
                     # 상단에서 못 찾으면 전체 텍스트에서 검색
                     if not doc_type:
                         doc_type = FinancialStatementExtractor._classify_page_text(page_text[:500])
+                    report_progress(STAGE_CLASSIFY, page=page_num, total=total_pages, doc_type=doc_type)
                     
                     if doc_type:
                         logger.info(f"페이지 {page_num}: '{doc_type}'로 분류됨")
@@ -560,6 +615,7 @@ class FinancialStatementExtractor:
                             logger.info(f"페이지 {page_num} 전체 텍스트 길이: {len(page_text)}")
                             
                             revenue = FinancialStatementExtractor._extract_revenue(page_text)
+                            report_progress(STAGE_EXTRACT, page=page_num, total=total_pages, field="revenue")
                             
                             logger.info(f"매출액 추출 결과: {revenue}")
                             print(f"매출액 추출 결과: {revenue}")
@@ -582,6 +638,7 @@ class FinancialStatementExtractor:
                             logger.info(f"페이지 {page_num} 전체 텍스트 길이: {len(page_text)}")
                             
                             balance_items = FinancialStatementExtractor._extract_balance_sheet_items(page_text)
+                            report_progress(STAGE_EXTRACT, page=page_num, total=total_pages, field="balance_sheet")
                             
                             logger.info(f"부채 총계/자본총계 추출 결과: {balance_items}")
                             print(f"부채 총계/자본총계 추출 결과: {balance_items}")
@@ -617,6 +674,7 @@ class FinancialStatementExtractor:
                             logger.info(f"페이지 {page_num} 전체 텍스트 길이: {len(page_text)}")
                             
                             revenue = FinancialStatementExtractor._extract_revenue(page_text)
+                            report_progress(STAGE_EXTRACT, page=page_num, total=total_pages, field="revenue")
                             
                             logger.info(f"매출액 추출 결과: {revenue}")
                             print(f"매출액 추출 결과: {revenue}")
@@ -640,8 +698,6 @@ class FinancialStatementExtractor:
                 except Exception as e:
                     logger.error(f"페이지 {page_idx + 1} 처리 중 오류: {e}", exc_info=True)
             
-            doc.close()
-            
             # 결과를 페이지 번호 순으로 정렬
             result_pages.sort(key=lambda x: x["page_number"])
             pages = result_pages
@@ -653,8 +709,6 @@ class FinancialStatementExtractor:
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"재무제표 PDF 추출 실패: {e}", exc_info=True)
-            if 'doc' in locals():
-                doc.close()
             raise Exception(f"재무제표 추출 실패: {str(e)}")
 
         # 매출액 추출 (표준손익계산서 페이지에서)
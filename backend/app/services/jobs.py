@@ -0,0 +1,203 @@
+"""
+분석 작업(Job) 관리 서비스
+분석 요청을 즉시 job id로 응답하고, 백그라운드 워커가 순서대로 실행하면서
+단계/페이지별 진행 상황을 구독자(SSE)에게 전달
+
+설정 (환경 변수):
+- JOB_WORKERS: 동시에 실행할 작업 수 (기본값: 4)
+- JOB_TTL_SECONDS: 완료된 작업을 보관하는 시간 (기본값: 3600)
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.services.progress import progress_reporter
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JobRunner = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    """분석 작업 상태"""
+    id: str
+    kind: str
+    file_id: str
+    runner: JobRunner
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[Dict[str, Any]] = None  # 마지막 진행 이벤트
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+def _is_final(event: Dict[str, Any]) -> bool:
+    """작업 완료(성공/실패) 상태 이벤트인지 여부"""
+    return event["type"] == "status" and event["status"] in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class JobManager:
+    """메모리 기반 작업 대기열 + 워커"""
+
+    def __init__(self, workers: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("JOB_TTL_SECONDS", "3600"))
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        """첫 작업 등록 시 현재 이벤트 루프에서 워커 시작"""
+        if self._worker_tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"작업 워커 {self.workers}개 시작")
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is not None:
+                    await self._run(job)
+            except Exception as e:
+                logger.error(f"작업 워커 {worker_id} 오류: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._publish(job, {"type": "status", "status": JOB_RUNNING})
+
+        loop = self._loop
+
+        def on_progress(event: Dict[str, Any]) -> None:
+            # 작업 풀 스레드에서도 호출되므로 이벤트 루프로 넘겨서 처리
+            loop.call_soon_threadsafe(self._publish, job, {"type": "progress", **event})
+
+        status = JOB_FAILED
+        try:
+            with progress_reporter(on_progress):
+                job.result = await job.runner()
+            status = JOB_SUCCEEDED
+        except Exception as e:
+            # HTTPException이면 detail을, 그 외에는 메시지를 그대로 전달
+            job.error = str(getattr(e, "detail", None) or e)
+            logger.warning(f"작업 실패 ({job.id}, {job.kind}): {job.error}")
+        finally:
+            # 스레드에서 넘어온 진행 이벤트가 먼저 전달되도록 한 번 양보한 뒤 완료 처리
+            await asyncio.sleep(0)
+            job.status = status
+            job.finished_at = time.time()
+            self._publish(job, {"type": "status", "status": job.status, "error": job.error})
+
+    def _publish(self, job: Job, event: Dict[str, Any]) -> None:
+        event = {"job_id": job.id, "timestamp": time.time(), **event}
+        job.events.append(event)
+        if event["type"] == "progress":
+            job.progress = event
+        for queue in list(job.subscribers):
+            queue.put_nowait(event)
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, kind: str, file_id: str, runner: JobRunner) -> Job:
+        """작업 등록 (즉시 반환, 실행은 백그라운드 워커가 담당)"""
+        self._ensure_started()
+        self._purge_expired()
+        job = Job(id=str(uuid.uuid4()), kind=kind, file_id=file_id, runner=runner)
+        self._jobs[job.id] = job
+        self._publish(job, {"type": "status", "status": JOB_QUEUED})
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active_file_ids(self) -> Set[str]:
+        """대기 중이거나 실행 중인 작업의 file_id (보존 정책 정리에서 제외)"""
+        return {job.file_id for job in list(self._jobs.values()) if not job.finished}
+
+    async def subscribe(self, job_id: str, heartbeat_seconds: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        지금까지의 이벤트를 먼저 전달하고, 작업이 끝날 때까지 새 이벤트를 전달.
+        heartbeat_seconds 동안 이벤트가 없으면 {"type": "heartbeat"} 전달 (프록시 타임아웃 방지).
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        # 구독 등록과 이력 복사 사이에 양보 지점이 없으므로 이벤트가 중복/누락되지 않음
+        queue: asyncio.Queue = asyncio.Queue()
+        job.subscribers.add(queue)
+        history = list(job.events)
+        try:
+            for event in history:
+                yield event
+            # 이력을 보내는 동안 작업이 끝났을 수 있으므로 job.finished가 아니라 이력의 마지막 이벤트로 판단
+            # (그 뒤의 이벤트는 모두 queue에 들어 있음)
+            if history and _is_final(history[-1]):
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield {"type": "heartbeat", "job_id": job.id, "timestamp": time.time()}
+                    continue
+                yield event
+                if _is_final(event):
+                    return
+        finally:
+            job.subscribers.discard(queue)
+
+    async def shutdown(self) -> None:
+        """워커 종료 (애플리케이션 종료 시 호출)"""
+        for task in self._worker_tasks:
+            task.cancel()
+        self._worker_tasks = []
+
+
+job_manager = JobManager()
+
+
+__all__ = [
+    "Job",
+    "JobManager",
+    "job_manager",
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+]
@@ -0,0 +1,98 @@
+"""
+증분 JSON 파싱 서비스
+LLM이 토큰 단위로 생성하는 JSON 객체에서 최상위 필드가 완성되는 즉시 (이름, 값)을 꺼냄
+
+예:
+    parser = IncrementalJSONFieldParser()
+    for delta in stream:
+        for name, value in parser.feed(delta):
+            send(name, value)  # companySummary, evaluations, ... 순서대로 완성 즉시
+
+- 최상위 객체 앞의 텍스트(```json 코드 블록 표시 등)는 무시
+- 값 안의 문자열/이스케이프/중첩 객체와 배열을 추적해서 최상위 ',' 또는 '}'에서만 필드를 끊음
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONFieldParser:
+    """스트리밍 JSON 객체의 최상위 필드 파서"""
+
+    def __init__(self):
+        self._buffer: List[str] = []  # 현재 필드의 원문 ("키": 값)
+        self._started = False  # 최상위 '{'를 만났는지
+        self._finished = False  # 최상위 '}'를 만났는지
+        self._depth = 0  # 최상위 객체 안 = 1
+        self._in_string = False
+        self._escape = False
+        self.fields: List[str] = []  # 완성된 필드 이름 (순서대로)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """텍스트 조각을 넣고 이번에 완성된 (필드 이름, 값) 목록 반환"""
+        completed: List[Tuple[str, Any]] = []
+        for char in text:
+            if self._finished:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._buffer.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    # 최상위 객체 끝
+                    self._finished = True
+                    field = self._flush()
+                    if field is not None:
+                        completed.append(field)
+                    continue
+            elif char == "," and self._depth == 1:
+                field = self._flush()
+                if field is not None:
+                    completed.append(field)
+                continue
+            self._buffer.append(char)
+        return completed
+
+    def _flush(self) -> Optional[Tuple[str, Any]]:
+        """버퍼에 모인 필드 하나("키": 값)를 파싱"""
+        raw = "".join(self._buffer).strip()
+        self._buffer = []
+        if not raw:
+            return None
+        try:
+            # '{"키": 값}'으로 감싸서 표준 JSON 파서에 맡김
+            parsed = json.loads("{" + raw + "}")
+        except ValueError:
+            logger.warning(f"스트리밍 JSON 필드 파싱 실패: {raw[:200]}")
+            return None
+        name, value = next(iter(parsed.items()))
+        self.fields.append(name)
+        return name, value
+
+
+__all__ = ["IncrementalJSONFieldParser"]
@@ -1,37 +1,109 @@
 """
 LLM 분석 서비스
 OpenAI 또는 Anthropic API를 사용한 문서 분석
+
+- analyze_async: 애플리케이션 공유 비동기 클라이언트 사용 (라우트에서 사용, 이벤트 루프를 막지 않음)
+- analyze_stream: analyze_async와 같지만 provider 스트리밍 API로 받으면서 최상위 필드가 완성될 때마다 전달
+- analyze: 동기 클라이언트 사용 (스크립트 등 이벤트 루프 밖에서 사용)
+- 둘 다 같은 프롬프트/provider/모델/temperature의 이전 응답을 LLM 응답 캐시에서 재사용
+- 프롬프트의 고정 부분(평가 기준, 출력 형식)은 system으로 보내 provider 프롬프트 캐시를 사용
+  (Anthropic: cache_control 지정, OpenAI: 같은 접두사를 자동 캐시)
+
+긴 문서 (MAX_DOCUMENT_CHARS 초과, analyze_async만 해당):
+    1. map: 토큰 예산에 맞춰 나눈 구간별로 평가 메모를 동시에 작성 (구간별로 캐시)
+    2. 메모를 합쳐도 길면 메모를 다시 나눠 한 번 더 요약
+    3. reduce: 합친 메모로 최종 AnalysisResult 생성
+    구간 메모 작성에 실패하면 그 구간은 원문 앞부분으로 대신하고, 결과는 캐시/업로드 인덱스에 저장하지 않음 (degraded)
+
+설정 (환경 변수):
+- LLM_LONG_DOCUMENT_MODE: false이면 긴 문서도 앞부분만 분석 (기본값: true)
+- LLM_CHUNK_TOKENS: 구간당 최대 토큰 수 (기본값: 6000)
+- LLM_CHUNK_NOTES_CHARS: 구간 메모 최대 길이 (기본값: 1500)
+- LLM_PROMPT_CACHE: false이면 Anthropic 요청에 cache_control을 붙이지 않음 (기본값: true)
 """
 
 import os
 import json
-from typing import Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
 from openai import OpenAI
 from anthropic import Anthropic
-from app.services.prompt_templates import get_analysis_prompt
+from app.services.prompt_templates import (
+    MAX_DOCUMENT_CHARS,
+    PromptParts,
+    format_chunk_notes,
+    get_analysis_prompt_parts,
+    get_chunk_prompt_parts,
+    get_reduce_prompt_parts,
+)
+from app.services.text_chunker import chunk_text
+from app.services.progress import report_progress, STAGE_LLM
+from app.services.executor import PoolSaturatedError
+from app.services.llm_client import llm_clients, LLM_TIMEOUT_SECONDS
+from app.services.json_stream import IncrementalJSONFieldParser
+from app.services.llm_cache import llm_cache_key, llm_response_cache
 from app.models.analysis import AnalysisResult, Evaluations, TipsCategoryScore
 
+LLM_LONG_DOCUMENT_MODE = os.getenv("LLM_LONG_DOCUMENT_MODE", "true").lower() == "true"
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", "6000"))
+LLM_CHUNK_NOTES_CHARS = int(os.getenv("LLM_CHUNK_NOTES_CHARS", "1500"))
+LLM_PROMPT_CACHE = os.getenv("LLM_PROMPT_CACHE", "true").lower() == "true"
+# 메모를 다시 요약하는 최대 횟수 (그래도 길면 앞부분만 사용)
+MAX_REDUCE_ROUNDS = 3
+
 
 class LLMAnalyzer:
-    """LLM 기반 문서 분석 클래스"""
+    """LLM 기반 문서 분석 클래스 (요청마다 만들어도 클라이언트 연결은 공유)"""
+    
+    temperature = 0.3
+    max_tokens = 4000
     
     def __init__(self):
-        self.openai_client = None
-        self.anthropic_client = None
+        self._openai_client = None
+        self._anthropic_client = None
         self.provider = os.getenv("LLM_PROVIDER", "openai").lower()
-        
-        if self.provider == "openai":
-            api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                self.openai_client = OpenAI(api_key=api_key)
-        elif self.provider == "anthropic":
-            api_key = os.getenv("ANTHROPIC_API_KEY")
-            if api_key:
-                self.anthropic_client = Anthropic(api_key=api_key)
+        # 마지막 분석이 Mock 결과였는지 (결과 재사용 저장 여부 판단용)
+        self.used_mock = False
+        # 마지막 분석 결과가 LLM 응답 캐시에서 왔는지
+        self.cache_hit = False
+        # 긴 문서 분석 중 일부 구간 메모 작성에 실패해서 원문 앞부분으로 대체했는지 (저장하지 않음)
+        self.degraded = False
     
-    def analyze(self, document_text: str) -> AnalysisResult:
-        """문서 분석 실행"""
-        prompt = get_analysis_prompt(document_text)
+    @property
+    def openai_client(self) -> Optional[OpenAI]:
+        """동기 OpenAI 클라이언트 (처음 사용할 때 생성)"""
+        if self._openai_client is None and os.getenv("OPENAI_API_KEY"):
+            self._openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai_client
+    
+    @property
+    def anthropic_client(self) -> Optional[Anthropic]:
+        """동기 Anthropic 클라이언트 (처음 사용할 때 생성)"""
+        if self._anthropic_client is None and os.getenv("ANTHROPIC_API_KEY"):
+            self._anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        return self._anthropic_client
+    
+    @property
+    def reusable(self) -> bool:
+        """마지막 분석 결과를 캐시/업로드 인덱스에 저장해도 되는지 (Mock이나 일부 구간 실패 결과는 제외)"""
+        return not (self.used_mock or self.degraded)
+    
+    @property
+    def model(self) -> str:
+        """현재 provider에서 사용하는 모델 이름"""
+        if self.provider == "anthropic":
+            return os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229")
+        return os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    
+    def analyze(self, document_text: str, force_refresh: bool = False) -> AnalysisResult:
+        """문서 분석 실행 (동기)"""
+        prompt = get_analysis_prompt_parts(document_text)
+        self.used_mock = False
+        self.degraded = False
+        
+        cache_key, cached = self._cache_lookup(prompt, force_refresh)
+        if cached is not None:
+            return cached
         
         if self.provider == "openai" and self.openai_client:
             result = self._analyze_openai(prompt)
@@ -41,74 +113,289 @@ class LLMAnalyzer:
             # Mock 데이터 (API 키가 없을 때)
             result = self._get_mock_result()
         
+        self._cache_store(cache_key, result)
+        return result
+    
+    async def analyze_async(
+        self, document_text: str, timeout: Optional[float] = None, force_refresh: bool = False
+    ) -> AnalysisResult:
+        """
+        문서 분석 실행 (비동기, 공유 클라이언트/연결 풀 사용).
+        긴 문서는 구간별 메모(map) 후 종합(reduce)해서 문서 전체를 반영.
+        force_refresh=True이면 캐시된 응답을 쓰지 않고 다시 호출 (새 응답으로 캐시 갱신).
+        
+        Raises:
+            PoolSaturatedError: 동시 호출 대기열이 가득 참
+        """
+        self.used_mock = False
+        self.degraded = False
+        prompt = await self._build_prompt_async(document_text, timeout, force_refresh)
+        
+        cache_key, cached = self._cache_lookup(prompt, force_refresh)
+        if cached is not None:
+            return cached
+        
+        client = self._async_client()
+        if client is None:
+            # Mock 데이터 (API 키가 없을 때)
+            result = self._get_mock_result()
+        elif self.provider == "anthropic":
+            result = await self._analyze_anthropic_async(client, prompt, timeout)
+        else:
+            result = await self._analyze_openai_async(client, prompt, timeout)
+        
+        self._cache_store(cache_key, result)
         return result
     
-    def _analyze_openai(self, prompt: str) -> AnalysisResult:
+    async def analyze_stream(
+        self, document_text: str, timeout: Optional[float] = None, force_refresh: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        문서 분석 실행 (스트리밍).
+        최상위 필드(companySummary, evaluations, ...)가 완성될 때마다 {"type": "field", "name", "value"},
+        마지막에 {"type": "result", "result": AnalysisResult} 이벤트를 생성.
+        캐시된 응답이나 Mock 결과는 모든 필드를 바로 생성.
+        
+        Raises:
+            PoolSaturatedError: 동시 호출 대기열이 가득 참
+            ValueError: 스트리밍 응답이 올바른 JSON이 아님
+        """
+        self.used_mock = False
+        self.degraded = False
+        prompt = await self._build_prompt_async(document_text, timeout, force_refresh)
+        
+        cache_key, cached = self._cache_lookup(prompt, force_refresh)
+        client = self._async_client()
+        if cached is not None or client is None:
+            result = cached if cached is not None else self._get_mock_result()
+            for name, value in result.dict().items():
+                yield {"type": "field", "name": name, "value": value}
+            yield {"type": "result", "result": result}
+            return
+        
+        parser = IncrementalJSONFieldParser()
+        content: List[str] = []
+        async for delta in self._stream_text_async(client, prompt, timeout):
+            content.append(delta)
+            for name, value in parser.feed(delta):
+                yield {"type": "field", "name": name, "value": value}
+        
+        result = self._to_result("".join(content))
+        self._cache_store(cache_key, result)
+        yield {"type": "result", "result": result}
+    
+    async def _stream_text_async(self, client, prompt: PromptParts, timeout: Optional[float]) -> AsyncIterator[str]:
+        """provider 스트리밍 API로 응답 텍스트 조각 생성 (동시 호출 한도 안에서, 전체 타임아웃 적용)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+        async with llm_clients.slot():
+            if self.provider == "anthropic":
+                async with client.messages.stream(**self._anthropic_request(prompt)) as stream:
+                    async for text in stream.text_stream:
+                        if loop.time() > deadline:
+                            raise asyncio.TimeoutError()
+                        yield text
+            else:
+                stream = await client.chat.completions.create(**self._openai_request(prompt), stream=True)
+                async for chunk in stream:
+                    if loop.time() > deadline:
+                        raise asyncio.TimeoutError()
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+    
+    async def _build_prompt_async(
+        self, document_text: str, timeout: Optional[float], force_refresh: bool
+    ) -> PromptParts:
+        """분석 프롬프트 (긴 문서는 구간별 메모로 줄인 뒤 생성)"""
+        if LLM_LONG_DOCUMENT_MODE and len(document_text) > MAX_DOCUMENT_CHARS and self._async_client() is not None:
+            return await self._map_reduce_prompt_async(document_text, timeout, force_refresh)
+        return get_analysis_prompt_parts(document_text)
+    
+    def _async_client(self):
+        """현재 provider의 공유 비동기 클라이언트 (API 키가 없으면 None)"""
+        if self.provider == "openai":
+            return llm_clients.openai()
+        if self.provider == "anthropic":
+            return llm_clients.anthropic()
+        return None
+    
+    async def _map_reduce_prompt_async(
+        self, document_text: str, timeout: Optional[float], force_refresh: bool
+    ) -> PromptParts:
+        """긴 문서를 구간별 메모로 줄여서 최종 분석 프롬프트 생성"""
+        text = document_text
+        notes: List[str] = []
+        for round_index in range(1, MAX_REDUCE_ROUNDS + 1):
+            chunks = chunk_text(text, LLM_CHUNK_TOKENS)
+            report_progress(STAGE_LLM, status="map", chunks=len(chunks), round=round_index)
+            notes = await asyncio.gather(*(
+                self._chunk_notes_async(chunk, index, len(chunks), timeout, force_refresh)
+                for index, chunk in enumerate(chunks, start=1)
+            ))
+            combined = format_chunk_notes(notes)
+            if len(combined) <= MAX_DOCUMENT_CHARS or len(chunks) == 1:
+                break
+            text = combined
+        print(f"긴 문서 분석: {len(document_text)}자 → 구간 메모 {len(notes)}개 ({len(format_chunk_notes(notes))}자)")
+        report_progress(STAGE_LLM, status="reduce", chunks=len(notes))
+        return get_reduce_prompt_parts(notes)
+    
+    async def _chunk_notes_async(
+        self, chunk: str, index: int, total: int, timeout: Optional[float], force_refresh: bool
+    ) -> str:
+        """구간 하나의 평가 메모 (같은 구간/모델이면 캐시 재사용, 실패하면 구간 앞부분으로 대체하고 degraded 표시)"""
+        prompt = get_chunk_prompt_parts(chunk, index, total, LLM_CHUNK_NOTES_CHARS)
+        cache_key = llm_cache_key(prompt.text, self.provider, self.model, self.temperature)
+        if not force_refresh:
+            cached = llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached["notes"]
+        
+        client = self._async_client()
+        try:
+            if self.provider == "anthropic":
+                response = await llm_clients.call(
+                    lambda: client.messages.create(**self._anthropic_request(prompt)), timeout=timeout
+                )
+                notes = response.content[0].text
+            else:
+                response = await llm_clients.call(
+                    lambda: client.chat.completions.create(**self._openai_request(prompt, json_output=False)),
+                    timeout=timeout,
+                )
+                notes = response.choices[0].message.content
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            print(f"구간 {index}/{total} 메모 작성 오류: {type(e).__name__} {str(e)}")
+            self.degraded = True
+            return chunk[:LLM_CHUNK_NOTES_CHARS]
+        
+        llm_response_cache.set(cache_key, {"notes": notes}, self.provider, self.model)
+        # page/total은 페이지 번호용이므로 구간 진행은 별도 필드로 보고
+        report_progress(STAGE_LLM, status="chunk", chunk=index, chunks=total)
+        return notes
+    
+    def _cache_lookup(self, prompt: PromptParts, force_refresh: bool) -> tuple[str, Optional[AnalysisResult]]:
+        """(캐시 키, 캐시된 결과) 반환 (force_refresh이거나 없으면 결과는 None)"""
+        # 키는 고정 부분과 문서별 부분을 모두 포함 (평가 기준이 바뀌면 이전 응답을 쓰지 않음)
+        cache_key = llm_cache_key(prompt.text, self.provider, self.model, self.temperature)
+        self.cache_hit = False
+        if force_refresh:
+            return cache_key, None
+        cached = llm_response_cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        self.cache_hit = True
+        return cache_key, AnalysisResult(**cached)
+    
+    def _cache_store(self, cache_key: str, result: AnalysisResult) -> None:
+        # Mock 결과(API 키 없음/호출 실패)와 일부 구간이 실패한 결과는 저장하지 않음
+        if self.reusable:
+            llm_response_cache.set(cache_key, result.dict(), self.provider, self.model)
+    
+    def _openai_request(self, prompt: PromptParts, json_output: bool = True) -> dict:
+        # 고정 부분을 맨 앞에 두어야 OpenAI 자동 프롬프트 캐시(같은 접두사)가 적용됨
+        request = dict(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": prompt.system
+                },
+                {
+                    "role": "user",
+                    "content": prompt.user
+                }
+            ],
+            temperature=self.temperature,
+        )
+        if json_output:
+            request["response_format"] = {"type": "json_object"}
+        return request
+    
+    def _anthropic_request(self, prompt: PromptParts) -> dict:
+        system = {"type": "text", "text": prompt.system}
+        if LLM_PROMPT_CACHE:
+            # 고정 부분까지 캐시 (캐시 유효 시간 안의 요청은 이 부분을 다시 처리/과금하지 않음)
+            system["cache_control"] = {"type": "ephemeral"}
+        return dict(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            system=[system],
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt.user
+                }
+            ]
+        )
+    
+    @staticmethod
+    def _to_result(content: str) -> AnalysisResult:
+        """응답 본문(JSON)을 AnalysisResult로 변환"""
+        # JSON 추출 (마크다운 코드 블록 제거)
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+        
+        data = json.loads(content)
+        # Evaluations와 TipsCategoryScore 객체로 변환
+        if "evaluations" in data and isinstance(data["evaluations"], dict):
+            data["evaluations"] = Evaluations(**data["evaluations"])
+        if "tipsCategories" in data and isinstance(data["tipsCategories"], list):
+            data["tipsCategories"] = [TipsCategoryScore(**item) for item in data["tipsCategories"]]
+        return AnalysisResult(**data)
+    
+    def _analyze_openai(self, prompt: PromptParts) -> AnalysisResult:
         """OpenAI API 사용"""
         try:
-            response = self.openai_client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 COMMAX VENTURUS의 VC 심사역입니다. 제공된 JSON 형식으로만 응답하세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            data = json.loads(content)
-            # Evaluations와 TipsCategoryScore 객체로 변환
-            if "evaluations" in data and isinstance(data["evaluations"], dict):
-                data["evaluations"] = Evaluations(**data["evaluations"])
-            if "tipsCategories" in data and isinstance(data["tipsCategories"], list):
-                data["tipsCategories"] = [TipsCategoryScore(**item) for item in data["tipsCategories"]]
-            return AnalysisResult(**data)
+            response = self.openai_client.chat.completions.create(**self._openai_request(prompt))
+            return self._to_result(response.choices[0].message.content)
         except Exception as e:
             print(f"OpenAI 분석 오류: {str(e)}")
             return self._get_mock_result()
     
-    def _analyze_anthropic(self, prompt: str) -> AnalysisResult:
+    def _analyze_anthropic(self, prompt: PromptParts) -> AnalysisResult:
         """Anthropic Claude API 사용"""
         try:
-            response = self.anthropic_client.messages.create(
-                model=os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229"),
-                max_tokens=4000,
-                temperature=0.3,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            
-            content = response.content[0].text
-            # JSON 추출 (마크다운 코드 블록 제거)
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(content)
-            # Evaluations와 TipsCategoryScore 객체로 변환
-            if "evaluations" in data and isinstance(data["evaluations"], dict):
-                data["evaluations"] = Evaluations(**data["evaluations"])
-            if "tipsCategories" in data and isinstance(data["tipsCategories"], list):
-                data["tipsCategories"] = [TipsCategoryScore(**item) for item in data["tipsCategories"]]
-            return AnalysisResult(**data)
+            response = self.anthropic_client.messages.create(**self._anthropic_request(prompt))
+            return self._to_result(response.content[0].text)
         except Exception as e:
             print(f"Anthropic 분석 오류: {str(e)}")
             return self._get_mock_result()
     
+    async def _analyze_openai_async(self, client, prompt: PromptParts, timeout: Optional[float]) -> AnalysisResult:
+        """OpenAI API 사용 (비동기)"""
+        try:
+            response = await llm_clients.call(
+                lambda: client.chat.completions.create(**self._openai_request(prompt)), timeout=timeout
+            )
+            return self._to_result(response.choices[0].message.content)
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            print(f"OpenAI 분석 오류: {type(e).__name__} {str(e)}")
+            return self._get_mock_result()
+    
+    async def _analyze_anthropic_async(self, client, prompt: PromptParts, timeout: Optional[float]) -> AnalysisResult:
+        """Anthropic Claude API 사용 (비동기)"""
+        try:
+            response = await llm_clients.call(
+                lambda: client.messages.create(**self._anthropic_request(prompt)), timeout=timeout
+            )
+            return self._to_result(response.content[0].text)
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            print(f"Anthropic 분석 오류: {type(e).__name__} {str(e)}")
+            return self._get_mock_result()
+    
     def _get_mock_result(self) -> AnalysisResult:
         """Mock 결과 (API 키가 없거나 오류 시)"""
+        self.used_mock = True
         return AnalysisResult(
             companySummary="문서 분석을 위해 LLM API 키를 설정해주세요. .env 파일에 OPENAI_API_KEY 또는 ANTHROPIC_API_KEY를 추가하세요.",
             tipsCategories=[
@@ -0,0 +1,102 @@
+"""
+LLM 응답 캐시 서비스
+같은 프롬프트를 같은 provider/모델/temperature로 다시 보내면 저장된 분석 결과를 바로 반환
+
+- 키: 정규화한 프롬프트 + provider + 모델 + temperature의 SHA-256
+- 저장: 디스크 캐시 (크기 제한 LRU 제거, 페이지 텍스트 캐시와 같은 구현)
+- 만료: 저장 후 TTL이 지난 항목은 조회 시 삭제, 오래 쓰지 않은 항목은 보존 정책 정리에서 삭제
+
+설정 (환경 변수):
+- LLM_CACHE_DIR: 캐시 디렉토리 (기본값: cache/llm)
+- LLM_CACHE_MAX_MB: 최대 캐시 크기 MB (기본값: 256, 0이면 캐시 비활성화)
+- LLM_CACHE_TTL_DAYS: 항목 유효 기간 (기본값: 30, 0이면 무제한)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import unicodedata
+from typing import Any, Dict, Optional
+
+from app.services.page_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+# 응답 형식(AnalysisResult)이 바뀌면 올려서 기존 항목을 무효화
+LLM_CACHE_VERSION = "1"
+
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30")) * 24 * 3600
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    캐시 키용 프롬프트 정규화.
+    유니코드 정규화(NFC), 줄 끝 공백 제거, 연속 공백/빈 줄 축약 (OCR/파싱 결과의 공백 차이 무시)
+    """
+    text = unicodedata.normalize("NFC", prompt)
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def llm_cache_key(prompt: str, provider: str, model: str, temperature: float) -> str:
+    """정규화한 프롬프트 + 호출 파라미터로 캐시 키 생성"""
+    params = f"v{LLM_CACHE_VERSION}|provider={provider}|model={model}|temperature={temperature}"
+    return hashlib.sha256(f"{params}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """TTL이 있는 LLM 분석 결과 디스크 캐시"""
+
+    def __init__(self, cache: DiskLRUCache, ttl_seconds: float = LLM_CACHE_TTL_SECONDS):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.expired = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """저장된 결과 (없거나 만료되었으면 None)"""
+        raw = self.cache.get(key)
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            self.cache.delete(key)
+            return None
+        if self.ttl_seconds > 0 and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self.cache.delete(key)
+            self.expired += 1
+            return None
+        return entry["result"]
+
+    def set(self, key: str, result: Dict[str, Any], provider: str, model: str) -> None:
+        entry = {"created_at": time.time(), "provider": provider, "model": model, "result": result}
+        self.cache.set(key, json.dumps(entry, ensure_ascii=False))
+
+    def purge_expired(self) -> int:
+        """TTL 동안 한 번도 쓰지 않은 항목 삭제 (보존 정책 정리에서 호출)"""
+        if self.ttl_seconds <= 0:
+            return 0
+        return self.cache.purge_older_than(self.ttl_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "ttl_seconds": self.ttl_seconds, "expired": self.expired}
+
+
+llm_response_cache = LLMResponseCache(
+    DiskLRUCache(
+        directory=os.getenv("LLM_CACHE_DIR", os.path.join("cache", "llm")),
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+        suffix=".json",
+    )
+)
+
+
+__all__ = [
+    "LLMResponseCache",
+    "llm_response_cache",
+    "llm_cache_key",
+    "normalize_prompt",
+]
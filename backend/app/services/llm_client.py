@@ -0,0 +1,184 @@
+"""
+비동기 LLM 클라이언트 계층
+애플리케이션 전체에서 하나의 AsyncOpenAI/AsyncAnthropic 클라이언트와 httpx 연결 풀을 공유
+
+- keep-alive 연결 재사용 (요청마다 TLS 연결을 새로 맺지 않음)
+  (공유 httpx 클라이언트를 받지 않는 SDK 버전이면 그 SDK 클라이언트의 기본 연결 풀을 공유)
+- 동시 호출 수 제한, 대기 수를 넘으면 즉시 거절 (PoolSaturatedError → 503 응답)
+- 호출별 타임아웃
+
+설정 (환경 변수):
+- LLM_MAX_CONCURRENCY: 동시에 진행하는 LLM 호출 수 (기본값: 16)
+- LLM_MAX_WAITING: 동시 호출 한도에 걸려 기다릴 수 있는 최대 요청 수 (기본값: 64)
+- LLM_TIMEOUT_SECONDS: 호출 하나의 전체 타임아웃 (기본값: 120)
+- LLM_CONNECT_TIMEOUT_SECONDS: 연결 타임아웃 (기본값: 10)
+- LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE_CONNECTIONS: httpx 연결 풀 크기 (기본값: 32 / 16)
+- LLM_MAX_RETRIES: SDK 재시도 횟수 (기본값: 2)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic
+
+from app.services.executor import PoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_WAITING = int(os.getenv("LLM_MAX_WAITING", "64"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class AsyncLLMClients:
+    """공유 연결 풀 위의 비동기 LLM 클라이언트와 동시 호출 제한"""
+
+    # 지표 계산에 사용할 최근 호출 수
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, max_waiting: int = LLM_MAX_WAITING):
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.timeout = httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[AsyncOpenAI] = None
+        self._anthropic: Optional[AsyncAnthropic] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._calls = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._wait_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+        self._run_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=self.timeout,
+            )
+        return self._http
+
+    def _create(self, sdk_class, api_key: str):
+        """공유 연결 풀을 쓰는 SDK 클라이언트 생성"""
+        options = {"api_key": api_key, "max_retries": LLM_MAX_RETRIES}
+        try:
+            return sdk_class(http_client=self._http_client(), timeout=self.timeout, **options)
+        except TypeError as e:
+            # httpx가 아닌 HTTP 라이브러리를 쓰는 SDK 버전은 httpx 객체(클라이언트, Timeout)를 거부함
+            logger.warning(f"{sdk_class.__name__}가 공유 httpx 연결 풀을 받지 않아 SDK 기본 연결 풀을 사용합니다: {e}")
+            return sdk_class(timeout=LLM_TIMEOUT_SECONDS, **options)
+
+    def openai(self) -> Optional[AsyncOpenAI]:
+        """공유 AsyncOpenAI 클라이언트 (API 키가 없으면 None)"""
+        if self._openai is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            self._openai = self._create(AsyncOpenAI, api_key)
+        return self._openai
+
+    def anthropic(self) -> Optional[AsyncAnthropic]:
+        """공유 AsyncAnthropic 클라이언트 (API 키가 없으면 None)"""
+        if self._anthropic is None:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                return None
+            self._anthropic = self._create(AsyncAnthropic, api_key)
+        return self._anthropic
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        동시 호출 한도 안에서 LLM 호출 실행.
+        기다리는 요청이 LLM_MAX_WAITING개를 넘으면 PoolSaturatedError 발생.
+        """
+        # 빈 슬롯이 있으면 바로 실행, 없을 때만 대기 수 한도 적용
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            self._rejected += 1
+            raise PoolSaturatedError("llm")
+        self._waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        started_at = time.perf_counter()
+        self._wait_times.append(started_at - queued_at)
+        self._in_flight += 1
+        self._calls += 1
+        ok = False
+        try:
+            yield
+            ok = True
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._run_times.append(time.perf_counter() - started_at)
+            if not ok:
+                self._failed += 1
+            self._semaphore.release()
+
+    async def call(self, request, timeout: Optional[float] = None) -> Any:
+        """
+        request(코루틴 함수)를 동시 호출 한도와 타임아웃 안에서 실행.
+
+        예: await llm_clients.call(lambda: client.messages.create(...), timeout=60)
+        """
+        async with self.slot():
+            return await asyncio.wait_for(request(), timeout or LLM_TIMEOUT_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        """동시 호출/대기 수, 거절/타임아웃 수, 대기/실행 시간 지표"""
+        wait_times = sorted(self._wait_times)
+        run_times = sorted(self._run_times)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_waiting": self.max_waiting,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "calls": self._calls,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "wait_ms_avg": _ms(sum(wait_times) / len(wait_times)) if wait_times else 0.0,
+            "wait_ms_max": _ms(wait_times[-1]) if wait_times else 0.0,
+            "run_ms_avg": _ms(sum(run_times) / len(run_times)) if run_times else 0.0,
+            "run_ms_max": _ms(run_times[-1]) if run_times else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        """연결 풀 종료 (애플리케이션 종료 시 호출)"""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._openai = None
+        self._anthropic = None
+
+
+llm_clients = AsyncLLMClients()
+
+
+__all__ = ["AsyncLLMClients", "llm_clients", "LLM_TIMEOUT_SECONDS"]
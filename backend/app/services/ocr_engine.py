@@ -0,0 +1,383 @@
+"""
+OCR 엔진 서비스
+PDF 페이지를 프로세스 풀에서 병렬로 렌더링/OCR 한 뒤 페이지 순서대로 재조립
+
+설정 (환경 변수):
+- OCR_MAX_WORKERS: OCR 워커 프로세스 수 (기본값: CPU 코어 수 - 1)
+- OCR_TESSERACT_THREADS: Tesseract 내부 스레드 수 제한 (기본값: 1)
+  워커 수 x 내부 스레드 수가 코어 수를 넘지 않도록 유지해야 과부하가 생기지 않음
+- TESSERACT_CMD: Tesseract 실행 파일 경로
+- OCR_BACKEND: auto(기본값) | tesserocr | pytesseract
+  auto/tesserocr는 워커 프로세스마다 Tesseract API를 한 번만 초기화해서
+  언어 모델(kor+eng)을 메모리에 유지하고 이미지 버퍼를 바로 전달.
+  tesserocr가 설치되어 있지 않거나 초기화에 실패하면 pytesseract(페이지마다 tesseract 실행)로 대체
+- TESSDATA_PREFIX: tessdata 디렉토리 (tesserocr 사용 시, 기본값: TESSERACT_CMD 옆의 tessdata)
+"""
+
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+import pytesseract
+
+from app.services.page_cache import page_text_cache, page_cache_key
+from app.services.pdf_document import acquire_pdf
+from app.services.upload_index import upload_index
+from app.services.progress import report_progress, STAGE_RENDER, STAGE_OCR
+
+logger = logging.getLogger(__name__)
+
+# 윈도우 환경에서 Tesseract 실행 파일 경로를 명시적으로 지정
+# (환경변수 PATH에 추가했더라도, 프로세스가 갱신된 PATH를 못 볼 수 있어서 예방 차원)
+TESSERACT_CMD = os.getenv("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto").lower()
+
+DEFAULT_ZOOM = 2.0
+DEFAULT_LANG = "kor+eng"
+
+# PDF 기본 해상도 (zoom 1.0 = 72dpi)
+PDF_BASE_DPI = 72
+
+_IMAGE_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+# 페이지 기준 비율 좌표 (x0, y0, x1, y1). 예: 상단 50% = (0.0, 0.0, 1.0, 0.5)
+ClipRatio = Tuple[float, float, float, float]
+TOP_HALF: ClipRatio = (0.0, 0.0, 1.0, 0.5)
+
+
+# 백그라운드(미리 계산) 작업 여부. True이면 대화형 OCR이 없을 때만 한 페이지씩 제출
+_background_priority: ContextVar[bool] = ContextVar("ocr_background_priority", default=False)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """블록 안의 OCR 요청을 낮은 우선순위로 처리 (대화형 요청이 진행 중이면 양보)"""
+    token = _background_priority.set(True)
+    try:
+        yield
+    finally:
+        _background_priority.reset(token)
+
+
+def _default_max_workers() -> int:
+    configured = int(os.getenv("OCR_MAX_WORKERS", "0") or 0)
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# 워커 프로세스별 상태 (언어 설정별로 초기화된 Tesseract API)
+_tess_apis: Dict[str, Any] = {}
+_tesserocr_failed = False
+
+
+def _init_worker(tesseract_cmd: str, tesseract_threads: int, backend: str = "auto") -> None:
+    """워커 프로세스 초기화: Tesseract 경로 및 내부 스레드 수 제한, 언어 모델 미리 로드"""
+    # Tesseract(OpenMP)는 기본적으로 모든 코어를 사용하므로 워커별로 제한
+    # (tesserocr를 import 하기 전에 설정해야 적용됨)
+    os.environ["OMP_THREAD_LIMIT"] = str(tesseract_threads)
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    global _tesserocr_failed
+    if backend == "pytesseract":
+        _tesserocr_failed = True
+        return
+    # 첫 요청이 초기화 비용을 내지 않도록 기본 언어 모델을 미리 로드
+    _get_tess_api(DEFAULT_LANG)
+
+
+def _get_tess_api(lang: str) -> Optional[Any]:
+    """이 워커 프로세스에서 재사용할 Tesseract API (사용할 수 없으면 None)"""
+    global _tesserocr_failed
+    if _tesserocr_failed:
+        return None
+    api = _tess_apis.get(lang)
+    if api is not None:
+        return api
+    try:
+        import tesserocr
+
+        tessdata = os.getenv("TESSDATA_PREFIX") or os.path.join(os.path.dirname(TESSERACT_CMD), "tessdata")
+        if os.path.isdir(tessdata):
+            api = tesserocr.PyTessBaseAPI(path=tessdata, lang=lang, psm=tesserocr.PSM.AUTO)
+        else:
+            api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.AUTO)
+    except Exception as e:
+        # 설치되지 않았거나 traineddata를 찾지 못한 경우 pytesseract로 대체
+        logger.warning(f"tesserocr 사용 불가, pytesseract로 대체합니다: {e}")
+        _tesserocr_failed = True
+        return None
+    _tess_apis[lang] = api
+    return api
+
+
+def _recognize(samples, width: int, height: int, channels: int, stride: int, lang: str, dpi: int) -> str:
+    """
+    이미지 버퍼 OCR (상주 Tesseract API 우선, 실패 시 pytesseract).
+    samples는 bytes 또는 memoryview (PyMuPDF pixmap 버퍼를 복사 없이 전달 가능).
+    """
+    api = _get_tess_api(lang)
+    if api is not None:
+        try:
+            # tesserocr는 bytes만 받으므로 memoryview인 경우 한 번만 복사 (흑백이면 RGB의 1/3 크기)
+            api.SetImageBytes(samples if isinstance(samples, bytes) else bytes(samples), width, height, channels, stride)
+            api.SetSourceResolution(dpi)
+            return api.GetUTF8Text() or ""
+        except Exception as e:
+            logger.warning(f"tesserocr OCR 실패, pytesseract로 재시도: {e}")
+        finally:
+            api.Clear()
+
+    # 버퍼를 복사하지 않고 PIL 이미지로 감쌈
+    mode = _IMAGE_MODES[channels]
+    img = Image.frombuffer(mode, (width, height), samples, "raw", mode, stride, 1)
+    # pytesseract는 이미지를 임시 파일로 저장하므로, PNG 압축 대신 비압축 BMP로 저장되도록 지정
+    img.format = "BMP"
+    return pytesseract.image_to_string(img, lang=lang) or ""
+
+
+def _clip_rect(page: "fitz.Page", clip: Optional[ClipRatio]) -> Optional["fitz.Rect"]:
+    """비율 좌표를 페이지 좌표계의 Rect로 변환"""
+    if clip is None:
+        return None
+    rect = page.rect
+    return fitz.Rect(
+        rect.x0 + rect.width * clip[0],
+        rect.y0 + rect.height * clip[1],
+        rect.x0 + rect.width * clip[2],
+        rect.y0 + rect.height * clip[3],
+    )
+
+
+def _ocr_page(
+    file_path: str, page_index: int, zoom: float, clip: Optional[ClipRatio], lang: str
+) -> Tuple[str, float, float]:
+    """
+    (워커 프로세스에서 실행) 한 페이지를 흑백으로 렌더링하고 OCR 수행.
+    프로세스 간에는 파일 경로와 페이지 번호만 전달하고, 이미지는 워커 안에서 생성해서
+    pixmap 버퍼를 PIL 변환이나 PNG 인코딩 없이 OCR에 바로 전달.
+
+    Returns:
+        (OCR 텍스트, 렌더링 시간 ms, OCR 시간 ms)
+    """
+    doc = fitz.open(file_path)
+    try:
+        started_at = time.perf_counter()
+        page = doc[page_index]
+        mat = fitz.Matrix(zoom, zoom)
+        # OCR에는 색상이 필요 없으므로 흑백(1채널)으로 바로 렌더링 (RGB 대비 메모리 1/3)
+        pix = page.get_pixmap(matrix=mat, clip=_clip_rect(page, clip), colorspace=fitz.csGRAY, alpha=False)
+        rendered_at = time.perf_counter()
+        text = _recognize(pix.samples_mv, pix.width, pix.height, pix.n, pix.stride, lang, round(PDF_BASE_DPI * zoom))
+        finished_at = time.perf_counter()
+        return text, (rendered_at - started_at) * 1000, (finished_at - rendered_at) * 1000
+    finally:
+        doc.close()
+
+
+class OCREngine:
+    """페이지 단위 병렬 OCR 엔진 (프로세스 풀 기반)"""
+
+    def __init__(self, max_workers: Optional[int] = None, tesseract_threads: Optional[int] = None):
+        self.max_workers = max_workers or _default_max_workers()
+        self.tesseract_threads = tesseract_threads or int(os.getenv("OCR_TESSERACT_THREADS", "1"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # 진행 중인 대화형 OCR 요청 수 (백그라운드 작업은 0이 될 때까지 대기)
+        self._interactive = 0
+        self._idle = threading.Condition()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(
+                    f"OCR 프로세스 풀 시작 (워커 {self.max_workers}개, "
+                    f"Tesseract 스레드 {self.tesseract_threads}개)"
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(TESSERACT_CMD, self.tesseract_threads, OCR_BACKEND),
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: Optional[ProcessPoolExecutor] = None) -> None:
+        with self._lock:
+            # 다른 스레드가 이미 새 풀로 교체했다면 그대로 둠
+            if broken is not None and self._executor is not broken:
+                return
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def ocr_pages(
+        self,
+        file_path: str,
+        page_indices: Optional[Sequence[int]] = None,
+        zoom: float = DEFAULT_ZOOM,
+        clip: Optional[ClipRatio] = None,
+        lang: str = DEFAULT_LANG,
+    ) -> list[str]:
+        """
+        여러 페이지를 병렬로 OCR 하여 요청한 페이지 순서대로 텍스트 목록 반환.
+
+        Args:
+            file_path: PDF 파일 경로
+            page_indices: OCR할 페이지 인덱스 목록 (0부터 시작, None이면 전체 페이지)
+            zoom: 렌더링 확대 배율
+            clip: 페이지 기준 비율 좌표로 잘라낼 영역 (None이면 전체 페이지)
+            lang: Tesseract 언어 설정
+
+        이미 OCR한 적 있는 페이지(내용 해시 + 파라미터 동일)는 디스크 캐시에서 바로 반환.
+        실패한 페이지는 빈 문자열로 채움.
+        """
+        # 페이지 내용 해시로 캐시를 먼저 조회하고, 없는 페이지만 워커에 전달
+        texts: Dict[int, str] = {}
+        cache_keys: Dict[int, str] = {}
+        with acquire_pdf(file_path) as pdf:
+            if page_indices is None:
+                page_indices = list(range(pdf.page_count))
+            page_indices = list(page_indices)
+            if page_text_cache.enabled:
+                for page_index in page_indices:
+                    try:
+                        content_hash = pdf.page_content_hash(page_index)
+                    except Exception as e:
+                        logger.warning(f"페이지 {page_index + 1}: 내용 해시 계산 실패, 캐시 미사용: {e}")
+                        continue
+                    key = page_cache_key(content_hash, zoom, clip, lang)
+                    cache_keys[page_index] = key
+                    cached = page_text_cache.get(key)
+                    if cached is not None:
+                        texts[page_index] = cached
+
+        pending = [page_index for page_index in page_indices if page_index not in texts]
+        if texts:
+            logger.info(f"페이지 텍스트 캐시 적중: {len(texts)}/{len(page_indices)} 페이지")
+            for page_index in texts:
+                report_progress(STAGE_OCR, page=page_index + 1, total=len(page_indices), cached=True)
+        if not pending:
+            upload_index.add_artifacts(file_path, "page_text", cache_keys.values())
+            return [texts[page_index] for page_index in page_indices]
+
+        total = len(page_indices)
+        if _background_priority.get():
+            # 백그라운드: 대화형 요청이 없을 때만 한 페이지씩 제출해서 워커를 오래 점유하지 않음
+            for page_index in pending:
+                self._wait_until_idle()
+                self._run_pages(file_path, [page_index], zoom, clip, lang, total, texts, cache_keys)
+        else:
+            with self._idle:
+                self._interactive += 1
+            try:
+                self._run_pages(file_path, pending, zoom, clip, lang, total, texts, cache_keys)
+            finally:
+                with self._idle:
+                    self._interactive -= 1
+                    self._idle.notify_all()
+
+        # 업로드 파일을 지울 때 함께 정리할 수 있도록 캐시 항목 기록
+        upload_index.add_artifacts(file_path, "page_text", cache_keys.values())
+        return [texts[page_index] for page_index in page_indices]
+
+    def _wait_until_idle(self) -> None:
+        with self._idle:
+            while self._interactive > 0:
+                self._idle.wait()
+
+    def _run_pages(
+        self,
+        file_path: str,
+        pending: Sequence[int],
+        zoom: float,
+        clip: Optional[ClipRatio],
+        lang: str,
+        total: int,
+        texts: Dict[int, str],
+        cache_keys: Dict[int, str],
+    ) -> None:
+        """pending 페이지를 워커에 제출하고 결과를 texts에 채움 (성공한 결과는 캐시에 저장)"""
+        try:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_ocr_page, file_path, page_index, zoom, clip, lang)
+                for page_index in pending
+            ]
+        except BrokenProcessPool:
+            # 워커가 비정상 종료된 경우 풀을 재생성하고 한 번 더 시도
+            logger.warning("OCR 프로세스 풀이 손상되어 재시작합니다.")
+            self._reset_executor(broken=executor)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_ocr_page, file_path, page_index, zoom, clip, lang)
+                for page_index in pending
+            ]
+
+        # 완료되는 순서대로 진행 상황을 보고하고, 결과는 페이지 순서대로 재조립
+        future_pages = dict(zip(futures, pending))
+        for future in as_completed(future_pages):
+            page_index = future_pages[future]
+            try:
+                text, render_ms, ocr_ms = future.result()
+            except BrokenProcessPool:
+                logger.error(f"페이지 {page_index + 1}: OCR 워커 비정상 종료")
+                self._reset_executor(broken=executor)
+                texts[page_index] = ""
+                continue
+            except Exception as e:
+                logger.error(f"페이지 {page_index + 1}: OCR 실패: {e}")
+                texts[page_index] = ""
+                continue
+            texts[page_index] = text
+            report_progress(STAGE_RENDER, page=page_index + 1, total=total, elapsed_ms=round(render_ms, 1))
+            report_progress(STAGE_OCR, page=page_index + 1, total=total, elapsed_ms=round(ocr_ms, 1))
+            # 성공한 결과만 캐시에 저장
+            if page_index in cache_keys:
+                page_text_cache.set(cache_keys[page_index], text)
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료 (애플리케이션 종료 시 호출)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_engine: Optional[OCREngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_ocr_engine() -> OCREngine:
+    """애플리케이션 공용 OCR 엔진 반환"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = OCREngine()
+        return _engine
+
+
+def shutdown_ocr_engine() -> None:
+    """공용 OCR 엔진 종료"""
+    with _engine_lock:
+        if _engine is not None:
+            _engine.shutdown()
+
+
+__all__ = [
+    "OCREngine",
+    "get_ocr_engine",
+    "shutdown_ocr_engine",
+    "DEFAULT_ZOOM",
+    "DEFAULT_LANG",
+    "TOP_HALF",
+]
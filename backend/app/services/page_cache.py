@@ -0,0 +1,306 @@
+"""
+페이지 텍스트 캐시 서비스
+페이지 내용 해시 + 렌더링 파라미터를 키로 하는 디스크 캐시 (크기 제한 LRU 제거)
+
+설정 (환경 변수):
+- PAGE_CACHE_DIR: 캐시 디렉토리 (기본값: cache/page_text)
+- PAGE_CACHE_MAX_MB: 최대 캐시 크기 MB (기본값: 512, 0이면 캐시 비활성화)
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# 캐시 형식이 바뀌면 올려서 기존 항목을 무효화
+PAGE_CACHE_VERSION = "3"
+
+# PDF 객체 참조 ("12 0 R")
+_XREF_REFERENCE = re.compile(rb"(\d+) (\d+) R")
+
+# 상위 객체를 가리키는 역참조 (페이지 트리 /Parent, 주석의 /P): 내용과 무관하고 순환만 만들므로 해시에서 제외
+_BACK_REFERENCE = re.compile(rb"/(Parent|P)\s+\d+\s+\d+\s+R")
+
+
+class DiskLRUCache:
+    """
+    파일 하나에 항목 하나를 저장하는 디스크 캐시.
+    조회 시 파일 수정 시각을 갱신하고, 최대 크기를 넘으면 가장 오래전에 사용한 항목부터 제거.
+    여러 프로세스가 같은 디렉토리를 공유해도 되도록 쓰기는 임시 파일 + rename으로 처리.
+    """
+
+    # 제거 시 최대 크기의 90%까지 줄여서 매 쓰기마다 제거가 일어나지 않도록 함
+    EVICT_WATERMARK = 0.9
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".txt"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 값 반환 (없으면 None)"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            # LRU 판단을 위해 최근 사용 시각 갱신
+            os.utime(path, None)
+        except (FileNotFoundError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """값 저장 후 필요하면 오래된 항목 제거"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            # 같은 키를 덮어쓰면 기존 파일 크기만큼 빼야 사용량이 맞음
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"캐시 저장 실패 ({key}): {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = self._scan_size()
+            else:
+                self._size_bytes = max(0, self._size_bytes + len(value.encode("utf-8")) - old_size)
+            if self._size_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """가장 오래전에 사용한 항목부터 제거 (lock 보유 상태에서 호출)"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    # 다른 프로세스가 쓰는 중인 파일
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * self.EVICT_WATERMARK)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+        self._size_bytes = total
+        logger.info(f"캐시 정리 완료 ({self.directory}): {total / 1024 / 1024:.1f}MB 사용 중")
+
+    def delete(self, key: str) -> bool:
+        """항목 하나 삭제 (있었으면 True)"""
+        if not self.enabled:
+            return False
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes = max(0, self._size_bytes - size)
+            self.evictions += 1
+        return True
+
+    def purge_older_than(self, max_age_seconds: float) -> int:
+        """마지막 사용 후 max_age_seconds가 지난 항목 삭제 (삭제한 개수 반환)"""
+        if not self.enabled:
+            return 0
+        cutoff = time.time() - max_age_seconds
+        purged = 0
+        with self._lock:
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                        if stat.st_mtime >= cutoff:
+                            continue
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    purged += 1
+                    self.evictions += 1
+                    if self._size_bytes is not None:
+                        self._size_bytes = max(0, self._size_bytes - stat.st_size)
+        return purged
+
+    def clear(self) -> None:
+        """모든 항목 삭제"""
+        with self._lock:
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+            self._size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 카운터와 사용량"""
+        with self._lock:
+            if self.enabled and self._size_bytes is None:
+                self._size_bytes = self._scan_size()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "size_bytes": self._size_bytes or 0,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _object_hash(doc: "fitz.Document", xref: int, memo: Dict[int, str], visiting: Optional[set] = None) -> str:
+    """
+    PDF 객체와 이 객체가 참조하는 객체 전체의 해시 (xref 번호와 무관).
+    객체 사전의 참조("12 0 R")를 참조된 객체의 해시로 바꿔서 해시하고, 스트림이면 원본 바이트도 포함.
+    폰트는 FontDescriptor의 글꼴 프로그램(FontFile*)과 ToUnicode까지,
+    폼 XObject는 중첩된 Resources의 폰트/이미지까지 포함됨.
+    """
+    return _hash_object(doc, xref, memo, visiting if visiting is not None else set())[0]
+
+
+def _hash_object(doc: "fitz.Document", xref: int, memo: Dict[int, str], visiting: set) -> Tuple[str, bool]:
+    """
+    (객체 해시, 순환 참조 없이 계산했는지 여부).
+    순환 참조 자리에 "cycle"을 넣고 계산한 해시는 어느 객체부터 탐색했는지에 따라 달라지므로 memo에 저장하지 않음.
+    """
+    if xref in memo:
+        return memo[xref], True
+    if xref in visiting:
+        return "cycle", False
+    visiting.add(xref)
+    complete = True
+
+    def replace(match) -> bytes:
+        nonlocal complete
+        digest, child_complete = _hash_object(doc, int(match.group(1)), memo, visiting)
+        complete = complete and child_complete
+        return digest.encode()
+
+    source = doc.xref_object(xref, compressed=True).encode("utf-8", "surrogateescape")
+    h = hashlib.sha256()
+    h.update(_XREF_REFERENCE.sub(replace, _BACK_REFERENCE.sub(rb"/\1", source)))
+    if doc.xref_is_stream(xref):
+        h.update(doc.xref_stream_raw(xref) or b"")
+    visiting.discard(xref)
+    digest = h.hexdigest()
+    if complete:
+        memo[xref] = digest
+    return digest, complete
+
+
+def page_content_hash(doc: "fitz.Document", page: "fitz.Page", memo: Optional[Dict[int, str]] = None) -> str:
+    """
+    페이지 내용 해시.
+    같은 페이지가 다른 PDF에 들어 있어도 같은 값이 나오도록 페이지 크기/회전, 콘텐츠 스트림,
+    그리고 페이지가 쓰는 이미지/폼 XObject/폰트를 리소스 이름과 객체 해시(_object_hash)로 해시.
+    이름이 같아도 내장 글꼴 프로그램이 다른 폰트(서브셋 폰트 등)는 다른 값이 됨.
+
+    Args:
+        memo: xref별 객체 해시 (같은 문서의 여러 페이지가 공유하는 폰트를 한 번만 해시)
+    """
+    memo = memo if memo is not None else {}
+    h = hashlib.sha256()
+    h.update(repr((tuple(page.rect), page.rotation)).encode())
+    h.update(page.read_contents())
+    resources = []
+    for image in page.get_images(full=True):
+        # (xref, smask, width, height, bpc, colorspace, alt. colorspace, name, filter, referencer)
+        resources.append(("image", image[7], _object_hash(doc, image[0], memo)))
+    for xobject in page.get_xobjects():
+        # (xref, name, invoker, bbox)
+        resources.append(("xobject", xobject[1], _object_hash(doc, xobject[0], memo)))
+    for font in page.get_fonts(full=True):
+        # (xref, ext, type, basefont, name, encoding, referencer)
+        resources.append(("font", font[4], _object_hash(doc, font[0], memo)))
+    for resource in sorted(resources):
+        h.update(repr(resource).encode())
+    return h.hexdigest()
+
+
+def page_cache_key(content_hash: str, zoom: float, clip: Optional[tuple], lang: str) -> str:
+    """페이지 내용 해시 + 렌더링 파라미터로 캐시 키 생성"""
+    params = f"v{PAGE_CACHE_VERSION}|zoom={zoom}|clip={clip}|lang={lang}"
+    return hashlib.sha256(f"{content_hash}|{params}".encode()).hexdigest()
+
+
+page_text_cache = DiskLRUCache(
+    directory=os.getenv("PAGE_CACHE_DIR", os.path.join("cache", "page_text")),
+    max_bytes=int(float(os.getenv("PAGE_CACHE_MAX_MB", "512")) * 1024 * 1024),
+)
+
+
+__all__ = [
+    "DiskLRUCache",
+    "page_text_cache",
+    "page_content_hash",
+    "page_cache_key",
+]
@@ -0,0 +1,385 @@
+"""
+PDF 문서 핸들 서비스
+요청 하나에서 같은 PDF를 한 번만 열고, 페이지 텍스트/표/이미지 여부/내용 해시를
+필요할 때 계산해서 재사용 (파서와 추출기가 공유)
+
+사용 예:
+    # 라우트: 요청 범위 지정
+    with pdf_document_scope():
+        text = await run_in_pool("ocr", parser.parse, file_path, file_ext)
+        result = await run_in_pool("ocr", extract_shareholder_fields, file_path, file_ext, text)
+
+    # 서비스: 범위 안이면 공유 핸들, 밖이면 새로 열고 닫음
+    with acquire_pdf(file_path) as pdf:
+        tables = pdf.page_tables(0)
+
+파일 바이트는 프로세스 안에서 공유하는 읽기 전용 메모리 맵(mmap)으로 읽음.
+같은 파일을 여는 문서 핸들(동시 요청, 미리 계산 작업 등)이 하나의 매핑을 함께 쓰므로
+큰 스캔 PDF도 핸들마다 파일 전체를 복사하지 않고 OS 페이지 캐시를 공유함.
+(PyMuPDF는 매핑의 memoryview를, pdfplumber는 매핑 위의 파일 객체를 받음)
+"""
+
+import io
+import os
+import mmap
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from app.services.page_cache import page_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class _MappedReader(io.RawIOBase):
+    """공유 메모리 맵 위의 읽기 전용 파일 객체 (핸들마다 읽기 위치를 따로 가짐)"""
+
+    def __init__(self, buffer: mmap.mmap):
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        data = self._buffer[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+class SharedPDFMapping:
+    """같은 프로세스에서 같은 파일을 여는 문서 핸들이 공유하는 읽기 전용 메모리 맵"""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self.refs = 0
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def reader(self) -> _MappedReader:
+        return _MappedReader(self.buffer)
+
+    def close(self) -> None:
+        try:
+            self.buffer.close()
+        except BufferError:
+            # 아직 버퍼를 참조하는 객체가 있으면 가비지 컬렉션 때 해제됨
+            pass
+
+
+# 열려 있는 메모리 맵 ((실제 경로, 크기, 수정 시각) → 매핑)
+_mappings: Dict[Tuple[str, int, int], SharedPDFMapping] = {}
+_mappings_lock = threading.Lock()
+_mapping_stats = {"mapped": 0, "shared": 0, "fitz_stream": 0, "fitz_path_fallback": 0}
+
+
+def _acquire_mapping(file_path: str) -> Optional[SharedPDFMapping]:
+    """파일의 공유 메모리 맵 참조 획득 (빈 파일 등 매핑할 수 없으면 None)"""
+    path = os.path.realpath(file_path)
+    stat = os.stat(path)
+    if stat.st_size == 0:
+        return None
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    with _mappings_lock:
+        mapping = _mappings.get(key)
+        if mapping is None:
+            try:
+                mapping = SharedPDFMapping(path, stat.st_size)
+            except (OSError, ValueError) as e:
+                logger.warning(f"PDF 메모리 맵 실패, 파일을 읽어서 사용 ({file_path}): {e}")
+                return None
+            _mappings[key] = mapping
+            _mapping_stats["mapped"] += 1
+        else:
+            _mapping_stats["shared"] += 1
+        mapping.refs += 1
+        return mapping
+
+
+def _release_mapping(mapping: SharedPDFMapping) -> None:
+    with _mappings_lock:
+        mapping.refs -= 1
+        if mapping.refs > 0:
+            return
+        for key, value in list(_mappings.items()):
+            if value is mapping:
+                del _mappings[key]
+    mapping.close()
+
+
+def _count_mapping_stat(name: str) -> None:
+    # 문서별 _lock만 잡은 스레드끼리도 경합하므로 매핑 지표는 항상 _mappings_lock 아래에서 갱신
+    with _mappings_lock:
+        _mapping_stats[name] += 1
+
+
+def _resident_bytes_by_path() -> Optional[Dict[str, int]]:
+    """/proc/self/smaps에서 파일별 매핑의 상주 메모리(RSS) 합계 (Linux 외에는 None)"""
+    try:
+        with open("/proc/self/smaps", "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    resident: Dict[str, int] = {}
+    current: Optional[str] = None
+    for line in lines:
+        fields = line.split(None, 5)
+        if fields and "-" in fields[0] and len(fields) >= 5:
+            # 매핑 헤더: 주소 권한 오프셋 장치 inode [경로]
+            current = fields[5].strip() if len(fields) == 6 else None
+        elif current and fields and fields[0] == "Rss:":
+            resident[current] = resident.get(current, 0) + int(fields[1]) * 1024
+    return resident
+
+
+def pdf_mapping_stats() -> Dict[str, Any]:
+    """열려 있는 PDF 메모리 맵별 크기, 사용 중인 핸들 수, 상주 메모리"""
+    with _mappings_lock:
+        mappings = [(mapping.path, mapping.size, mapping.refs) for mapping in _mappings.values()]
+        stats = dict(_mapping_stats)
+    resident = _resident_bytes_by_path() if mappings else {}
+    documents = [
+        {
+            "path": path,
+            "size_bytes": size,
+            "handles": refs,
+            "resident_bytes": resident.get(path) if resident is not None else None,
+        }
+        for path, size, refs in mappings
+    ]
+    return {
+        "open_mappings": len(documents),
+        "open_handles": sum(document["handles"] for document in documents),
+        "mapped_bytes": sum(document["size_bytes"] for document in documents),
+        "resident_bytes": sum(document["resident_bytes"] or 0 for document in documents)
+        if resident is not None else None,
+        "documents": documents,
+        **stats,
+    }
+
+
+class PDFDocument:
+    """
+    PDF 바이트(공유 메모리 맵)를 PyMuPDF와 pdfplumber가 공유하는 문서 핸들.
+    각 라이브러리는 처음 필요할 때 열리고, 페이지별 결과는 메모이즈됨.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._mapping = _acquire_mapping(file_path)
+        self._data: Optional[bytes] = None
+        if self._mapping is None:
+            with open(file_path, "rb") as f:
+                self._data = f.read()
+        self._fitz_doc: Optional["fitz.Document"] = None
+        self._fitz_view: Optional[memoryview] = None
+        self._plumber_pdf = None
+        self._texts: Dict[int, str] = {}
+        self._tables: Dict[int, List[List[List[Optional[str]]]]] = {}
+        self._has_images: Dict[int, bool] = {}
+        self._content_hashes: Dict[int, str] = {}
+        self._object_hashes: Dict[int, str] = {}  # 페이지 해시용 xref별 객체 해시 (공유 폰트 등)
+        # pdfplumber/PyMuPDF 객체는 스레드 안전하지 않으므로 직렬화
+        self._lock = threading.RLock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._mapping.size if self._mapping is not None else len(self._data)
+
+    @property
+    def fitz_doc(self) -> "fitz.Document":
+        with self._lock:
+            if self._fitz_doc is None:
+                if self._mapping is None:
+                    self._fitz_doc = fitz.open(stream=self._data, filetype="pdf")
+                else:
+                    # PyMuPDF는 mmap 객체는 받지 않지만 memoryview는 복사 없이 그대로 사용
+                    view = memoryview(self._mapping.buffer)
+                    try:
+                        self._fitz_doc = fitz.open(stream=view, filetype="pdf")
+                        self._fitz_view = view
+                        _count_mapping_stat("fitz_stream")
+                    except (TypeError, ValueError):
+                        # memoryview 스트림을 받지 않는 PyMuPDF 버전: 경로로 열면 MuPDF가 필요한 부분만 읽음
+                        view.release()
+                        self._fitz_doc = fitz.open(self.file_path)
+                        _count_mapping_stat("fitz_path_fallback")
+            return self._fitz_doc
+
+    @property
+    def plumber_pdf(self):
+        with self._lock:
+            if self._plumber_pdf is None:
+                if self._mapping is None:
+                    self._plumber_pdf = pdfplumber.open(io.BytesIO(self._data))
+                else:
+                    self._plumber_pdf = pdfplumber.open(self._mapping.reader())
+            return self._plumber_pdf
+
+    @property
+    def page_count(self) -> int:
+        return len(self.fitz_doc)
+
+    def page_text(self, page_index: int) -> str:
+        """텍스트 레이어 (pdfplumber extract_text)"""
+        with self._lock:
+            if page_index not in self._texts:
+                self._texts[page_index] = self.plumber_pdf.pages[page_index].extract_text() or ""
+            return self._texts[page_index]
+
+    def page_tables(self, page_index: int) -> List[List[List[Optional[str]]]]:
+        """표 목록 (pdfplumber extract_tables)"""
+        with self._lock:
+            if page_index not in self._tables:
+                self._tables[page_index] = self.plumber_pdf.pages[page_index].extract_tables()
+            return self._tables[page_index]
+
+    def page_has_images(self, page_index: int) -> bool:
+        """페이지에 이미지가 있는지 여부"""
+        with self._lock:
+            if page_index not in self._has_images:
+                self._has_images[page_index] = bool(self.fitz_doc[page_index].get_images())
+            return self._has_images[page_index]
+
+    def page_content_hash(self, page_index: int) -> str:
+        """페이지 내용 해시 (페이지 텍스트 캐시 키 계산용)"""
+        with self._lock:
+            if page_index not in self._content_hashes:
+                doc = self.fitz_doc
+                self._content_hashes[page_index] = page_content_hash(doc, doc[page_index], self._object_hashes)
+            return self._content_hashes[page_index]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._plumber_pdf is not None:
+                self._plumber_pdf.close()
+                self._plumber_pdf = None
+            if self._fitz_doc is not None:
+                self._fitz_doc.close()
+                self._fitz_doc = None
+            if self._fitz_view is not None:
+                try:
+                    self._fitz_view.release()
+                except BufferError:
+                    # 아직 참조가 남아 있으면 가비지 컬렉션 때 해제됨 (매핑 close도 같은 방식)
+                    pass
+                self._fitz_view = None
+            if self._mapping is not None:
+                _release_mapping(self._mapping)
+                self._mapping = None
+                self._data = b""
+
+    def __enter__(self) -> "PDFDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _DocumentScope:
+    """
+    요청 범위에서 공유하는 문서 핸들 (파일 경로 → PDFDocument)과 핸들별 사용 수.
+    요청이 취소되어 범위가 먼저 끝나도 작업 풀에서 아직 쓰고 있는 핸들은
+    마지막 acquire_pdf 블록이 끝날 때 닫힘.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, PDFDocument] = {}
+        self._users: Dict[str, int] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def retain(self, file_path: str) -> Optional[PDFDocument]:
+        """공유 핸들의 사용 수를 늘려서 반환 (범위가 이미 끝났으면 None)"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            if self._closed:
+                return None
+            document = self.documents.get(key)
+            if document is None:
+                document = PDFDocument(file_path)
+                self.documents[key] = document
+            self._users[key] = self._users.get(key, 0) + 1
+            return document
+
+    def release(self, file_path: str) -> None:
+        key = os.path.abspath(file_path)
+        with self._lock:
+            self._users[key] -= 1
+            if not self._closed or self._users[key] > 0:
+                return
+            document = self.documents.pop(key)
+        document.close()
+
+    def close(self) -> None:
+        """범위 종료: 사용 중이 아닌 핸들만 바로 닫고, 나머지는 마지막 사용이 끝날 때 닫음"""
+        with self._lock:
+            self._closed = True
+            idle = [key for key in self.documents if self._users.get(key, 0) == 0]
+            documents = [self.documents.pop(key) for key in idle]
+        for document in documents:
+            document.close()
+
+
+_scoped_documents: ContextVar[Optional[_DocumentScope]] = ContextVar("scoped_pdf_documents", default=None)
+
+
+@contextmanager
+def pdf_document_scope() -> Iterator[None]:
+    """
+    블록 안에서 같은 파일에 대한 acquire_pdf 호출이 하나의 핸들을 공유하도록 범위 지정.
+    작업 풀은 컨텍스트를 복사해서 실행하므로 run_in_pool로 넘긴 작업에서도 공유됨.
+    """
+    scope = _DocumentScope()
+    token = _scoped_documents.set(scope)
+    try:
+        yield
+    finally:
+        _scoped_documents.reset(token)
+        scope.close()
+
+
+@contextmanager
+def acquire_pdf(file_path: str) -> Iterator[PDFDocument]:
+    """범위 안이면 공유 핸들을, 밖이면 이 블록 동안만 쓰는 핸들을 반환"""
+    scope = _scoped_documents.get()
+    document = scope.retain(file_path) if scope is not None else None
+    if document is None:
+        with PDFDocument(file_path) as document:
+            yield document
+        return
+
+    try:
+        yield document
+    finally:
+        scope.release(file_path)
+
+
+__all__ = ["PDFDocument", "pdf_document_scope", "acquire_pdf", "pdf_mapping_stats"]
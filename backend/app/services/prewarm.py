@@ -0,0 +1,155 @@
+"""
+업로드 직후 미리 계산 서비스
+업로드가 끝나면 백그라운드에서
+1. 문서 종류를 분류해서 업로드 인덱스에 기록 (/api/analyze/auto가 바로 사용)
+2. 문서 종류에 맞는 추출 경로로 페이지 텍스트 추출/OCR을 실행해서 페이지 텍스트 캐시를 채움
+이후 /api/analyze/* 요청은 대부분의 페이지를 캐시에서 바로 가져감
+
+- prewarm 작업 풀(기본 1개 스레드)에서 실행하고, OCR은 대화형 요청이 없을 때만 한 페이지씩 제출
+- 대기열이 가득 차면 미리 계산을 건너뜀 (업로드 응답에는 영향 없음)
+
+설정 (환경 변수):
+- CLASSIFY_ON_UPLOAD: true이면 업로드 직후 문서 종류 분류 (기본값: true, 꺼져 있으면 /api/analyze/auto 요청 시 분류)
+- PREWARM_ON_UPLOAD: true이면 업로드 직후 미리 계산 (기본값: false, 문서 종류를 분류한 파일만)
+- PREWARM_MAX_PAGES: 이보다 페이지가 많은 문서는 건너뜀 (기본값: 80)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.services.document_parser import DocumentParser
+from app.services.document_classifier import (
+    KIND_BUSINESS_REGISTRATION,
+    KIND_FINANCIAL_STATEMENT,
+    classify_document,
+)
+from app.services.financial_statement_extractor import extract_financial_statement_fields
+from app.services.executor import run_in_pool, PoolSaturatedError
+from app.services.ocr_engine import background_priority
+from app.services.pdf_document import acquire_pdf, pdf_document_scope
+from app.services.upload_index import upload_index
+
+logger = logging.getLogger(__name__)
+
+CLASSIFY_ON_UPLOAD = os.getenv("CLASSIFY_ON_UPLOAD", "true").lower() == "true"
+PREWARM_ON_UPLOAD = os.getenv("PREWARM_ON_UPLOAD", "false").lower() == "true"
+PREWARM_MAX_PAGES = int(os.getenv("PREWARM_MAX_PAGES", "80"))
+
+# 실행 중인 미리 계산 작업 (같은 파일 중복 실행 방지, 종료 시 취소)
+_tasks: Dict[str, "asyncio.Task"] = {}
+_stats = {"scheduled": 0, "classified": 0, "completed": 0, "skipped": 0, "failed": 0}
+
+
+def classify_upload(file_path: str, file_ext: str, file_id: str, filename: Optional[str] = None) -> Optional[str]:
+    """
+    문서 종류를 낮은 우선순위로 분류해서 업로드 인덱스에 기록 (동기 함수, prewarm 풀에서 실행).
+    이미 분류된 파일(중복 업로드)은 기록된 종류를 그대로 반환.
+    """
+    record = upload_index.get(file_id)
+    if record is not None and record.doc_kind:
+        return record.doc_kind
+    with pdf_document_scope(), background_priority():
+        classification = classify_document(file_path, file_ext, filename)
+    upload_index.update_metadata(file_id, doc_kind=classification.kind)
+    _stats["classified"] += 1
+    return classification.kind
+
+
+def prewarm_document(file_path: str, doc_kind: Optional[str] = None) -> Optional[int]:
+    """
+    문서 종류에 맞는 추출 경로를 낮은 우선순위로 실행해서 캐시를 채움 (동기 함수, prewarm 풀에서 실행).
+    - 사업자등록증: OCR 전용, 상단 50%
+    - 재무제표: 제목 영역 OCR로 페이지 분류 후 필요한 페이지만 전체 OCR
+    - 그 외: 전체 페이지 텍스트 추출/OCR
+
+    Returns:
+        문서 페이지 수 (건너뛴 경우 None)
+    """
+    with pdf_document_scope(), background_priority():
+        with acquire_pdf(file_path) as pdf:
+            page_count = pdf.page_count
+        if page_count > PREWARM_MAX_PAGES:
+            logger.info(f"미리 계산 건너뜀 ({page_count}페이지 > {PREWARM_MAX_PAGES}): {file_path}")
+            return None
+        started_at = time.perf_counter()
+        if doc_kind == KIND_BUSINESS_REGISTRATION:
+            DocumentParser.parse(file_path, ".pdf", ocr_only=True, top_half_only=True)
+        elif doc_kind == KIND_FINANCIAL_STATEMENT:
+            extract_financial_statement_fields(file_path, ".pdf", None)
+        else:
+            DocumentParser.parse_pdf_pages(file_path)
+        logger.info(
+            f"미리 계산 완료: {file_path} ({doc_kind or '종류 미상'}, {page_count}페이지, "
+            f"{(time.perf_counter() - started_at):.1f}초)"
+        )
+        return page_count
+
+
+async def _run(file_path: str, file_ext: str, file_id: Optional[str], filename: Optional[str]) -> None:
+    try:
+        doc_kind = None
+        if CLASSIFY_ON_UPLOAD and file_id:
+            doc_kind = await run_in_pool("prewarm", classify_upload, file_path, file_ext, file_id, filename)
+        if not PREWARM_ON_UPLOAD or file_ext != ".pdf":
+            return
+        if doc_kind is None:
+            # 종류를 모르면 분석 라우트가 읽을 캐시 키(상단 50%, 제목 영역 등)를 알 수 없으므로 건너뜀
+            _stats["skipped"] += 1
+            logger.info(f"문서 종류를 알 수 없어 미리 계산 건너뜀: {file_path}")
+            return
+        result = await run_in_pool("prewarm", prewarm_document, file_path, doc_kind)
+        _stats["completed" if result is not None else "skipped"] += 1
+    except PoolSaturatedError:
+        _stats["skipped"] += 1
+        logger.info(f"미리 계산 대기열이 가득 차서 건너뜀: {file_path}")
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.warning(f"미리 계산 실패 ({file_path}): {e}")
+    finally:
+        _tasks.pop(file_path, None)
+
+
+def schedule_prewarm(
+    file_path: str,
+    file_ext: str,
+    file_id: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> bool:
+    """
+    업로드된 파일의 분류/미리 계산 예약 (둘 다 할 일이 없으면 무시).
+    이벤트 루프 안에서 호출.
+    """
+    classify = CLASSIFY_ON_UPLOAD and file_id is not None
+    # 미리 계산은 분류한 문서 종류에 맞는 경로로만 실행
+    prewarm = PREWARM_ON_UPLOAD and classify and file_ext == ".pdf"
+    if not (classify or prewarm) or file_path in _tasks:
+        return False
+    _stats["scheduled"] += 1
+    _tasks[file_path] = asyncio.get_running_loop().create_task(_run(file_path, file_ext, file_id, filename))
+    return True
+
+
+def prewarm_stats() -> Dict[str, int]:
+    return {"enabled": PREWARM_ON_UPLOAD, "classify": CLASSIFY_ON_UPLOAD, "running": len(_tasks), **_stats}
+
+
+async def cancel_prewarm() -> None:
+    """진행 중인 미리 계산 작업 취소 (애플리케이션 종료 시)"""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = [
+    "CLASSIFY_ON_UPLOAD",
+    "PREWARM_ON_UPLOAD",
+    "classify_upload",
+    "prewarm_document",
+    "schedule_prewarm",
+    "prewarm_stats",
+    "cancel_prewarm",
+]
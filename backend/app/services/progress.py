@@ -0,0 +1,74 @@
+"""
+진행 상황 보고 서비스
+파싱/OCR/추출/LLM 단계에서 페이지 단위 진행 상황을 현재 작업에 전달
+
+보고 대상은 contextvars로 전달되므로 서비스 함수의 인자를 바꾸지 않아도 됨.
+작업 풀(app.services.executor)은 컨텍스트를 복사해서 실행하므로 스레드 안에서도 동작.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# 진행 단계
+STAGE_RENDER = "render"
+STAGE_OCR = "ocr"
+STAGE_CLASSIFY = "classify"
+STAGE_EXTRACT = "extract"
+STAGE_LLM = "llm"
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+_current_callback: ContextVar[Optional[ProgressCallback]] = ContextVar("progress_callback", default=None)
+
+
+def report_progress(
+    stage: str,
+    page: Optional[int] = None,
+    total: Optional[int] = None,
+    **detail: Any,
+) -> None:
+    """
+    진행 상황 보고 (보고 대상이 없으면 아무 것도 하지 않음).
+
+    Args:
+        stage: 단계 (render, ocr, classify, extract, llm)
+        page: 페이지 번호 (1부터 시작)
+        total: 전체 페이지 수
+        detail: 추가 정보 (예: doc_type, elapsed_ms)
+    """
+    callback = _current_callback.get()
+    if callback is None:
+        return
+    event: Dict[str, Any] = {"stage": stage}
+    if page is not None:
+        event["page"] = page
+    if total is not None:
+        event["total"] = total
+    event.update(detail)
+    try:
+        callback(event)
+    except Exception:
+        # 진행 상황 보고 실패가 분석 자체를 실패시키지 않도록 무시
+        pass
+
+
+@contextmanager
+def progress_reporter(callback: ProgressCallback) -> Iterator[None]:
+    """블록 안에서 발생하는 진행 상황을 callback으로 전달"""
+    token = _current_callback.set(callback)
+    try:
+        yield
+    finally:
+        _current_callback.reset(token)
+
+
+__all__ = [
+    "report_progress",
+    "progress_reporter",
+    "STAGE_RENDER",
+    "STAGE_OCR",
+    "STAGE_CLASSIFY",
+    "STAGE_EXTRACT",
+    "STAGE_LLM",
+]
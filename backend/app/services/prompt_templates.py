@@ -1,8 +1,14 @@
 """
 TIPSMAX 1.0 LLM 프롬프트 템플릿
 VC 심사역 관점의 구조화된 분석 프롬프트
+
+프롬프트는 고정 부분(system: 역할, 평가 기준, 출력 형식)과 문서별 부분(user: 문서 본문)으로 나눔.
+고정 부분이 매 요청 같은 접두사가 되므로 provider의 프롬프트 캐시를 사용할 수 있음
+(Anthropic: cache_control, OpenAI: 자동 접두사 캐시).
 """
 
+from typing import NamedTuple
+
 TIPS_CATEGORIES = [
     "AI·빅데이터",
     "시스템반도체 / 팹리스",
@@ -16,7 +22,7 @@ TIPS_CATEGORIES = [
     "딥테크 기타"
 ]
 
-ANALYSIS_PROMPT = """당신은 COMMAX VENTURUS의 VC 심사역입니다. 
+ANALYSIS_SYSTEM_PROMPT = """당신은 COMMAX VENTURUS의 VC 심사역입니다. 
 제공된 스타트업 문서를 분석하여 TIPS 적합성을 평가해야 합니다.
 
 ## 평가 기준
@@ -82,17 +88,92 @@ ANALYSIS_PROMPT = """당신은 COMMAX VENTURUS의 VC 심사역입니다.
 2. 과도한 마케팅 표현 지양
 3. 구체적이고 실무적인 코멘트
 4. 보완 가능성도 함께 제시
+"""
 
-다음 문서를 분석하세요:
+ANALYSIS_DOCUMENT_PROMPT = """다음 문서를 분석하세요:
 
 {document_text}
 """
 
+# 분석 프롬프트 한 번에 넣는 문서 최대 길이 (토큰 제한 고려)
+MAX_DOCUMENT_CHARS = 15000
+
+# 긴 문서 map 단계: 구간별 평가 메모 작성 프롬프트
+CHUNK_NOTES_SYSTEM_PROMPT = """당신은 COMMAX VENTURUS의 VC 심사역입니다.
+스타트업 문서를 구간별로 나눠 받습니다.
+나중에 모든 구간의 메모를 모아 TIPS 적합성을 평가하므로, 받은 구간에서 평가에 필요한 사실만 정리하세요.
+
+다음 항목별로 bullet로 작성하고, 그 구간에 내용이 없는 항목은 생략하세요:
+- 회사/제품 개요
+- 기술 (차별성, 특허, TRL, 구현 단계)
+- 사업 (문제 정의, 시장 규모, BM, 고객/매출 지표)
+- 팀 (창업자/핵심 인력 경력, 과거 성과)
+- 재무/투자 (매출, 손익, 투자 유치, 자금 계획)
+- R&D/정부 과제 연계
+- 리스크 요인
+
+숫자, 고유명사, 연도는 문서에 적힌 그대로 옮기고 추측하지 마세요.
+"""
+
+CHUNK_NOTES_DOCUMENT_PROMPT = """아래는 스타트업 문서의 일부({chunk_index}/{chunk_total} 구간)입니다.
+메모는 전체 {max_chars}자 이내로 작성하세요.
+
+문서 구간:
+
+{chunk_text}
+"""
+
+
+class PromptParts(NamedTuple):
+    """고정 부분(system)과 문서별 부분(user)으로 나눈 프롬프트"""
+    system: str
+    user: str
+
+    @property
+    def text(self) -> str:
+        """두 부분을 합친 전체 프롬프트 (캐시 키, 단일 메시지용)"""
+        return f"{self.system}\n{self.user}"
+
+
+# 고정 부분은 모듈 로드 시 한 번만 생성 (요청마다 같은 문자열이어야 provider 캐시 적중)
+_ANALYSIS_SYSTEM = ANALYSIS_SYSTEM_PROMPT.format(
+    tip_categories="\n".join([f"- {cat}" for cat in TIPS_CATEGORIES])
+)
+
+
+def get_analysis_prompt_parts(document_text: str) -> PromptParts:
+    """분석 프롬프트 생성 (고정 부분/문서별 부분)"""
+    return PromptParts(
+        system=_ANALYSIS_SYSTEM,
+        user=ANALYSIS_DOCUMENT_PROMPT.format(
+            document_text=document_text[:MAX_DOCUMENT_CHARS]  # 토큰 제한 고려
+        ),
+    )
+
+
+def get_chunk_prompt_parts(chunk_text: str, chunk_index: int, chunk_total: int, max_chars: int) -> PromptParts:
+    """긴 문서 구간별 메모 프롬프트 생성 (chunk_index는 1부터 시작)"""
+    return PromptParts(
+        system=CHUNK_NOTES_SYSTEM_PROMPT,
+        user=CHUNK_NOTES_DOCUMENT_PROMPT.format(
+            chunk_index=chunk_index,
+            chunk_total=chunk_total,
+            max_chars=max_chars,
+            chunk_text=chunk_text,
+        ),
+    )
+
+
+def format_chunk_notes(notes: list) -> str:
+    """구간별 메모를 순서대로 합친 텍스트"""
+    total = len(notes)
+    return "\n\n".join(f"[구간 {index}/{total}]\n{note.strip()}" for index, note in enumerate(notes, start=1))
+
 
-def get_analysis_prompt(document_text: str) -> str:
-    """분석 프롬프트 생성"""
-    categories_str = "\n".join([f"- {cat}" for cat in TIPS_CATEGORIES])
-    return ANALYSIS_PROMPT.format(
-        tip_categories=categories_str,
-        document_text=document_text[:15000]  # 토큰 제한 고려
+def get_reduce_prompt_parts(notes: list) -> PromptParts:
+    """구간별 메모를 모아 최종 평가하는 분석 프롬프트 생성 (고정 부분은 일반 분석과 같음)"""
+    document_text = (
+        "(긴 문서를 앞에서부터 구간별로 정리한 메모입니다. 모든 구간을 종합해서 평가하세요.)\n\n"
+        + format_chunk_notes(notes)
     )
+    return get_analysis_prompt_parts(document_text)
@@ -0,0 +1,211 @@
+"""
+저장 공간 보존 정책 서비스
+업로드 원본과 파생 데이터(페이지 텍스트 캐시, 분석 결과, 업로드 세션)를 주기적으로 정리
+
+정리 순서:
+    1. 종류별 보존 기간(TTL)이 지난 항목 삭제
+    2. 업로드 원본 총 크기가 용량 한도를 넘으면 참조가 없는 파일 → 참조가 남은 파일 순서로,
+       각각 가장 오래전에 사용한 파일부터 삭제 (파일을 지우면 그 파일에서 만든 캐시 항목도 함께 삭제)
+    대기/실행 중인 분석 작업의 파일과 최근 RETENTION_MIN_IDLE_SECONDS 안에 사용한 파일은 삭제하지 않음
+    3. S3 저장소를 쓰면 로컬 스필 캐시를 STORAGE_SPILL_MAX_MB 이하로 정리
+
+설정 (환경 변수):
+- RETENTION_INTERVAL_SECONDS: 정리 주기 (기본값: 600, 0이면 백그라운드 정리 안 함)
+- RETENTION_UPLOAD_TTL_DAYS: 업로드 원본 보존 기간 (기본값: 30, 0이면 무제한)
+- RETENTION_UPLOAD_TTL_DAYS_<문서 종류>: 문서 종류별 보존 기간
+  예: RETENTION_UPLOAD_TTL_DAYS_FINANCIAL_STATEMENT=90
+- RETENTION_PAGE_CACHE_TTL_DAYS: 페이지 텍스트 캐시 보존 기간 (기본값: 7)
+- RETENTION_RESULT_TTL_DAYS: 저장된 분석 결과 보존 기간 (기본값: 30)
+- LLM 응답 캐시는 LLM_CACHE_TTL_DAYS 동안 쓰지 않은 항목을 삭제
+- RETENTION_UPLOAD_QUOTA_MB: 업로드 원본 최대 총 크기 (기본값: 10240, 0이면 무제한)
+- RETENTION_MIN_IDLE_SECONDS: 최근 이 시간 안에 사용한 파일은 삭제하지 않음 (기본값: 900)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from app.services.page_cache import page_text_cache
+from app.services.llm_cache import llm_response_cache
+from app.services.upload_index import upload_index
+from app.services.storage import storage
+from app.services.jobs import job_manager
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 3600
+
+RETENTION_INTERVAL_SECONDS = int(os.getenv("RETENTION_INTERVAL_SECONDS", "600"))
+RETENTION_UPLOAD_TTL_DAYS = float(os.getenv("RETENTION_UPLOAD_TTL_DAYS", "30"))
+RETENTION_PAGE_CACHE_TTL_DAYS = float(os.getenv("RETENTION_PAGE_CACHE_TTL_DAYS", "7"))
+RETENTION_RESULT_TTL_DAYS = float(os.getenv("RETENTION_RESULT_TTL_DAYS", "30"))
+RETENTION_UPLOAD_QUOTA_BYTES = int(float(os.getenv("RETENTION_UPLOAD_QUOTA_MB", "10240")) * 1024 * 1024)
+RETENTION_MIN_IDLE_SECONDS = int(os.getenv("RETENTION_MIN_IDLE_SECONDS", "900"))
+
+# 용량 한도를 넘으면 한도의 90%까지 줄여서 매 정리마다 삭제가 일어나지 않도록 함
+QUOTA_WATERMARK = 0.9
+
+
+def upload_ttl_seconds(doc_kind: Optional[str]) -> float:
+    """문서 종류별 업로드 보존 기간 (초, 0이면 무제한)"""
+    days = RETENTION_UPLOAD_TTL_DAYS
+    if doc_kind:
+        override = os.getenv(f"RETENTION_UPLOAD_TTL_DAYS_{doc_kind.upper().replace('-', '_')}")
+        if override:
+            days = float(override)
+    return days * DAY_SECONDS
+
+
+class RetentionManager:
+    """주기적으로 보존 정책을 적용하는 백그라운드 정리기"""
+
+    def __init__(self, interval_seconds: int = RETENTION_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.runs = 0
+        self.last_run_at: Optional[float] = None
+        self.last_run_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.evicted = {"upload_ttl": 0, "upload_quota": 0, "page_cache_ttl": 0, "results_ttl": 0, "sessions_ttl": 0, "llm_cache_ttl": 0, "storage_spill": 0}
+        self.freed_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+        # 백그라운드 정리와 관리자 요청이 동시에 돌지 않도록 직렬화
+        self._run_lock = threading.Lock()
+        self._sessions = None
+
+    def attach_upload_sessions(self, sessions) -> None:
+        """정리 대상에 재개 가능한 업로드 세션 저장소 추가"""
+        self._sessions = sessions
+
+    def run_once(self) -> Dict[str, int]:
+        """보존 정책 한 번 적용 (동기 함수, 스레드에서 실행)"""
+        with self._run_lock:
+            started_at = time.perf_counter()
+            now = time.time()
+            summary = {key: 0 for key in self.evicted}
+            freed = 0
+
+            # 분석 중인 파일은 보존 기간/용량과 관계없이 남김
+            in_use = job_manager.active_file_ids()
+
+            # 1. 업로드 원본 TTL
+            candidates = upload_index.retention_candidates()
+            remaining = []
+            for candidate in candidates:
+                ttl = upload_ttl_seconds(candidate["doc_kind"])
+                idle = now - candidate["last_used_at"]
+                if ttl > 0 and idle > ttl and idle > RETENTION_MIN_IDLE_SECONDS and candidate["file_id"] not in in_use:
+                    freed += upload_index.evict(candidate["file_id"])
+                    summary["upload_ttl"] += 1
+                else:
+                    remaining.append(candidate)
+
+            # 2. 업로드 원본 용량 한도 (참조 없는 파일 먼저, 각각 LRU)
+            if RETENTION_UPLOAD_QUOTA_BYTES > 0:
+                total = sum(candidate["size"] for candidate in remaining)
+                if total > RETENTION_UPLOAD_QUOTA_BYTES:
+                    target = int(RETENTION_UPLOAD_QUOTA_BYTES * QUOTA_WATERMARK)
+                    # 정렬은 안정 정렬이므로 같은 그룹 안에서는 마지막 사용 시각 순서 유지
+                    for candidate in sorted(remaining, key=lambda candidate: candidate["ref_count"] > 0):
+                        if total <= target:
+                            break
+                        if now - candidate["last_used_at"] <= RETENTION_MIN_IDLE_SECONDS:
+                            continue
+                        if candidate["file_id"] in in_use:
+                            continue
+                        freed += upload_index.evict(candidate["file_id"])
+                        total -= candidate["size"]
+                        summary["upload_quota"] += 1
+                    if total > RETENTION_UPLOAD_QUOTA_BYTES:
+                        logger.warning(
+                            f"업로드 용량 한도 초과 상태 유지: {total / 1024 / 1024:.1f}MB "
+                            f"(최근 사용/분석 중인 파일은 삭제하지 않음)"
+                        )
+
+            # 3. 파생 데이터 TTL
+            if RETENTION_PAGE_CACHE_TTL_DAYS > 0:
+                summary["page_cache_ttl"] = page_text_cache.purge_older_than(RETENTION_PAGE_CACHE_TTL_DAYS * DAY_SECONDS)
+            if RETENTION_RESULT_TTL_DAYS > 0:
+                summary["results_ttl"] = upload_index.purge_results(now - RETENTION_RESULT_TTL_DAYS * DAY_SECONDS)
+            if self._sessions is not None:
+                summary["sessions_ttl"] = self._sessions.purge_expired()
+            summary["llm_cache_ttl"] = llm_response_cache.purge_expired()
+            # 4. S3 저장소의 로컬 스필 캐시 (원본은 저장소에 남음)
+            summary["storage_spill"] = storage.trim()
+
+            for key, count in summary.items():
+                self.evicted[key] += count
+            self.freed_bytes += freed
+            self.runs += 1
+            self.last_run_at = now
+            self.last_run_ms = round((time.perf_counter() - started_at) * 1000, 1)
+
+        if any(summary.values()):
+            logger.info(f"보존 정책 정리 완료: {summary}, 확보 {freed / 1024 / 1024:.1f}MB")
+        return {**summary, "freed_bytes": freed}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"보존 정책 정리 실패: {e}", exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """백그라운드 정리 시작 (이벤트 루프 안에서 호출)"""
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        logger.info(f"보존 정책 정리 시작 (주기 {self.interval_seconds}초)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        """사용량, 정책, 정리 통계"""
+        uploads = upload_index.usage()
+        return {
+            "uploads": {
+                **uploads,
+                "quota_bytes": RETENTION_UPLOAD_QUOTA_BYTES,
+                "usage_ratio": round(uploads["size_bytes"] / RETENTION_UPLOAD_QUOTA_BYTES, 4)
+                if RETENTION_UPLOAD_QUOTA_BYTES else None,
+            },
+            "page_text_cache": page_text_cache.stats(),
+            "llm_cache": llm_response_cache.stats(),
+            "storage": storage.stats(),
+            "policy": {
+                "interval_seconds": self.interval_seconds,
+                "upload_ttl_days": RETENTION_UPLOAD_TTL_DAYS,
+                "page_cache_ttl_days": RETENTION_PAGE_CACHE_TTL_DAYS,
+                "result_ttl_days": RETENTION_RESULT_TTL_DAYS,
+                "min_idle_seconds": RETENTION_MIN_IDLE_SECONDS,
+            },
+            "stats": {
+                "running": self._task is not None,
+                "runs": self.runs,
+                "last_run_at": self.last_run_at,
+                "last_run_ms": self.last_run_ms,
+                "last_error": self.last_error,
+                "evicted": dict(self.evicted),
+                "freed_bytes": self.freed_bytes,
+            },
+        }
+
+
+retention_manager = RetentionManager()
+
+
+__all__ = ["RetentionManager", "retention_manager", "upload_ttl_seconds"]
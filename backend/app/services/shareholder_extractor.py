@@ -20,7 +20,9 @@
 
 import re
 from typing import List, Dict, Optional
-import pdfplumber
+
+from app.services.pdf_document import acquire_pdf
+from app.services.progress import report_progress, STAGE_EXTRACT
 
 
 class ShareholderExtractor:
@@ -109,10 +111,12 @@ class ShareholderExtractor:
         logger = logging.getLogger(__name__)
 
         try:
-            with pdfplumber.open(file_path) as pdf:
+            # 요청 범위의 공유 문서 핸들 사용 (DocumentParser가 이미 연 파일을 다시 열지 않음)
+            with acquire_pdf(file_path) as pdf:
                 # 모든 페이지에서 표 추출 시도
-                for page_idx, page in enumerate(pdf.pages):
-                    tables = page.extract_tables()
+                for page_idx in range(pdf.page_count):
+                    tables = pdf.page_tables(page_idx)
+                    report_progress(STAGE_EXTRACT, page=page_idx + 1, total=pdf.page_count, tables=len(tables))
                     logger.info(f"페이지 {page_idx + 1}에서 {len(tables)}개의 표 발견")
 
                     for table_idx, table in enumerate(tables):
@@ -0,0 +1,295 @@
+"""
+업로드 저장소 서비스
+업로드 원본을 로컬 디스크 또는 S3 호환 오브젝트 스토리지(AWS S3, MinIO 등)에 저장
+
+- 저장 키는 "{file_id}{확장자}" (내용 주소 기반이므로 모든 API 인스턴스에서 같은 키)
+- 파서/OCR 워커는 파일 경로가 필요하므로 local_path()가 가리키는 로컬 경로로 읽음
+  - 로컬 저장소: 저장 위치 그 자체
+  - S3: 노드별 스필(spill) 캐시. 처음 읽을 때 청크 단위로 내려받아 두고 이후에는 재사용
+- 보존 정책/참조 해제로 파일을 지울 때는 이 노드의 복사본만 삭제 (remove_local)
+  - 로컬 저장소: 저장 파일 삭제
+  - S3: 스필 캐시 파일만 삭제. 업로드 인덱스는 노드별이라 다른 인스턴스가 같은 객체를 참조할 수 있으므로
+    버킷의 원본은 지우지 않고 버킷 수명 주기 규칙(lifecycle rule)으로 만료
+
+설정 (환경 변수):
+- STORAGE_BACKEND: local 또는 s3 (기본값: local)
+- STORAGE_LOCAL_DIR: 로컬 저장 디렉토리 (기본값: uploads)
+- S3_BUCKET, S3_PREFIX: 버킷과 키 접두사
+- S3_ENDPOINT_URL: S3 호환 서버 주소 (예: MinIO http://localhost:9000)
+- S3_REGION, S3_ACCESS_KEY_ID, S3_SECRET_ACCESS_KEY: 없으면 boto3 기본 자격 증명 사용
+- STORAGE_SPILL_DIR: S3 파일 로컬 캐시 디렉토리 (기본값: uploads/.spill)
+- STORAGE_SPILL_MAX_MB: 스필 캐시 최대 크기 (기본값: 2048)
+
+S3 저장소는 boto3가 필요함 (pip install boto3)
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+STORAGE_LOCAL_DIR = os.getenv("STORAGE_LOCAL_DIR", "uploads")
+STORAGE_SPILL_DIR = os.getenv("STORAGE_SPILL_DIR", os.path.join(STORAGE_LOCAL_DIR, ".spill"))
+STORAGE_SPILL_MAX_BYTES = int(float(os.getenv("STORAGE_SPILL_MAX_MB", "2048")) * 1024 * 1024)
+
+# 스필 캐시 정리 시 최근 이 시간 안에 사용한 파일은 남김 (OCR 워커가 열기 전에 지워지지 않도록)
+SPILL_MIN_IDLE_SECONDS = 600
+
+
+def storage_key(file_id: str, ext: str) -> str:
+    return f"{file_id}{ext}"
+
+
+class StorageBackend(ABC):
+    """업로드 저장소 인터페이스"""
+
+    name = "base"
+
+    def __init__(self, staging_dir: str):
+        # 업로드 임시 파일을 쓰는 디렉토리 (store()에서 옮기기 쉽도록 같은 파일 시스템)
+        self.staging_dir = staging_dir
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    @abstractmethod
+    def local_path(self, key: str) -> str:
+        """파서가 읽을 로컬 경로 (파일이 아직 없을 수 있음, fetch()로 보장)"""
+
+    @abstractmethod
+    def store(self, temp_path: str, key: str) -> str:
+        """임시 파일을 저장소에 넣고 로컬 경로 반환 (임시 파일은 옮겨지거나 삭제됨)"""
+
+    @abstractmethod
+    def fetch(self, key: str) -> Optional[str]:
+        """로컬에서 읽을 수 있는 경로 반환 (저장소에 없으면 None)"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """저장소에 파일이 있는지"""
+
+    @abstractmethod
+    def remove_local(self, key: str) -> None:
+        """이 노드의 복사본 삭제 (S3 원본은 유지)"""
+
+    def trim(self) -> int:
+        """로컬 캐시 정리 (삭제한 파일 수)"""
+        return 0
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+
+class LocalStorage(StorageBackend):
+    """로컬 디렉토리 저장소 (단일 인스턴스 또는 공유 볼륨)"""
+
+    name = "local"
+
+    def __init__(self, root: str = STORAGE_LOCAL_DIR):
+        super().__init__(root)
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def store(self, temp_path: str, key: str) -> str:
+        path = self.local_path(key)
+        os.replace(temp_path, path)
+        return path
+
+    def fetch(self, key: str) -> Optional[str]:
+        path = self.local_path(key)
+        return path if os.path.exists(path) else None
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+    def remove_local(self, key: str) -> None:
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, "root": self.root}
+
+
+class S3Storage(StorageBackend):
+    """S3 호환 오브젝트 스토리지 + 노드별 로컬 스필 캐시"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        spill_dir: str = STORAGE_SPILL_DIR,
+        spill_max_bytes: int = STORAGE_SPILL_MAX_BYTES,
+    ):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+        except ImportError:
+            raise RuntimeError("S3 저장소를 사용하려면 boto3를 설치하세요: pip install boto3")
+
+        super().__init__(spill_dir)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=os.getenv("S3_ACCESS_KEY_ID") or None,
+            aws_secret_access_key=os.getenv("S3_SECRET_ACCESS_KEY") or None,
+        )
+        # 큰 파일은 멀티파트로 나눠 스트리밍 업로드/다운로드 (메모리에 전체를 올리지 않음)
+        self._transfer_config = TransferConfig(multipart_chunksize=8 * 1024 * 1024, max_concurrency=4)
+        # 같은 키를 여러 스레드가 동시에 내려받지 않도록 키별 잠금
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.downloads = 0
+        self.spill_hits = 0
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key)
+
+    def store(self, temp_path: str, key: str) -> str:
+        self._client.upload_file(temp_path, self.bucket, self._object_key(key), Config=self._transfer_config)
+        # 업로드한 노드는 방금 올린 파일을 스필 캐시로 그대로 사용
+        path = self.local_path(key)
+        os.replace(temp_path, path)
+        return path
+
+    def fetch(self, key: str) -> Optional[str]:
+        path = self.local_path(key)
+        if os.path.exists(path):
+            self.spill_hits += 1
+            os.utime(path)  # 스필 캐시 LRU 정리용 사용 시각
+            return path
+        with self._key_lock(key):
+            if os.path.exists(path):
+                return path
+            temp_path = os.path.join(self.spill_dir, f".{uuid.uuid4().hex}.part")
+            try:
+                self._client.download_file(self.bucket, self._object_key(key), temp_path, Config=self._transfer_config)
+            except Exception as e:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                if self._is_not_found(e):
+                    return None
+                raise
+            os.replace(temp_path, path)
+            self.downloads += 1
+        logger.info(f"S3 파일 스필 캐시에 저장: {key}")
+        return path
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        response = getattr(error, "response", None) or {}
+        return str(response.get("Error", {}).get("Code")) in ("404", "NoSuchKey", "NotFound")
+
+    def exists(self, key: str) -> bool:
+        if os.path.exists(self.local_path(key)):
+            return True
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception as e:
+            if self._is_not_found(e):
+                return False
+            raise
+
+    def remove_local(self, key: str) -> None:
+        # 다른 인스턴스가 참조 중일 수 있으므로 버킷 객체는 지우지 않음 (수명 주기 규칙으로 만료)
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def trim(self) -> int:
+        """스필 캐시가 한도를 넘으면 오래 사용하지 않은 파일부터 삭제 (원본은 S3에 남음)"""
+        entries = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.spill_max_bytes:
+            return 0
+        removed = 0
+        now = time.time()
+        for mtime, size, path in sorted(entries):
+            if total <= self.spill_max_bytes:
+                break
+            if now - mtime <= SPILL_MIN_IDLE_SECONDS:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        spill_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(self.spill_dir)
+            if entry.is_file() and not entry.name.startswith(".")
+        )
+        return {
+            "backend": self.name,
+            "bucket": self.bucket,
+            "prefix": self.prefix,
+            "spill_dir": self.spill_dir,
+            "spill_bytes": spill_bytes,
+            "spill_max_bytes": self.spill_max_bytes,
+            "downloads": self.downloads,
+            "spill_hits": self.spill_hits,
+        }
+
+
+def create_storage() -> StorageBackend:
+    """환경 변수 설정에 따른 저장소 생성"""
+    if STORAGE_BACKEND == "s3":
+        bucket = os.getenv("S3_BUCKET")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 사용 시 S3_BUCKET을 설정하세요.")
+        return S3Storage(
+            bucket=bucket,
+            prefix=os.getenv("S3_PREFIX", ""),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            region=os.getenv("S3_REGION") or None,
+        )
+    if STORAGE_BACKEND != "local":
+        raise RuntimeError(f"지원하지 않는 STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return LocalStorage()
+
+
+storage = create_storage()
+
+
+__all__ = [
+    "StorageBackend",
+    "LocalStorage",
+    "S3Storage",
+    "create_storage",
+    "storage",
+    "storage_key",
+]
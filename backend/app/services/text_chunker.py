@@ -0,0 +1,79 @@
+"""
+텍스트 분할 서비스
+긴 문서를 LLM 토큰 예산에 맞는 구간으로 나눔 (긴 문서 map-reduce 분석용)
+
+토크나이저 없이 근사치로 토큰 수를 계산:
+- 한글/한자 등 CJK 문자: 글자당 1토큰
+- 그 외 문자: 4글자당 1토큰
+구간은 문단(빈 줄) → 줄 → 글자 순서로 경계를 찾아 나누므로 표나 문장이 중간에 잘리는 경우를 줄임
+"""
+
+import re
+from typing import List
+
+_CJK_PATTERN = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 대략적인 토큰 수"""
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _split_oversized(block: str, max_tokens: int) -> List[str]:
+    """한 문단이 예산을 넘으면 줄 단위로, 한 줄이 넘으면 글자 단위로 나눔"""
+    pieces: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in block.split("\n"):
+        line_tokens = estimate_tokens(line) + 1
+        if line_tokens > max_tokens:
+            if current:
+                pieces.append("\n".join(current))
+                current, current_tokens = [], 0
+            # 토큰 밀도가 가장 높은 경우(CJK 1글자 = 1토큰) 기준으로 잘라서 예산을 넘지 않게 함
+            pieces.extend(line[i:i + max_tokens] for i in range(0, len(line), max_tokens))
+            continue
+        if current and current_tokens + line_tokens > max_tokens:
+            pieces.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    텍스트를 구간당 max_tokens 이하로 나눔.
+
+    Returns:
+        구간 목록 (원래 순서 유지, 빈 구간 제외)
+    """
+    blocks: List[str] = []
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block:
+            continue
+        if estimate_tokens(block) > max_tokens:
+            blocks.extend(_split_oversized(block, max_tokens))
+        else:
+            blocks.append(block)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for block in blocks:
+        block_tokens = estimate_tokens(block) + 2
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+__all__ = ["estimate_tokens", "chunk_text"]
@@ -0,0 +1,399 @@
+"""
+업로드 인덱스 서비스
+업로드 파일을 내용 해시(SHA-256)로 저장하고 참조 횟수와 분석 결과를 SQLite에 기록
+
+- 같은 바이트의 파일은 하나의 저장 파일을 공유 (file_id = SHA-256)
+- 업로드할 때마다 참조 토큰(ref_id)을 발급하고 참조 횟수 +1.
+  삭제 요청은 토큰이 있어야 하고 토큰당 한 번만 -1, 0이 되면 파일과 결과 삭제
+- 추출/LLM 분석 결과는 (file_id, 종류) 단위로 저장해서 재업로드 시 바로 재사용
+- 파일 메타데이터(경로, 확장자, 크기, 페이지 수, 문서 종류 등)를 기록해서
+  분석 라우트가 디렉토리 탐색 없이 file_id로 바로 파일을 찾음
+- 파일에서 만들어진 캐시 항목(페이지 텍스트 등)을 기록해서, 파일을 지울 때
+  다른 파일이 쓰지 않는 항목도 함께 삭제
+- 원본 바이트는 저장소(로컬 디스크 또는 S3)에 두고, path 컬럼에는 이 노드에서 파서가 읽을 로컬 경로를 기록.
+  다른 인스턴스가 올린 파일도 저장소에 있으면 처음 조회할 때 인덱스에 추가
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.upload_stream import inspect_file
+from app.services.page_cache import DiskLRUCache, page_text_cache
+from app.services.storage import StorageBackend, storage, storage_key
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_INDEX_PATH = os.getenv("UPLOAD_INDEX_PATH", os.path.join("uploads", "index.sqlite3"))
+
+# 추출 로직이 바뀌어 이전 결과를 무효화해야 할 때 올림
+RESULT_CACHE_VERSION = "1"
+
+# 인덱스 도입 전 업로드(uuid 파일명) 탐색용 확장자
+LEGACY_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+
+# 이전 버전 DB에 없는 메타데이터 컬럼 (이름, 타입)
+_METADATA_COLUMNS = (
+    ("filename", "TEXT"),
+    ("detected_type", "TEXT"),
+    ("page_count", "INTEGER"),
+    ("doc_kind", "TEXT"),
+    ("last_accessed_at", "REAL"),
+)
+
+# 파일별 파생 캐시 (artifacts 테이블의 cache 이름 → 캐시)
+ARTIFACT_CACHES: Dict[str, DiskLRUCache] = {
+    "page_text": page_text_cache,
+}
+
+
+@dataclass
+class UploadRecord:
+    file_id: str
+    path: str
+    ext: str
+    size: int
+    sha256: str
+    ref_count: int
+    uploaded_at: float
+    filename: Optional[str] = None
+    detected_type: Optional[str] = None
+    page_count: Optional[int] = None
+    doc_kind: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "UploadRecord":
+        return cls(
+            file_id=row["file_id"],
+            path=row["path"],
+            ext=row["ext"],
+            size=row["size"],
+            sha256=row["sha256"],
+            ref_count=row["ref_count"],
+            uploaded_at=row["created_at"],
+            filename=row["filename"],
+            detected_type=row["detected_type"],
+            page_count=row["page_count"],
+            doc_kind=row["doc_kind"],
+        )
+
+
+class UploadIndex:
+    """내용 주소 기반 업로드 저장소의 참조 횟수/결과 인덱스"""
+
+    def __init__(self, db_path: str = UPLOAD_INDEX_PATH, backend: StorageBackend = storage):
+        self.db_path = db_path
+        self.storage = backend
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    ext TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    ref_count INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_uploaded_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS results (
+                    file_id TEXT NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+                    kind TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    result_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (file_id, kind)
+                );
+                CREATE TABLE IF NOT EXISTS refs (
+                    ref_id TEXT PRIMARY KEY,
+                    file_id TEXT NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    file_id TEXT NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+                    cache TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (file_id, cache, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_files_path ON files(path);
+                CREATE INDEX IF NOT EXISTS idx_artifacts_key ON artifacts(cache, key);
+                CREATE INDEX IF NOT EXISTS idx_refs_file ON refs(file_id);
+                """
+            )
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(files)")}
+            for name, column_type in _METADATA_COLUMNS:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE files ADD COLUMN {name} {column_type}")
+            self._conn = conn
+        return self._conn
+
+    def register_upload(
+        self,
+        temp_path: str,
+        sha256: str,
+        ext: str,
+        size: int,
+        filename: Optional[str] = None,
+        detected_type: Optional[str] = None,
+    ) -> Tuple[str, str, bool, str]:
+        """
+        스트리밍 저장이 끝난 임시 파일을 저장소의 내용 주소 위치로 옮기고 참조 추가.
+        같은 내용이 이미 있으면 임시 파일을 지우고 기존 파일을 공유.
+        S3 저장소는 업로드가 네트워크를 타므로 이벤트 루프 밖(스레드)에서 호출.
+
+        Returns:
+            (file_id, 로컬 경로, 중복 여부, 참조 토큰)
+        """
+        file_id = sha256
+        ref_id = uuid.uuid4().hex
+        existing = self.get(file_id)
+        path = self.storage.fetch(storage_key(file_id, existing.ext)) if existing is not None else None
+        if path is not None:
+            os.remove(temp_path)
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "UPDATE files SET ref_count = ref_count + 1, last_uploaded_at = ?, path = ? WHERE file_id = ?",
+                    (now, path, file_id),
+                )
+                conn.execute("INSERT INTO refs (ref_id, file_id, created_at) VALUES (?, ?, ?)", (ref_id, file_id, now))
+            return file_id, path, True, ref_id
+
+        # 같은 내용을 동시에 올려도 키가 같으므로 저장 결과는 동일
+        path = self.storage.store(temp_path, storage_key(file_id, ext))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT 1 FROM files WHERE file_id = ?", (file_id,)).fetchone()
+            # 조회 후 등록 전에 같은 내용의 다른 업로드가 먼저 등록한 경우도 중복
+            deduplicated = existing is None and row is not None
+            if row is not None:
+                # 인덱스에는 있지만 파일이 사라졌거나 다른 업로드가 먼저 등록한 경우: 경로를 채우고 이전 결과는 유지
+                conn.execute(
+                    "UPDATE files SET path = ?, ext = ?, size = ?, ref_count = ref_count + 1, last_uploaded_at = ? "
+                    "WHERE file_id = ?",
+                    (path, ext, size, now, file_id),
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO files (file_id, path, ext, size, sha256, ref_count, created_at, last_uploaded_at, "
+                    "filename, detected_type) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?)",
+                    (file_id, path, ext, size, sha256, now, now, filename, detected_type),
+                )
+            conn.execute("INSERT INTO refs (ref_id, file_id, created_at) VALUES (?, ?, ?)", (ref_id, file_id, now))
+            return file_id, path, deduplicated, ref_id
+
+    def get(self, file_id: str) -> Optional[UploadRecord]:
+        """인덱스에 기록된 메타데이터 (없으면 None)"""
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM files WHERE file_id = ?", (file_id,)).fetchone()
+        return UploadRecord.from_row(row) if row else None
+
+    def resolve(self, file_id: str) -> Optional[UploadRecord]:
+        """
+        file_id로 업로드 파일 찾기 (S3 저장소면 로컬 스필 캐시로 내려받음).
+        인덱스를 먼저 보고, 인덱스에 없는 파일(인덱스 도입 전 uuid 파일명 업로드,
+        다른 인스턴스가 올린 파일)은 저장소에서 한 번만 찾아 인덱스에 추가.
+        S3 저장소는 네트워크를 타므로 이벤트 루프 밖(스레드)에서 호출.
+
+        Returns:
+            메타데이터 (파일이 없으면 None, path는 로컬 경로)
+        """
+        record = self.get(file_id)
+        if record is not None:
+            path = self.storage.fetch(storage_key(file_id, record.ext))
+            if path is None:
+                return None
+            # 보존 기간/용량 정리에서 최근 사용 파일을 남기기 위해 사용 시각 기록
+            with self._lock:
+                self._connect().execute(
+                    "UPDATE files SET last_accessed_at = ?, path = ? WHERE file_id = ?", (time.time(), path, file_id)
+                )
+            record.path = path
+            return record
+
+        # file_id가 경로 구분자를 포함하면 탐색하지 않음
+        if os.path.basename(file_id) != file_id:
+            return None
+        for ext in LEGACY_EXTENSIONS:
+            key = storage_key(file_id, ext)
+            if self.storage.exists(key):
+                path = self.storage.fetch(key)
+                if path is not None:
+                    return self._register_existing(file_id, path, ext)
+        return None
+
+    def _register_existing(self, file_id: str, path: str, ext: str) -> UploadRecord:
+        """저장소에 이미 있는 파일을 인덱스에 추가 (참조 토큰이 없으므로 참조 0, 보존 정책으로만 정리)"""
+        inspected = inspect_file(path)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO files (file_id, path, ext, size, sha256, ref_count, created_at, last_uploaded_at, "
+                "detected_type) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (file_id, path, ext, inspected.size, inspected.sha256, os.path.getmtime(path), now, inspected.detected_type),
+            )
+            row = conn.execute("SELECT * FROM files WHERE file_id = ?", (file_id,)).fetchone()
+        logger.info(f"기존 업로드 파일 인덱스 등록: {file_id}")
+        return UploadRecord.from_row(row)
+
+    def update_metadata(self, file_id: str, page_count: Optional[int] = None, doc_kind: Optional[str] = None) -> None:
+        """업로드 이후 계산한 메타데이터 기록 (None인 항목은 유지)"""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE files SET page_count = COALESCE(?, page_count), doc_kind = COALESCE(?, doc_kind) "
+                "WHERE file_id = ?",
+                (page_count, doc_kind, file_id),
+            )
+
+    def release(self, file_id: str, ref_id: str) -> Optional[int]:
+        """
+        업로드 참조 하나 해제 (토큰당 한 번만). 참조가 0이 되면 파일, 결과, 인덱스 행, 파생 캐시 항목 삭제.
+        저장소 삭제가 있으므로 이벤트 루프 밖(스레드)에서 호출.
+
+        Returns:
+            남은 참조 횟수 (파일이 없거나 토큰이 이 파일의 것이 아니면 None)
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute("DELETE FROM refs WHERE ref_id = ? AND file_id = ?", (ref_id, file_id))
+            if cursor.rowcount == 0:
+                return None
+            row = conn.execute("SELECT ref_count FROM files WHERE file_id = ?", (file_id,)).fetchone()
+            remaining = max(0, row["ref_count"] - 1)
+            conn.execute("UPDATE files SET ref_count = ? WHERE file_id = ?", (remaining, file_id))
+            if remaining > 0:
+                return remaining
+        # 그 사이 같은 내용이 다시 업로드되었으면 삭제하지 않음
+        self.evict(file_id, only_unreferenced=True)
+        return 0
+
+    def evict(self, file_id: str, only_unreferenced: bool = False) -> int:
+        """
+        파일 삭제 (보존 정책에 따른 정리용, 기본은 참조 횟수와 관계없이 삭제).
+        결과/파생 항목 기록은 함께 삭제되고, 다른 파일이 쓰지 않는 캐시 항목은 캐시에서도 삭제.
+        S3 저장소는 이 노드의 스필 캐시만 삭제 (다른 인스턴스가 참조할 수 있는 버킷 객체는 유지).
+
+        Args:
+            only_unreferenced: True이면 참조가 남아 있는 파일은 삭제하지 않음
+
+        Returns:
+            확보한 바이트 수
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT ext, size, ref_count FROM files WHERE file_id = ?", (file_id,)).fetchone()
+            if row is None or (only_unreferenced and row["ref_count"] > 0):
+                return 0
+            orphans = conn.execute(
+                "SELECT cache, key FROM artifacts a WHERE a.file_id = ? AND NOT EXISTS ("
+                "SELECT 1 FROM artifacts b WHERE b.cache = a.cache AND b.key = a.key AND b.file_id != a.file_id)",
+                (file_id,),
+            ).fetchall()
+            conn.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+
+        self.storage.remove_local(storage_key(file_id, row["ext"]))
+        freed = row["size"]
+        for orphan in orphans:
+            cache = ARTIFACT_CACHES.get(orphan["cache"])
+            if cache is not None:
+                cache.delete(orphan["key"])
+        logger.info(f"업로드 파일 삭제: {file_id} (캐시 항목 {len(orphans)}개)")
+        return freed
+
+    def add_artifacts(self, file_path: str, cache: str, keys: Iterable[str]) -> None:
+        """파일에서 만들어진 캐시 항목 기록 (인덱스에 없는 파일이면 무시)"""
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT file_id FROM files WHERE path = ?", (file_path,)).fetchone()
+            if row is None:
+                return
+            conn.executemany(
+                "INSERT OR IGNORE INTO artifacts (file_id, cache, key) VALUES (?, ?, ?)",
+                [(row["file_id"], cache, key) for key in keys],
+            )
+
+    def retention_candidates(self) -> List[Dict[str, Any]]:
+        """보존 정책 검사 대상 파일 목록 (마지막 사용 시각 오래된 순)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT file_id, path, size, doc_kind, ref_count, "
+                "COALESCE(last_accessed_at, last_uploaded_at) AS last_used_at "
+                "FROM files ORDER BY last_used_at ASC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def purge_results(self, older_than: float) -> int:
+        """older_than(타임스탬프)보다 먼저 저장된 분석 결과 삭제"""
+        with self._lock:
+            cursor = self._connect().execute("DELETE FROM results WHERE created_at < ?", (older_than,))
+        return cursor.rowcount
+
+    def usage(self) -> Dict[str, int]:
+        """인덱스에 기록된 파일 수/총 크기, 결과 수, 파생 항목 수"""
+        with self._lock:
+            conn = self._connect()
+            files = conn.execute("SELECT COUNT(*) AS count, COALESCE(SUM(size), 0) AS size FROM files").fetchone()
+            results = conn.execute("SELECT COUNT(*) AS count FROM results").fetchone()
+            artifacts = conn.execute("SELECT COUNT(*) AS count FROM artifacts").fetchone()
+        return {
+            "files": files["count"],
+            "size_bytes": files["size"],
+            "results": results["count"],
+            "artifacts": artifacts["count"],
+        }
+
+    def get_result(self, file_id: str, kind: str) -> Optional[Dict[str, Any]]:
+        """저장된 분석 결과 (없거나 버전이 다르면 None)"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result_json FROM results WHERE file_id = ? AND kind = ? AND version = ?",
+                (file_id, kind, RESULT_CACHE_VERSION),
+            ).fetchone()
+        return json.loads(row["result_json"]) if row else None
+
+    def put_result(self, file_id: str, kind: str, result: Dict[str, Any]) -> None:
+        """분석 결과 저장 (인덱스에 없는 파일이면 무시)"""
+        with self._lock:
+            conn = self._connect()
+            if conn.execute("SELECT 1 FROM files WHERE file_id = ?", (file_id,)).fetchone() is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO results (file_id, kind, version, result_json, created_at) VALUES (?, ?, ?, ?, ?)",
+                (file_id, kind, RESULT_CACHE_VERSION, json.dumps(result, ensure_ascii=False), time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+upload_index = UploadIndex()
+
+
+__all__ = ["UploadIndex", "UploadRecord", "upload_index", "RESULT_CACHE_VERSION"]
@@ -0,0 +1,259 @@
+"""
+재개 가능한 업로드 세션 서비스
+큰 스캔 PDF를 바이트 범위 단위로 나눠 올리고, 연결이 끊겨도 받은 범위부터 이어서 업로드
+
+흐름:
+    1. create: 파일명/전체 크기로 세션 생성 (전체 크기만큼 파일 미리 할당)
+    2. write_range: 임의 순서의 바이트 범위를 파일의 해당 위치에 바로 기록
+    3. get: 지금까지 받은 범위 조회 (클라이언트는 빠진 범위만 다시 전송)
+    4. finalize: 모든 범위를 받았으면 청크 단위로 읽으며 SHA-256/형식 검사 후 업로드 인덱스에 등록
+       (begin_finalize로 처리 중 표시 파일을 먼저 만든 요청 하나만 진행)
+
+세션 상태는 세션 디렉토리에 JSON으로 저장되므로 서버 재시작 후에도 이어서 업로드 가능
+만료된 세션은 보존 정책 정리(retention)에서 purge_expired()로 삭제
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiofiles
+
+from app.services.upload_stream import UploadTooLargeError
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+
+# 클라이언트에 권장하는 범위 크기
+UPLOAD_SESSION_CHUNK_SIZE = int(os.getenv("UPLOAD_SESSION_CHUNK_SIZE", str(4 * 1024 * 1024)))  # 4MB
+
+
+class UploadSessionError(Exception):
+    """세션 상태나 요청 범위가 올바르지 않음"""
+
+
+@dataclass
+class UploadSession:
+    session_id: str
+    filename: str
+    ext: str
+    size: int
+    created_at: float
+    updated_at: float
+    sha256: Optional[str] = None  # 클라이언트가 알려준 기대 해시 (finalize 시 검증)
+    received: List[List[int]] = field(default_factory=list)  # 받은 범위 [시작, 끝) 목록 (정렬, 병합됨)
+
+    @property
+    def received_bytes(self) -> int:
+        return sum(end - start for start, end in self.received)
+
+    @property
+    def complete(self) -> bool:
+        return self.received == [[0, self.size]] or (self.size == 0)
+
+    def add_range(self, start: int, end: int) -> None:
+        """받은 범위 추가 후 겹치거나 이어지는 범위 병합"""
+        ranges = sorted(self.received + [[start, end]])
+        merged: List[List[int]] = []
+        for range_start, range_end in ranges:
+            if merged and range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+        self.received = merged
+
+    def remove_range(self, start: int, end: int) -> None:
+        """범위 [start, end)를 받은 범위에서 제외 (다시 쓰는 중이거나 쓰기에 실패한 범위)"""
+        remaining: List[List[int]] = []
+        for range_start, range_end in self.received:
+            if range_start < start:
+                remaining.append([range_start, min(range_end, start)])
+            if range_end > end:
+                remaining.append([max(range_start, end), range_end])
+        self.received = remaining
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["received_bytes"] = self.received_bytes
+        data["complete"] = self.complete
+        return data
+
+
+class UploadSessionStore:
+    """디스크 기반 업로드 세션 저장소"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # 같은 세션에 대한 동시 PUT이 상태 파일을 덮어쓰지 않도록 세션별 잠금
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _data_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.part")
+
+    def _state_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def _finalizing_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.finalizing")
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        if session_id not in self._locks:
+            self._locks[session_id] = asyncio.Lock()
+        return self._locks[session_id]
+
+    def _save(self, session: UploadSession) -> None:
+        temp_path = self._state_path(session.session_id) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(session), f, ensure_ascii=False)
+        os.replace(temp_path, self._state_path(session.session_id))
+
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        # 세션 ID는 uuid hex만 허용 (경로 조작 방지)
+        if not session_id.isalnum():
+            return None
+        try:
+            with open(self._state_path(session_id), "r", encoding="utf-8") as f:
+                return UploadSession(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def create(self, filename: str, ext: str, size: int, max_bytes: int, sha256: Optional[str] = None) -> UploadSession:
+        """
+        세션 생성. 전체 크기만큼 파일을 미리 만들어 두고 범위별로 해당 위치에 기록.
+
+        Raises:
+            UploadTooLargeError: 전체 크기가 제한을 넘음
+        """
+        if size > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        os.makedirs(self.directory, exist_ok=True)
+
+        now = time.time()
+        session = UploadSession(
+            session_id=uuid.uuid4().hex,
+            filename=filename,
+            ext=ext,
+            size=size,
+            created_at=now,
+            updated_at=now,
+            sha256=sha256.lower() if sha256 else None,
+        )
+        with open(self._data_path(session.session_id), "wb") as f:
+            f.truncate(size)
+        self._save(session)
+        return session
+
+    async def write_range(self, session_id: str, start: int, end: int, chunks: AsyncIterator[bytes]) -> UploadSession:
+        """
+        바이트 범위 [start, end)를 파일의 해당 위치에 스트리밍 기록.
+        이미 받은 범위를 다시 보내면 쓰기 전에 받은 범위에서 빼 두고, 끝까지 쓴 경우에만 다시 추가.
+        (쓰는 도중 실패하면 그 범위는 받지 않은 상태로 남으므로 finalize 전에 다시 보내야 함)
+        """
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        if start < 0 or end > session.size or start >= end:
+            raise UploadSessionError(f"잘못된 범위입니다: {start}-{end - 1}/{session.size}")
+
+        await self._update_received(session_id, start, end, received=False)
+        written = 0
+        try:
+            async with aiofiles.open(self._data_path(session_id), "r+b") as f:
+                await f.seek(start)
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if written + len(chunk) > end - start:
+                        raise UploadSessionError("요청 본문이 Content-Range보다 깁니다.")
+                    await f.write(chunk)
+                    written += len(chunk)
+            if written != end - start:
+                raise UploadSessionError(f"요청 본문이 Content-Range보다 짧습니다: {written}/{end - start} bytes")
+        except BaseException:
+            # 같은 범위를 동시에 쓴 다른 PUT이 먼저 성공해 다시 추가했어도 이 실패로 덮어썼을 수 있으므로 다시 제외
+            await self._update_received(session_id, start, end, received=False)
+            raise
+        return await self._update_received(session_id, start, end, received=True)
+
+    async def _update_received(self, session_id: str, start: int, end: int, received: bool) -> UploadSession:
+        """받은 범위에 [start, end) 추가/제외 후 저장"""
+        async with self._lock(session_id):
+            # 잠금 안에서 최신 상태를 다시 읽어 다른 PUT이 기록한 범위와 병합
+            session = self.get(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            if received:
+                session.add_range(start, end)
+            else:
+                session.remove_range(start, end)
+            session.updated_at = time.time()
+            self._save(session)
+        return session
+
+    def begin_finalize(self, session_id: str) -> bool:
+        """
+        완료 처리 시작 표시. 표시 파일을 O_EXCL로 만들므로 여러 워커 프로세스에서도
+        같은 세션을 동시에 finalize하는 요청 중 하나만 True를 받음.
+        """
+        try:
+            fd = os.open(self._finalizing_path(session_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        return True
+
+    def end_finalize(self, session_id: str) -> None:
+        """완료 처리 표시 해제"""
+        try:
+            os.remove(self._finalizing_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def is_finalizing(self, session_id: str) -> bool:
+        return os.path.exists(self._finalizing_path(session_id))
+
+    def data_path(self, session: UploadSession) -> str:
+        return self._data_path(session.session_id)
+
+    def discard(self, session_id: str, keep_data: bool = False) -> None:
+        """세션 상태(와 데이터 파일) 삭제. keep_data=True이면 데이터 파일은 호출한 쪽에서 처리"""
+        paths = [self._state_path(session_id), self._finalizing_path(session_id)]
+        if not keep_data:
+            paths.append(self._data_path(session_id))
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._locks.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 미완료 세션 정리"""
+        if not os.path.isdir(self.directory):
+            return 0
+        cutoff = time.time() - UPLOAD_SESSION_TTL_SECONDS
+        purged = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            session = self.get(name[:-len(".json")])
+            if session is not None and session.updated_at < cutoff:
+                self.discard(session.session_id)
+                purged += 1
+        if purged:
+            logger.info(f"만료된 업로드 세션 {purged}개 정리")
+        return purged
+
+
+__all__ = [
+    "UPLOAD_SESSION_CHUNK_SIZE",
+    "UploadSession",
+    "UploadSessionError",
+    "UploadSessionStore",
+]
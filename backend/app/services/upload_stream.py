@@ -0,0 +1,197 @@
+"""
+업로드 스트리밍 저장 서비스
+업로드 파일을 고정 크기 청크로 읽어 임시 파일에 쓰면서
+크기 제한 검사, SHA-256 계산, 매직 바이트 기반 파일 형식 판별을 함께 수행
+
+업로드 하나가 사용하는 메모리는 파일 크기와 관계없이 청크 크기로 제한됨
+"""
+
+import os
+import uuid
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1MB
+
+# 형식 판별에 사용하는 앞부분 바이트 수 (텍스트 판별은 제어 문자 유무로 하므로 매직 바이트보다 길게 읽음)
+SNIFF_BYTES = 512
+
+# 텍스트처럼 보일 수 있는(NUL이 없는) 바이너리 형식의 매직 바이트 (이미지, RTF, 압축 파일)
+_BINARY_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",  # JPEG
+    b"GIF87a",
+    b"GIF89a",
+    b"II*\x00",  # TIFF
+    b"MM\x00*",
+    b"{\\rtf",
+    b"\x1f\x8b",  # gzip
+)
+
+# 텍스트 파일에 나올 수 없는 C0 제어 문자 (탭, 줄바꿈, 폼 피드 등 공백 문자와 ESC 제외) 및 DEL
+_NON_TEXT_BYTES = bytes(set(range(0x20)) - set(b"\t\n\v\f\r\x1b") | {0x7F})
+
+# 확장자별 허용 형식 (.docx는 zip 컨테이너, .doc는 OLE 복합 문서)
+EXTENSION_TYPES = {
+    ".pdf": {"pdf"},
+    ".docx": {"zip"},
+    ".doc": {"ole", "zip"},  # .doc 이름으로 저장된 docx도 허용
+    ".txt": {"text"},
+}
+
+
+class UploadTooLargeError(Exception):
+    """업로드 크기가 제한을 넘음"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"업로드 크기 제한 초과: {max_bytes} bytes")
+
+
+class FileTypeMismatchError(Exception):
+    """파일 내용이 확장자와 맞지 않음"""
+
+    def __init__(self, extension: str, detected_type: Optional[str]):
+        self.extension = extension
+        self.detected_type = detected_type
+        super().__init__(f"파일 형식 불일치: 확장자 {extension}, 실제 형식 {detected_type or '알 수 없음'}")
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+    detected_type: Optional[str]
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """
+    파일 앞부분 바이트로 실제 형식 판별.
+
+    Returns:
+        "pdf" | "zip" | "ole" | "text" | None (판별 불가)
+    """
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "zip"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return "ole"
+    if head.startswith(_BINARY_SIGNATURES):
+        return None
+    # UTF-16 텍스트 (BOM)
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "text"
+    # UTF-8뿐 아니라 CP949 등 레거시 인코딩 텍스트도 허용해야 하므로(parse_txt 참고)
+    # 디코딩 대신 제어 문자가 없는지로 판별
+    if head.translate(None, _NON_TEXT_BYTES) != head:
+        return None
+    return "text"
+
+
+async def save_upload_stream(
+    upload: UploadFile,
+    directory: str,
+    filename: Optional[str],
+    max_bytes: int,
+    extension: Optional[str] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StoredUpload:
+    """
+    업로드 파일을 청크 단위로 directory/filename에 저장.
+    제한을 넘는 순간 중단하고 임시 파일을 삭제함.
+
+    Args:
+        filename: None이면 임시 파일(.part) 그대로 두고 경로 반환 (호출한 쪽에서 이동)
+        extension: 지정하면 첫 청크의 매직 바이트가 확장자와 맞는지 검사
+
+    Raises:
+        UploadTooLargeError: 크기 제한 초과
+        FileTypeMismatchError: 내용이 확장자와 맞지 않음
+    """
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+    final_path = os.path.join(directory, filename) if filename else temp_path
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    detected_type: Optional[str] = None
+    sniffed = False
+
+    def check_type() -> None:
+        nonlocal detected_type, sniffed
+        sniffed = True
+        detected_type = sniff_file_type(head)
+        if extension and detected_type not in EXTENSION_TYPES.get(extension, set()):
+            raise FileTypeMismatchError(extension, detected_type)
+
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                if not sniffed:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                    if len(head) >= SNIFF_BYTES:
+                        check_type()
+                digest.update(chunk)
+                await f.write(chunk)
+
+        # SNIFF_BYTES보다 짧은 파일
+        if not sniffed:
+            check_type()
+
+        if final_path != temp_path:
+            os.replace(temp_path, final_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    return StoredUpload(path=final_path, size=size, sha256=digest.hexdigest(), detected_type=detected_type)
+
+
+def inspect_file(path: str, extension: Optional[str] = None, chunk_size: int = UPLOAD_CHUNK_SIZE) -> StoredUpload:
+    """
+    디스크에 있는 파일을 청크 단위로 읽어 SHA-256과 형식 판별 (메모리는 청크 크기로 제한).
+
+    Raises:
+        FileTypeMismatchError: extension을 지정했고 내용이 확장자와 맞지 않음
+    """
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+            digest.update(chunk)
+            size += len(chunk)
+
+    detected_type = sniff_file_type(head)
+    if extension and detected_type not in EXTENSION_TYPES.get(extension, set()):
+        raise FileTypeMismatchError(extension, detected_type)
+    return StoredUpload(path=path, size=size, sha256=digest.hexdigest(), detected_type=detected_type)
+
+
+__all__ = [
+    "UPLOAD_CHUNK_SIZE",
+    "UploadTooLargeError",
+    "FileTypeMismatchError",
+    "StoredUpload",
+    "sniff_file_type",
+    "save_upload_stream",
+    "inspect_file",
+]
@@ -0,0 +1,282 @@
+"""
+OCR 처리량/지연시간 벤치마크
+합성 한국어 문서를 만들어 실제 파싱/추출 함수에 통과시키고
+pages/sec, p50/p95 지연시간, 최대 RSS, 필드 정확도를 JSON으로 기록
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.ocr_benchmark --output benchmarks/results/baseline.json
+    python -m benchmarks.ocr_benchmark --baseline benchmarks/results/baseline.json
+
+기본적으로 페이지 텍스트 캐시를 끄고 측정 (--warm-cache로 캐시 적중 경로 측정)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # 없으면 getrusage로 대체 (워커 프로세스 제외)
+    psutil = None
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(ratio * len(ordered))) - 1))
+    return ordered[index]
+
+
+class _RSSSampler:
+    """측정 중 현재 프로세스 + OCR 워커 프로세스의 RSS 합계 최대값 기록"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _current_rss(self) -> int:
+        if psutil is None:
+            import resource
+            # 리눅스는 KB, macOS는 바이트 단위
+            scale = 1 if sys.platform == "darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "_RSSSampler":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._current_rss())
+
+
+def _normalize_amount(value: Optional[str]) -> Optional[str]:
+    return value.replace(",", "").replace(" ", "") if value else None
+
+
+def _accuracy_business(result: Dict, expected: Dict) -> float:
+    checks = [
+        result.get("opening_date_normalized") == expected["opening_date_normalized"],
+        bool(result.get("head_office_address"))
+        and expected["head_office_address"].replace(" ", "") in result["head_office_address"].replace(" ", ""),
+    ]
+    return sum(checks) / len(checks)
+
+
+def _accuracy_shareholder(result: Dict, expected: Dict) -> float:
+    expected_pairs = {(item["name"], item["share_ratio"]) for item in expected["shareholders"]}
+    found_pairs = {
+        ((item.get("name") or "").replace(" ", ""), str(item.get("share_ratio") or "").rstrip("%"))
+        for item in result.get("shareholders", [])
+    }
+    return len(expected_pairs & found_pairs) / len(expected_pairs)
+
+
+def _accuracy_financial(result: Dict, expected: Dict) -> float:
+    found: Dict[str, Optional[str]] = {}
+    for page in result.get("pages", []):
+        for key in ("revenue", "total_liabilities", "total_equity"):
+            if page.get(key):
+                found[key] = page[key]
+    checks = [_normalize_amount(found.get(key)) == _normalize_amount(value) for key, value in expected.items()]
+    return sum(checks) / len(checks)
+
+
+def _build_scenarios() -> List[Dict[str, Any]]:
+    """시나리오 목록: 이름, 실행 함수(파일 경로 → 추출 결과), 정확도 함수"""
+    from app.services.document_parser import DocumentParser
+    from app.services.business_registration_extractor import extract_business_registration_fields
+    from app.services.shareholder_extractor import extract_shareholder_fields
+    from app.services.financial_statement_extractor import extract_financial_statement_fields
+
+    def business(path: str) -> Dict:
+        text = DocumentParser.parse(path, ".pdf", ocr_only=True, top_half_only=True)
+        return extract_business_registration_fields(text)
+
+    def shareholder(path: str) -> Dict:
+        text = DocumentParser.parse(path, ".pdf")
+        return extract_shareholder_fields(path, ".pdf", text)
+
+    def financial(path: str) -> Dict:
+        return extract_financial_statement_fields(path, ".pdf", None)
+
+    def parse_only(path: str) -> Dict:
+        return {"text": DocumentParser.parse(path, ".pdf")}
+
+    return [
+        {"name": "business_registration_scanned", "run": business, "accuracy": _accuracy_business},
+        {"name": "shareholder_text", "run": shareholder, "accuracy": _accuracy_shareholder},
+        {"name": "shareholder_scanned", "run": shareholder, "accuracy": _accuracy_shareholder},
+        {"name": "financial_statement_scanned", "run": financial, "accuracy": _accuracy_financial},
+        {"name": "mixed_deck", "run": parse_only, "accuracy": None},
+    ]
+
+
+def _run_scenario(
+    run: Callable[[str], Dict],
+    accuracy: Optional[Callable[[Dict, Dict], float]],
+    path: str,
+    expected: Dict,
+    pages: int,
+    iterations: int,
+    clear_cache: bool,
+) -> Dict[str, Any]:
+    from app.services.page_cache import page_text_cache
+
+    latencies: List[float] = []
+    scores: List[float] = []
+    with _RSSSampler() as sampler:
+        for _ in range(iterations):
+            if clear_cache:
+                page_text_cache.clear()
+            started_at = time.perf_counter()
+            result = run(path)
+            latencies.append(time.perf_counter() - started_at)
+            if accuracy is not None:
+                scores.append(accuracy(result, expected))
+
+    total = sum(latencies)
+    return {
+        "pages": pages,
+        "iterations": iterations,
+        "pages_per_sec": round(pages * iterations / total, 3) if total else None,
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 1),
+        "latency_ms_p95": round(_percentile(latencies, 0.95) * 1000, 1),
+        "latency_ms_max": round(max(latencies) * 1000, 1),
+        "peak_rss_mb": round(sampler.peak_bytes / 1024 / 1024, 1),
+        "field_accuracy": round(statistics.mean(scores), 3) if scores else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> bool:
+    """기준 결과와 비교해서 출력하고, 성능/정확도가 허용 범위 이상 나빠졌으면 False"""
+    ok = True
+    print(f"\n기준: {baseline['meta'].get('commit')} → 현재: {current['meta'].get('commit')}")
+    print(f"{'시나리오':32} {'p50(ms)':>18} {'pages/sec':>18} {'정확도':>12}")
+    for name, metrics in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            print(f"{name:32} (기준 없음)")
+            continue
+        p50_change = (metrics["latency_ms_p50"] - base["latency_ms_p50"]) / base["latency_ms_p50"]
+        regressed = p50_change > tolerance
+        if metrics["field_accuracy"] is not None and base["field_accuracy"] is not None:
+            regressed = regressed or metrics["field_accuracy"] < base["field_accuracy"]
+        ok = ok and not regressed
+        print(
+            f"{name:32} "
+            f"{base['latency_ms_p50']:>8}→{metrics['latency_ms_p50']:<8} "
+            f"{base['pages_per_sec']:>8}→{metrics['pages_per_sec']:<8} "
+            f"{base['field_accuracy']}→{metrics['field_accuracy']}"
+            f"{'  ⚠ 성능 저하' if regressed else ''}"
+        )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TIPSMAX OCR 벤치마크")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--iterations", type=int, default=3, help="시나리오별 반복 횟수")
+    parser.add_argument("--appendix-pages", type=int, default=8, help="재무제표 부속명세서 페이지 수")
+    parser.add_argument("--scenario", action="append", help="실행할 시나리오 이름 (여러 번 지정 가능)")
+    parser.add_argument("--font", help="한글 TTF/OTF 글꼴 경로 (기본값: PyMuPDF 내장 CJK 글꼴)")
+    parser.add_argument("--workdir", help="합성 문서 생성 디렉토리 (기본값: 임시 디렉토리)")
+    parser.add_argument("--warm-cache", action="store_true", help="페이지 텍스트 캐시를 켜고 측정")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="허용하는 p50 지연시간 증가 비율")
+    args = parser.parse_args(argv)
+
+    # 서비스 모듈이 설정을 읽기 전에 캐시 디렉토리/크기 지정
+    cache_dir = tempfile.mkdtemp(prefix="tipsmax-bench-cache-")
+    os.environ["PAGE_CACHE_DIR"] = cache_dir
+    if not args.warm_cache:
+        os.environ["PAGE_CACHE_MAX_MB"] = "0"
+
+    from benchmarks.synthetic_documents import build_corpus, page_count
+    from app.services.ocr_engine import get_ocr_engine, shutdown_ocr_engine, OCR_BACKEND
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="tipsmax-bench-")
+    print(f"합성 문서 생성 중: {workdir}")
+    corpus = build_corpus(workdir, font_file=args.font, appendix_pages=args.appendix_pages)
+
+    engine = get_ocr_engine()
+    results: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ocr_workers": engine.max_workers,
+            "tesseract_threads": engine.tesseract_threads,
+            "ocr_backend": OCR_BACKEND,
+            "warm_cache": args.warm_cache,
+        },
+        "scenarios": {},
+    }
+
+    try:
+        for scenario in _build_scenarios():
+            name = scenario["name"]
+            if args.scenario and name not in args.scenario:
+                continue
+            path, expected = corpus[name]
+            # 프로세스 풀 기동 비용이 첫 시나리오에만 들어가지 않도록 한 번 미리 실행
+            scenario["run"](path)
+            print(f"측정 중: {name}")
+            metrics = _run_scenario(
+                scenario["run"], scenario["accuracy"], path, expected,
+                pages=page_count(path), iterations=args.iterations, clear_cache=not args.warm_cache,
+            )
+            results["scenarios"][name] = metrics
+            print(f"  {json.dumps(metrics, ensure_ascii=False)}")
+    finally:
+        shutdown_ocr_engine()
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+벤치마크용 합성 문서 생성
+사업자등록증, 주주명부(표), 표준재무제표(여러 페이지)를 PyMuPDF로 만들고
+스캔본처럼 래스터화(저해상도 + 노이즈 + JPEG)한 버전도 생성
+
+각 생성 함수는 추출 정확도 비교에 사용할 기대값(dict)을 반환
+"""
+
+import io
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageFilter
+
+# A4 (pt)
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+FONT_NAME = "kr"
+
+
+class _Writer:
+    """한글 글꼴을 포함해서 텍스트를 쓰는 도우미"""
+
+    def __init__(self, font_file: Optional[str] = None):
+        self.font_file = font_file
+        # 별도 글꼴이 없으면 PyMuPDF 내장 CJK 글꼴 사용
+        self.font_buffer = None if font_file else fitz.Font("cjk").buffer
+
+    def new_page(self, doc: "fitz.Document") -> "fitz.Page":
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if self.font_file:
+            page.insert_font(fontname=FONT_NAME, fontfile=self.font_file)
+        else:
+            page.insert_font(fontname=FONT_NAME, fontbuffer=self.font_buffer)
+        return page
+
+    def text(self, page: "fitz.Page", x: float, y: float, text: str, size: float = 11) -> None:
+        page.insert_text((x, y), text, fontname=FONT_NAME, fontsize=size)
+
+
+def rasterize(src_path: str, dst_path: str, dpi: int = 150, noise: float = 12.0, seed: int = 0) -> None:
+    """
+    PDF를 스캔본처럼 변환: 페이지를 흑백 이미지로 렌더링하고
+    약간의 흐림과 노이즈를 넣은 JPEG로 다시 PDF에 삽입 (텍스트 레이어 없음)
+    """
+    random.seed(seed)
+    src = fitz.open(src_path)
+    dst = fitz.open()
+    for page in src:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        img = img.rotate(random.uniform(-0.6, 0.6), fillcolor=255, resample=Image.BICUBIC)
+        img = img.filter(ImageFilter.GaussianBlur(radius=0.6))
+        if noise > 0:
+            noise_img = Image.effect_noise(img.size, noise)
+            img = Image.blend(img, noise_img, 0.08)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=70)
+        new_page = dst.new_page(width=page.rect.width, height=page.rect.height)
+        new_page.insert_image(new_page.rect, stream=buffer.getvalue())
+    dst.save(dst_path, garbage=3, deflate=True)
+    dst.close()
+    src.close()
+
+
+def make_business_registration(path: str, writer: _Writer, seed: int = 0) -> Dict[str, str]:
+    """사업자등록증 1페이지"""
+    random.seed(seed)
+    year, month, day = random.randint(2010, 2023), random.randint(1, 12), random.randint(1, 28)
+    address = f"서울특별시 강남구 테헤란로 {random.randint(1, 500)}길 {random.randint(1, 99)}, {random.randint(2, 20)}층"
+    company = f"주식회사 테스트{random.randint(100, 999)}"
+
+    doc = fitz.open()
+    page = writer.new_page(doc)
+    writer.text(page, 210, 90, "사 업 자 등 록 증", size=22)
+    writer.text(page, 230, 120, "( 법인사업자 )", size=12)
+    lines = [
+        f"등록번호 : {random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(10000, 99999)}",
+        f"법인명(단체명) : {company}",
+        f"대 표 자 : 홍길동",
+        f"개업연월일 : {year}년 {month:02d}월 {day:02d}일",
+        f"본점소재지 : {address}",
+        f"사업장소재지 : {address}",
+    ]
+    for i, line in enumerate(lines):
+        writer.text(page, 70, 180 + i * 32, line, size=13)
+    writer.text(page, 70, 600, "사업의 종류 : 업태 서비스 종목 소프트웨어 개발 및 공급", size=11)
+    writer.text(page, 200, 760, "역삼세무서장", size=16)
+    doc.save(path)
+    doc.close()
+    return {
+        "opening_date_normalized": f"{year:04d}-{month:02d}-{day:02d}",
+        "head_office_address": address,
+    }
+
+
+def make_shareholder_register(path: str, writer: _Writer, shareholders: int = 8, seed: int = 0) -> Dict[str, List[Dict[str, str]]]:
+    """주주명부 1페이지 (괘선이 있는 표)"""
+    random.seed(seed)
+    names = ["김민준", "이서연", "박도윤", "최지우", "정하준", "강서윤", "조시우", "윤지호", "장하은", "임도현"]
+    weights = [random.uniform(1, 10) for _ in range(shareholders)]
+    total_weight = sum(weights)
+    total_shares = 100000
+    rows = []
+    for i in range(shareholders):
+        ratio = round(weights[i] / total_weight * 100, 2)
+        rows.append((names[i % len(names)], f"{int(total_shares * ratio / 100):,}", f"{ratio:.2f}%"))
+
+    doc = fitz.open()
+    page = writer.new_page(doc)
+    writer.text(page, 240, 80, "주 주 명 부", size=20)
+    writer.text(page, 60, 115, "2024년 12월 31일 현재", size=10)
+
+    headers = ("주주명", "주식수", "주식비율")
+    col_x = [60, 220, 380, 535]
+    row_h = 28
+    top = 130
+    for r in range(len(rows) + 2):
+        y = top + r * row_h
+        page.draw_line((col_x[0], y), (col_x[-1], y))
+    for x in col_x:
+        page.draw_line((x, top), (x, top + (len(rows) + 1) * row_h))
+    for c, header in enumerate(headers):
+        writer.text(page, col_x[c] + 10, top + 19, header, size=11)
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row):
+            writer.text(page, col_x[c] + 10, top + r * row_h + 19, value, size=11)
+    doc.save(path)
+    doc.close()
+    return {
+        "shareholders": [
+            {"name": name, "share_ratio": ratio.rstrip("%")} for name, _, ratio in rows
+        ]
+    }
+
+
+def _amount(rng: random.Random) -> str:
+    return f"{rng.randint(100_000_000, 9_999_999_999):,}"
+
+
+def make_financial_statements(path: str, writer: _Writer, appendix_pages: int = 8, seed: int = 0) -> Dict[str, Optional[str]]:
+    """
+    표준재무제표 (표준재무제표증명 1p + 표준재무상태표 1p + 표준손익계산서 1p + 부속명세서 Np).
+    추출기는 마지막 페이지부터 보므로 부속명세서를 뒤쪽에 배치해 실제 신고서와 비슷하게 구성.
+    """
+    rng = random.Random(seed)
+    revenue = _amount(rng)
+    total_liabilities = _amount(rng)
+    total_equity = _amount(rng)
+
+    doc = fitz.open()
+
+    page = writer.new_page(doc)
+    writer.text(page, 180, 90, "표준재무제표증명", size=22)
+    writer.text(page, 70, 150, "발급번호 : 1234-567-8901-234", size=11)
+    writer.text(page, 70, 180, "사업연도 : 2024.01.01 ~ 2024.12.31", size=11)
+
+    page = writer.new_page(doc)
+    writer.text(page, 200, 70, "표준재무상태표", size=20)
+    balance_rows = [
+        ("유동자산", _amount(rng)), ("비유동자산", _amount(rng)), ("자산총계", _amount(rng)),
+        ("유동부채", _amount(rng)), ("비유동부채", _amount(rng)), ("부채총계", total_liabilities),
+        ("자본금", _amount(rng)), ("이익잉여금", _amount(rng)), ("자본총계", total_equity),
+    ]
+    for i, (label, value) in enumerate(balance_rows):
+        writer.text(page, 70, 130 + i * 30, label, size=12)
+        writer.text(page, 380, 130 + i * 30, value, size=12)
+
+    page = writer.new_page(doc)
+    writer.text(page, 200, 70, "표준손익계산서", size=20)
+    income_rows = [
+        ("매출액", revenue), ("매출원가", _amount(rng)), ("매출총이익", _amount(rng)),
+        ("판매비와관리비", _amount(rng)), ("영업이익", _amount(rng)), ("당기순이익", _amount(rng)),
+    ]
+    for i, (label, value) in enumerate(income_rows):
+        writer.text(page, 70, 130 + i * 30, label, size=12)
+        writer.text(page, 380, 130 + i * 30, value, size=12)
+
+    for n in range(appendix_pages):
+        page = writer.new_page(doc)
+        writer.text(page, 210, 70, "부속명세서", size=20)
+        writer.text(page, 70, 100, f"({n + 1}) 제조원가명세서 및 기타 명세", size=11)
+        for i in range(20):
+            writer.text(page, 70, 140 + i * 28, f"항목 {i + 1:02d}", size=11)
+            writer.text(page, 380, 140 + i * 28, f"{rng.randint(1_000, 99_999_999):,}", size=11)
+
+    doc.save(path)
+    doc.close()
+    return {
+        "revenue": revenue,
+        "total_liabilities": total_liabilities,
+        "total_equity": total_equity,
+    }
+
+
+def make_mixed_deck(path: str, writer: _Writer, typed_pages: int = 6, scanned_path: Optional[str] = None) -> Dict:
+    """텍스트 슬라이드 여러 장 + 스캔 증명서(scanned_path의 페이지)가 섞인 IR 자료"""
+    doc = fitz.open()
+    for n in range(typed_pages):
+        page = writer.new_page(doc)
+        writer.text(page, 70, 90, f"IR 자료 {n + 1}: 기술 및 사업 개요", size=18)
+        for i in range(12):
+            writer.text(page, 70, 140 + i * 26, f"- 핵심 내용 {i + 1}: 인공지능 기반 문서 분석 솔루션 시장 확대", size=11)
+    if scanned_path:
+        with fitz.open(scanned_path) as scanned:
+            doc.insert_pdf(scanned)
+    doc.save(path)
+    doc.close()
+    return {}
+
+
+def page_count(path: str) -> int:
+    with fitz.open(path) as doc:
+        return len(doc)
+
+
+def build_corpus(workdir: str, font_file: Optional[str] = None, appendix_pages: int = 8) -> Dict[str, Tuple[str, Dict]]:
+    """
+    벤치마크 문서 세트 생성.
+
+    Returns:
+        {시나리오 문서 이름: (파일 경로, 기대값)}
+    """
+    os.makedirs(workdir, exist_ok=True)
+    writer = _Writer(font_file)
+    corpus: Dict[str, Tuple[str, Dict]] = {}
+
+    def p(name: str) -> str:
+        return os.path.join(workdir, name)
+
+    expected = make_business_registration(p("business_registration_text.pdf"), writer)
+    rasterize(p("business_registration_text.pdf"), p("business_registration_scanned.pdf"), seed=1)
+    corpus["business_registration_scanned"] = (p("business_registration_scanned.pdf"), expected)
+
+    expected = make_shareholder_register(p("shareholder_text.pdf"), writer)
+    corpus["shareholder_text"] = (p("shareholder_text.pdf"), expected)
+    rasterize(p("shareholder_text.pdf"), p("shareholder_scanned.pdf"), seed=2)
+    corpus["shareholder_scanned"] = (p("shareholder_scanned.pdf"), expected)
+
+    expected = make_financial_statements(p("financial_statement_text.pdf"), writer, appendix_pages=appendix_pages)
+    rasterize(p("financial_statement_text.pdf"), p("financial_statement_scanned.pdf"), seed=3)
+    corpus["financial_statement_scanned"] = (p("financial_statement_scanned.pdf"), expected)
+
+    make_mixed_deck(p("mixed_deck.pdf"), writer, scanned_path=p("business_registration_scanned.pdf"))
+    corpus["mixed_deck"] = (p("mixed_deck.pdf"), {})
+
+    return corpus
+
+
+__all__ = ["build_corpus", "rasterize", "page_count"]
@@ -0,0 +1,15 @@
+"""
+테스트 공통 설정
+app 모듈의 싱글톤(저장소, 업로드 인덱스, 디스크 캐시)은 import 시 디렉토리를 만들므로
+import 전에 환경 변수로 임시 디렉토리를 지정
+"""
+
+import os
+import tempfile
+
+_root = tempfile.mkdtemp(prefix="tipsmax-test-")
+os.environ.setdefault("STORAGE_BACKEND", "local")
+os.environ.setdefault("STORAGE_LOCAL_DIR", os.path.join(_root, "uploads"))
+os.environ.setdefault("UPLOAD_INDEX_PATH", os.path.join(_root, "uploads", "index.sqlite3"))
+os.environ.setdefault("PAGE_CACHE_DIR", os.path.join(_root, "cache", "page_text"))
+os.environ.setdefault("LLM_CACHE_DIR", os.path.join(_root, "cache", "llm"))
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import admin
+
+
+def test_admin_routes_disabled_without_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    client = TestClient(app)
+    assert client.get("/api/admin/cache", headers={"X-Admin-Token": ""}).status_code == 403
+    assert client.post("/api/admin/storage/sweep").status_code == 403
+
+
+def test_admin_routes_require_matching_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    client = TestClient(app)
+    assert client.get("/api/admin/executor").status_code == 401
+    assert client.get("/api/admin/executor", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    response = client.get("/api/admin/cache", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"page_text", "llm", "prewarm"}
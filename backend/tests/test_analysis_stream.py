@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import analysis
+
+
+def _upload_text(client: TestClient, text: str) -> str:
+    response = client.post("/api/upload", files={"file": ("doc.txt", text.encode("utf-8"), "text/plain")})
+    assert response.status_code == 200
+    return response.json()["file_id"]
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append(lines["event"])
+    return events
+
+
+def test_stream_without_result_sends_error(monkeypatch):
+    async def analyze_stream(self, document_text, timeout=None, force_refresh=False):
+        self.used_mock = False
+        yield {"type": "field", "name": "companySummary", "value": "요약"}
+
+    monkeypatch.setattr(analysis.LLMAnalyzer, "analyze_stream", analyze_stream)
+    client = TestClient(app)
+    file_id = _upload_text(client, "스트리밍 결과 누락 테스트 문서입니다. " * 20)
+
+    response = client.post("/api/analyze/stream", json={"file_id": file_id, "force_refresh": True})
+
+    events = _events(response.text)
+    assert "field" in events
+    assert events[-1] == "error"
+    assert "result" not in events
+    assert "분석 결과를 받지 못했습니다." in response.text
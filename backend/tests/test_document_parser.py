@@ -0,0 +1,90 @@
+import fitz
+import pytest
+
+from app.services import document_parser
+from app.services.document_parser import DocumentParser
+
+
+class FakeOCREngine:
+    """요청받은 페이지를 기록하고 "OCR n" 텍스트를 돌려주는 OCR 엔진 대역"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    def ocr_pages(self, file_path, page_indices=None, zoom=2.0, clip=None, lang="kor+eng"):
+        self.calls.append({"page_indices": page_indices, "clip": clip})
+        if self.error is not None:
+            raise self.error
+        return [f"OCR {index + 1}" for index in page_indices]
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    def install(error: Exception = None) -> FakeOCREngine:
+        engine = FakeOCREngine(error)
+        monkeypatch.setattr(document_parser, "get_ocr_engine", lambda: engine)
+        return engine
+    return install
+
+
+def _image_pixmap() -> "fitz.Pixmap":
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 10, 10))
+    pix.clear_with(128)
+    return pix
+
+
+def _hybrid_pdf(tmp_path) -> str:
+    """1쪽: 텍스트 레이어, 2쪽: 이미지만, 3쪽: 빈 페이지"""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "텍스트 레이어가 있는 페이지입니다. Text layer page.", fontname="korea")
+    doc.new_page().insert_image(fitz.Rect(0, 0, 200, 200), pixmap=_image_pixmap())
+    doc.new_page()
+    path = str(tmp_path / "hybrid.pdf")
+    doc.save(path)
+    return path
+
+
+def test_only_image_pages_without_text_are_ocred(tmp_path, fake_engine):
+    engine = fake_engine()
+    pages = DocumentParser.parse_pdf_pages(_hybrid_pdf(tmp_path))
+
+    assert [call["page_indices"] for call in engine.calls] == [[1]]
+    assert [page["method"] for page in pages] == ["text", "ocr", "empty"]
+    assert pages[1]["text"] == "OCR 2"
+    assert "Text layer page" in pages[0]["text"]
+
+
+def test_document_without_text_layer_ocrs_every_page(tmp_path, fake_engine):
+    engine = fake_engine()
+    doc = fitz.open()
+    doc.new_page().insert_image(fitz.Rect(0, 0, 200, 200), pixmap=_image_pixmap())
+    doc.new_page()
+    path = str(tmp_path / "scanned.pdf")
+    doc.save(path)
+
+    pages = DocumentParser.parse_pdf_pages(path, top_half_only=True)
+
+    assert engine.calls == [{"page_indices": [0, 1], "clip": document_parser.TOP_HALF}]
+    assert [page["method"] for page in pages] == ["ocr", "ocr"]
+
+
+def test_ocr_failure_keeps_text_layer(tmp_path, fake_engine):
+    fake_engine(RuntimeError("tesseract not found"))
+    path = _hybrid_pdf(tmp_path)
+
+    pages = DocumentParser.parse_pdf_pages(path)
+
+    assert [page["method"] for page in pages] == ["text", "empty", "empty"]
+    assert "Text layer page" in DocumentParser.parse_pdf(path)
+
+
+def test_ocr_failure_without_text_layer_fails_parse(tmp_path, fake_engine):
+    fake_engine(RuntimeError("tesseract not found"))
+    doc = fitz.open()
+    doc.new_page().insert_image(fitz.Rect(0, 0, 200, 200), pixmap=_image_pixmap())
+    path = str(tmp_path / "scanned.pdf")
+    doc.save(path)
+
+    with pytest.raises(Exception, match="텍스트 및 OCR 모두 실패"):
+        DocumentParser.parse_pdf(path)
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.routes import jobs as jobs_route
+from app.routes import analysis
+from app.services.jobs import JobManager
+from app.services.progress import STAGE_OCR, report_progress
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    작업 워커가 요청 사이에도 같은 이벤트 루프에서 돌도록 lifespan 안에서 요청.
+    종료 처리가 다른 테스트가 쓰는 공용 작업 풀/OCR 엔진을 닫지 않도록 해당 부분만 바꿈.
+    """
+    manager = JobManager(workers=1)
+    monkeypatch.setattr(jobs_route, "job_manager", manager)
+    monkeypatch.setattr(main, "job_manager", manager)
+    monkeypatch.setattr(main, "shutdown_pools", lambda: None)
+    monkeypatch.setattr(main, "shutdown_ocr_engine", lambda: None)
+    monkeypatch.setattr(main.retention_manager, "interval_seconds", 0)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    with TestClient(app) as client:
+        yield client
+
+
+def _upload_text(client: TestClient, text: str) -> str:
+    response = client.post("/api/upload", files={"file": ("doc.txt", text.encode("utf-8"), "text/plain")})
+    assert response.status_code == 200
+    return response.json()["file_id"]
+
+
+def _read_events(client: TestClient, job_id: str):
+    events = []
+    with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        name = None
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                name = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                assert data["type"] == name
+                events.append(data)
+    return events
+
+
+def test_job_events_stream_progress_from_pool_threads(client, monkeypatch):
+    threads = []
+
+    def parse(self, file_path, file_ext):
+        # 작업 풀 스레드에서 보고한 진행 상황도 작업 구독자에게 전달되어야 함
+        threads.append(threading.current_thread().name)
+        for page in (1, 2):
+            report_progress(STAGE_OCR, page=page, total=2)
+        return "작업 진행 상황 스트리밍 테스트 문서입니다. " * 10
+
+    monkeypatch.setattr(analysis.DocumentParser, "parse", parse)
+    file_id = _upload_text(client, "작업 SSE 테스트 문서 " * 20)
+
+    created = client.post("/api/jobs", json={"file_id": file_id, "kind": "analysis", "force_refresh": True})
+    assert created.status_code == 202
+    job_id = created.json()["job_id"]
+
+    events = _read_events(client, job_id)
+
+    assert threads and threads[0].startswith("ocr-pool")
+    sequence = [
+        (event["type"], event.get("status") or event.get("stage"), event.get("page"))
+        for event in events
+    ]
+    assert sequence[:2] == [("status", "queued", None), ("status", "running", None)]
+    assert sequence[-1] == ("status", "succeeded", None)
+    ocr_pages = [page for kind, stage, page in sequence if kind == "progress" and stage == "ocr"]
+    assert ocr_pages == [1, 2]
+    llm = [event["status"] for event in events if event.get("stage") == "llm"]
+    assert llm[0] == "started" and llm[-1] == "completed"
+    # 진행 이벤트는 모두 running 이후, 완료 이전에 전달
+    progress_positions = [i for i, (kind, _, _) in enumerate(sequence) if kind == "progress"]
+    assert 1 < min(progress_positions) and max(progress_positions) < len(sequence) - 1
+    assert all(event["job_id"] == job_id for event in events)
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["progress"]["stage"] == "llm"
+    assert job["result"]["overallScore"] is not None
+
+
+def test_failed_job_reports_error_in_stream(client):
+    file_id = _upload_text(client, "짧음")
+
+    job_id = client.post("/api/jobs", json={"file_id": file_id, "kind": "analysis"}).json()["job_id"]
+    events = _read_events(client, job_id)
+
+    assert events[-1]["type"] == "status"
+    assert events[-1]["status"] == "failed"
+    assert "충분한 텍스트" in events[-1]["error"]
+    assert client.get(f"/api/jobs/{job_id}").json()["status"] == "failed"
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/jobs/missing/events").status_code == 404
+    assert client.get("/api/jobs/missing").status_code == 404
+
+
+def test_subscriber_gets_final_event_when_job_finishes_during_history_replay():
+    async def main():
+        manager = JobManager(workers=1)
+        release = asyncio.Event()
+
+        async def runner():
+            await release.wait()
+            return "done"
+
+        job = manager.submit("analysis", "file", runner)
+        await asyncio.sleep(0)  # 워커가 작업을 시작해서 running 이벤트 기록
+        subscription = manager.subscribe(job.id)
+        first = await subscription.__anext__()
+
+        # 구독자가 이력을 보내는 도중에 작업이 끝남
+        release.set()
+        while not job.finished:
+            await asyncio.sleep(0)
+        rest = [event async for event in subscription]
+        await manager.shutdown()
+        return [first] + rest
+
+    events = asyncio.run(main())
+    assert [event["status"] for event in events] == ["queued", "running", "succeeded"]
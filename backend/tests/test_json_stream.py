@@ -0,0 +1,48 @@
+import json
+
+from app.services.json_stream import IncrementalJSONFieldParser
+
+
+RESULT = {
+    "companySummary": "회사는 \"AI\" 기반 {분석} 서비스를 제공, 매출은 성장 중",
+    "evaluations": [{"criterion": "시장성", "score": 4, "notes": ["a, b", "c]"]}],
+    "totalScore": 87.5,
+    "risks": None,
+}
+
+
+def _feed_in_pieces(text: str, size: int):
+    parser = IncrementalJSONFieldParser()
+    fields = []
+    for i in range(0, len(text), size):
+        fields.extend(parser.feed(text[i:i + size]))
+    return parser, fields
+
+
+def test_fields_complete_in_order_regardless_of_chunking():
+    text = json.dumps(RESULT, ensure_ascii=False, indent=2)
+    for size in (1, 3, 7, len(text)):
+        parser, fields = _feed_in_pieces(text, size)
+        assert fields == list(RESULT.items())
+        assert parser.fields == list(RESULT)
+        assert parser.finished
+
+
+def test_field_is_emitted_as_soon_as_it_completes():
+    parser = IncrementalJSONFieldParser()
+    assert parser.feed('{"companySummary": "요약"') == []
+    assert parser.feed(', "totalScore": 9') == [("companySummary", "요약")]
+    assert parser.feed("0}") == [("totalScore", 90)]
+
+
+def test_text_around_the_object_is_ignored():
+    text = '```json\n{"a": 1, "b": "x\\\\"}\n```\n{"c": 2}'
+    parser, fields = _feed_in_pieces(text, 4)
+    assert fields == [("a", 1), ("b", "x\\")]
+    assert parser.finished
+
+
+def test_unfinished_object_is_not_finished():
+    parser, fields = _feed_in_pieces('{"a": 1, "b": [1, 2', 2)
+    assert fields == [("a", 1)]
+    assert not parser.finished
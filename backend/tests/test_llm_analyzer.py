@@ -0,0 +1,84 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_analyzer
+from app.services.llm_analyzer import LLMAnalyzer
+from app.services.llm_cache import llm_response_cache
+from app.services.progress import progress_reporter
+from app.services.prompt_templates import MAX_DOCUMENT_CHARS
+
+
+class FakeOpenAI:
+    """chat.completions.create만 있는 OpenAI 비동기 클라이언트 대역 (fail_chunk번째 구간 메모 호출은 실패)"""
+
+    def __init__(self, result_json: str, fail_chunk: int = None):
+        self.result_json = result_json
+        self.fail_chunk = fail_chunk
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages, response_format=None, **kwargs):
+        if response_format is None:
+            # 구간 메모 요청 (JSON 출력 아님)
+            if self.fail_chunk is not None and f"({self.fail_chunk}/" in messages[1]["content"]:
+                raise RuntimeError("chunk failed")
+            content = "메모"
+        else:
+            content = self.result_json
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def long_document(monkeypatch):
+    monkeypatch.setattr(llm_analyzer, "LLM_LONG_DOCUMENT_MODE", True)
+    monkeypatch.setattr(llm_analyzer, "LLM_CHUNK_TOKENS", 4000)
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    paragraphs = [f"{i}번째 문단 " + "사업 내용 " * 300 for i in range(12)]
+    text = "\n\n".join(paragraphs)
+    assert len(text) > MAX_DOCUMENT_CHARS
+    return text
+
+
+def _analyze(monkeypatch, text: str, client: FakeOpenAI):
+    analyzer = LLMAnalyzer()
+    monkeypatch.setattr(analyzer, "_async_client", lambda: client)
+    events = []
+    with progress_reporter(events.append):
+        result = asyncio.run(analyzer.analyze_async(text, force_refresh=True))
+    return analyzer, result, events
+
+
+def _result_json() -> str:
+    return json.dumps(LLMAnalyzer()._get_mock_result().dict(), ensure_ascii=False)
+
+
+def test_long_document_map_reduce(monkeypatch, long_document):
+    analyzer, result, events = _analyze(monkeypatch, long_document, FakeOpenAI(_result_json()))
+
+    assert analyzer.reusable
+    chunk_events = [event for event in events if event.get("status") == "chunk"]
+    assert chunk_events
+    # 구간 진행은 페이지 번호(page/total)가 아닌 별도 필드로 보고
+    for event in chunk_events:
+        assert "page" not in event and "total" not in event
+        assert 1 <= event["chunk"] <= event["chunks"]
+    assert events[-1]["status"] == "reduce"
+
+
+def test_failed_chunk_marks_result_degraded(monkeypatch, long_document):
+    stored = []
+    original_set = llm_response_cache.set
+    monkeypatch.setattr(
+        llm_response_cache, "set", lambda key, result, *args: (stored.append(result), original_set(key, result, *args))
+    )
+
+    analyzer, result, _ = _analyze(monkeypatch, long_document, FakeOpenAI(_result_json(), fail_chunk=2))
+
+    assert result.companySummary
+    assert analyzer.degraded
+    assert not analyzer.reusable
+    # 성공한 구간 메모는 캐시하지만, 일부 구간이 빠진 최종 결과는 저장하지 않음
+    assert stored
+    assert all("notes" in entry for entry in stored)
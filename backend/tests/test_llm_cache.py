@@ -0,0 +1,58 @@
+import json
+import time
+import unicodedata
+
+from app.services.llm_cache import LLMResponseCache, llm_cache_key, normalize_prompt
+from app.services.page_cache import DiskLRUCache
+
+
+def test_normalize_prompt_ignores_whitespace_differences():
+    a = "회사 개요\n\n\n\n매출액   100억 \t\n"
+    b = "회사 개요\n\n매출액 100억"
+    assert normalize_prompt(a) == normalize_prompt(b)
+
+
+def test_normalize_prompt_applies_nfc():
+    decomposed = unicodedata.normalize("NFD", "한글")
+    assert decomposed != "한글"
+    assert normalize_prompt(decomposed) == "한글"
+
+
+def test_cache_key_depends_on_call_parameters():
+    key = llm_cache_key("prompt", "openai", "gpt-4o", 0.3)
+    assert key == llm_cache_key("prompt  ", "openai", "gpt-4o", 0.3)
+    assert key != llm_cache_key("other prompt", "openai", "gpt-4o", 0.3)
+    assert key != llm_cache_key("prompt", "anthropic", "gpt-4o", 0.3)
+    assert key != llm_cache_key("prompt", "openai", "gpt-4o-mini", 0.3)
+    assert key != llm_cache_key("prompt", "openai", "gpt-4o", 0.0)
+
+
+def test_response_cache_round_trip(tmp_path):
+    cache = LLMResponseCache(DiskLRUCache(str(tmp_path), 1024 * 1024, suffix=".json"), ttl_seconds=3600)
+    key = llm_cache_key("prompt", "openai", "gpt-4o", 0.3)
+    assert cache.get(key) is None
+
+    cache.set(key, {"companySummary": "요약"}, provider="openai", model="gpt-4o")
+    assert cache.get(key) == {"companySummary": "요약"}
+
+
+def test_response_cache_expires_entries(tmp_path):
+    disk = DiskLRUCache(str(tmp_path), 1024 * 1024, suffix=".json")
+    cache = LLMResponseCache(disk, ttl_seconds=60)
+    entry = {"created_at": time.time() - 120, "provider": "openai", "model": "gpt-4o", "result": {}}
+    disk.set("aa01", json.dumps(entry))
+
+    assert cache.get("aa01") is None
+    assert cache.stats()["expired"] == 1
+    # 만료된 항목은 조회 시 삭제됨
+    assert disk.get("aa01") is None
+
+
+def test_response_cache_drops_corrupt_entries(tmp_path):
+    disk = DiskLRUCache(str(tmp_path), 1024 * 1024, suffix=".json")
+    cache = LLMResponseCache(disk, ttl_seconds=0)
+    disk.set("aa01", "{not json")
+
+    assert cache.get("aa01") is None
+    assert disk.get("aa01") is None
+    assert cache.purge_expired() == 0
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.services import llm_client
+from app.services.executor import PoolSaturatedError
+from app.services.llm_client import AsyncLLMClients
+
+
+class FakeSDK:
+    """생성 인자를 기록하는 SDK 클라이언트 대역"""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+class HttpxRejectingSDK(FakeSDK):
+    """httpx 객체를 받지 않는 SDK 버전 대역"""
+
+    def __init__(self, **kwargs):
+        if "http_client" in kwargs:
+            raise TypeError("Invalid `http_client` argument")
+        super().__init__(**kwargs)
+
+
+def test_providers_share_one_http_pool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-anthropic")
+    monkeypatch.setattr(llm_client, "AsyncOpenAI", FakeSDK)
+    monkeypatch.setattr(llm_client, "AsyncAnthropic", FakeSDK)
+
+    async def main():
+        clients = AsyncLLMClients()
+        openai, anthropic = clients.openai(), clients.anthropic()
+        # 요청마다 새로 만들지 않고 같은 클라이언트, 같은 연결 풀을 사용
+        assert clients.openai() is openai
+        assert clients.anthropic() is anthropic
+        http = clients._http_client()
+        assert openai.kwargs["http_client"] is http
+        assert anthropic.kwargs["http_client"] is http
+        assert openai.kwargs["api_key"] == "test-openai"
+
+        await clients.aclose()
+        assert http.is_closed
+        assert clients.openai() is not openai
+
+    asyncio.run(main())
+
+
+def test_real_openai_client_uses_shared_pool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
+
+    async def main():
+        clients = AsyncLLMClients()
+        assert clients.openai()._client is clients._http_client()
+        await clients.aclose()
+
+    asyncio.run(main())
+
+
+def test_sdk_rejecting_httpx_falls_back_to_own_pool(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-anthropic")
+    monkeypatch.setattr(llm_client, "AsyncAnthropic", HttpxRejectingSDK)
+
+    clients = AsyncLLMClients()
+    anthropic = clients.anthropic()
+
+    assert "http_client" not in anthropic.kwargs
+    assert anthropic.kwargs["timeout"] == llm_client.LLM_TIMEOUT_SECONDS
+    assert clients.anthropic() is anthropic
+
+
+def test_missing_api_key_returns_none(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    clients = AsyncLLMClients()
+    assert clients.openai() is None
+    assert clients.anthropic() is None
+    assert clients._http is None
+
+
+def test_slots_limit_concurrency_and_reject_when_queue_is_full():
+    async def main():
+        clients = AsyncLLMClients(max_concurrency=2, max_waiting=1)
+        release = asyncio.Event()
+        running = []
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            running.append(1)
+            peak = max(peak, len(running))
+            await release.wait()
+            running.pop()
+            return "ok"
+
+        calls = [asyncio.create_task(clients.call(request)) for _ in range(3)]
+        while len(running) < 2 or clients.stats()["waiting"] < 1:
+            await asyncio.sleep(0)
+
+        # 동시 호출 2개 + 대기 1개가 차 있으면 다음 호출은 기다리지 않고 거절
+        with pytest.raises(PoolSaturatedError) as excinfo:
+            await clients.call(request)
+        assert excinfo.value.pool_name == "llm"
+
+        release.set()
+        assert await asyncio.gather(*calls) == ["ok", "ok", "ok"]
+        return peak, clients.stats()
+
+    peak, stats = asyncio.run(main())
+    assert peak == 2
+    assert stats["calls"] == 3
+    assert stats["rejected"] == 1
+    assert stats["failed"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+
+
+def test_timeout_releases_slot():
+    async def main():
+        # 대기 허용 수가 0이어도 빈 슬롯이 있으면 실행됨
+        clients = AsyncLLMClients(max_concurrency=1, max_waiting=0)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await clients.call(slow, timeout=0.01)
+
+        async def fast():
+            return "ok"
+
+        # 타임아웃된 호출의 슬롯이 반환되어 다음 호출이 바로 실행됨
+        assert await clients.call(fast) == "ok"
+        return clients.stats()
+
+    stats = asyncio.run(main())
+    assert stats["timeouts"] == 1
+    assert stats["failed"] == 1
+    assert stats["calls"] == 2
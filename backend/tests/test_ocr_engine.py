@@ -0,0 +1,144 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+
+from app.services import ocr_engine
+from app.services.ocr_engine import OCREngine, TOP_HALF, background_priority
+from app.services.progress import progress_reporter
+
+
+def _write_pdf(tmp_path, name: str, pages: int) -> str:
+    doc = fitz.open()
+    for index in range(pages):
+        doc.new_page().insert_text((72, 72), f"{name} page {index + 1}")
+    path = str(tmp_path / f"{name}.pdf")
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """워커 프로세스 대신 스레드 풀에서 실행하고, 렌더링/OCR은 기록만 하는 대역으로 바꾼 엔진"""
+    calls = []
+
+    def fake_ocr_page(file_path, page_index, zoom, clip, lang):
+        calls.append({"page_index": page_index, "zoom": zoom, "clip": clip, "lang": lang})
+        # 뒤 페이지가 먼저 끝나도록 해서 완료 순서와 결과 순서가 다르게 함
+        time.sleep(0.02 * (5 - page_index))
+        return f"OCR {page_index + 1}", 1.0, 2.0
+
+    monkeypatch.setattr(ocr_engine, "_ocr_page", fake_ocr_page)
+    engine = OCREngine(max_workers=4)
+    engine._executor = ThreadPoolExecutor(max_workers=4)
+    engine.calls = calls
+    yield engine
+    engine.shutdown()
+
+
+def test_results_follow_requested_page_order(engine, tmp_path):
+    path = _write_pdf(tmp_path, "order", 5)
+    events = []
+
+    with progress_reporter(events.append):
+        texts = engine.ocr_pages(path, [3, 0, 4], clip=TOP_HALF)
+
+    assert texts == ["OCR 4", "OCR 1", "OCR 5"]
+    assert sorted(call["page_index"] for call in engine.calls) == [0, 3, 4]
+    assert all(call["clip"] == TOP_HALF for call in engine.calls)
+    ocr_events = [event for event in events if event["stage"] == "ocr"]
+    assert sorted(event["page"] for event in ocr_events) == [1, 4, 5]
+    assert all(event["total"] == 3 for event in ocr_events)
+
+
+def test_all_pages_when_indices_omitted(engine, tmp_path):
+    path = _write_pdf(tmp_path, "all", 3)
+    assert engine.ocr_pages(path) == ["OCR 1", "OCR 2", "OCR 3"]
+    assert sorted(call["page_index"] for call in engine.calls) == [0, 1, 2]
+
+
+def test_cached_pages_are_not_submitted_again(engine, tmp_path):
+    path = _write_pdf(tmp_path, "cached", 3)
+    engine.ocr_pages(path, [0, 1])
+    engine.calls.clear()
+
+    # 캐시 키에 렌더링 파라미터가 들어가므로 같은 설정의 0, 1쪽만 캐시 적중
+    assert engine.ocr_pages(path, [0, 1, 2]) == ["OCR 1", "OCR 2", "OCR 3"]
+    assert [call["page_index"] for call in engine.calls] == [2]
+
+    engine.calls.clear()
+    engine.ocr_pages(path, [0], zoom=3.0)
+    assert [call["page_index"] for call in engine.calls] == [0]
+
+
+def test_failed_page_is_empty_and_not_cached(engine, tmp_path, monkeypatch):
+    path = _write_pdf(tmp_path, "failed", 2)
+    original = ocr_engine._ocr_page
+
+    def flaky(file_path, page_index, zoom, clip, lang):
+        if page_index == 1:
+            raise RuntimeError("tesseract crashed")
+        return original(file_path, page_index, zoom, clip, lang)
+
+    monkeypatch.setattr(ocr_engine, "_ocr_page", flaky)
+    assert engine.ocr_pages(path) == ["OCR 1", ""]
+
+    monkeypatch.setattr(ocr_engine, "_ocr_page", original)
+    engine.calls.clear()
+    assert engine.ocr_pages(path) == ["OCR 1", "OCR 2"]
+    assert [call["page_index"] for call in engine.calls] == [1]
+
+
+def test_background_priority_submits_pages_one_at_a_time(engine, tmp_path):
+    path = _write_pdf(tmp_path, "background", 3)
+    with background_priority():
+        assert engine.ocr_pages(path) == ["OCR 1", "OCR 2", "OCR 3"]
+    # 한 페이지씩 제출하므로 완료 순서가 페이지 순서와 같음
+    assert [call["page_index"] for call in engine.calls] == [0, 1, 2]
+
+
+@pytest.fixture
+def pytesseract_only(monkeypatch):
+    """tesserocr가 설치되지 않은 워커 상태를 만들고 pytesseract 호출을 기록"""
+    images = []
+
+    def fake_image_to_string(image, lang=None):
+        images.append((image.mode, image.size, lang))
+        return "pytesseract text"
+
+    monkeypatch.setattr(ocr_engine, "_tesserocr_failed", False)
+    monkeypatch.setattr(ocr_engine, "_tess_apis", {})
+    monkeypatch.setitem(sys.modules, "tesserocr", None)  # import tesserocr → ImportError
+    monkeypatch.setattr(ocr_engine.pytesseract, "image_to_string", fake_image_to_string)
+    return images
+
+
+def test_recognize_falls_back_to_pytesseract_without_tesserocr(pytesseract_only):
+    samples = bytes(4 * 3)
+    text = ocr_engine._recognize(memoryview(samples), 4, 3, 1, 4, "kor+eng", 144)
+
+    assert text == "pytesseract text"
+    assert pytesseract_only == [("L", (4, 3), "kor+eng")]
+    # 한 번 실패하면 이후 페이지는 tesserocr를 다시 시도하지 않음
+    assert ocr_engine._tesserocr_failed
+    assert ocr_engine._get_tess_api("kor+eng") is None
+
+
+def test_recognize_retries_with_pytesseract_when_api_fails(pytesseract_only, monkeypatch):
+    class FailingAPI:
+        cleared = False
+
+        def SetImageBytes(self, *args):
+            raise RuntimeError("bad image")
+
+        def Clear(self):
+            self.cleared = True
+
+    api = FailingAPI()
+    monkeypatch.setitem(ocr_engine._tess_apis, "eng", api)
+
+    assert ocr_engine._recognize(bytes(3 * 2 * 3), 2, 3, 3, 6, "eng", 144) == "pytesseract text"
+    assert pytesseract_only == [("RGB", (2, 3), "eng")]
+    assert api.cleared
@@ -0,0 +1,187 @@
+import os
+import time
+
+import fitz
+
+from app.services.page_cache import DiskLRUCache, _object_hash, page_cache_key, page_content_hash
+
+
+def _make_pdf(text: str = "hello", fontbuffer: bytes = None) -> "fitz.Document":
+    doc = fitz.open()
+    page = doc.new_page()
+    if fontbuffer is not None:
+        page.insert_font(fontname="F0", fontbuffer=fontbuffer)
+        page.insert_text((72, 72), text, fontname="F0")
+    else:
+        page.insert_text((72, 72), text)
+    return doc
+
+
+def _font_program_xrefs(doc: "fitz.Document"):
+    for xref in range(1, doc.xref_length()):
+        for key in ("FontFile", "FontFile2", "FontFile3"):
+            kind, value = doc.xref_get_key(xref, key)
+            if kind == "xref":
+                yield int(value.split()[0])
+
+
+def _reopen(doc: "fitz.Document", **save_options) -> "fitz.Document":
+    return fitz.open(stream=doc.tobytes(**save_options), filetype="pdf")
+
+
+def test_page_hash_is_stable_across_documents():
+    a = _make_pdf("hello")
+    b = _make_pdf("hello")
+    assert page_content_hash(a, a[0]) == page_content_hash(b, b[0])
+
+
+def test_page_hash_ignores_xref_numbering():
+    doc = _make_pdf("hello", fontbuffer=fitz.Font("tiro").buffer)
+    # 빈 페이지를 앞에 넣고 저장하면 같은 내용의 객체가 다른 xref 번호를 가짐
+    shifted = fitz.open()
+    shifted.new_page()
+    shifted.insert_pdf(doc)
+    shifted = _reopen(shifted, garbage=4)
+    shifted_page = shifted[1]
+    assert page_content_hash(doc, doc[0]) == page_content_hash(shifted, shifted_page)
+
+
+def test_page_hash_changes_with_text():
+    a = _make_pdf("hello")
+    b = _make_pdf("world")
+    assert page_content_hash(a, a[0]) != page_content_hash(b, b[0])
+
+
+def test_page_hash_includes_font_program():
+    a = _make_pdf("hello", fontbuffer=fitz.Font("tiro").buffer)
+    b = _make_pdf("hello", fontbuffer=fitz.Font("tiro").buffer)
+    assert page_content_hash(a, a[0]) == page_content_hash(b, b[0])
+
+    # 폰트 사전과 이름은 그대로 두고 내장 글꼴 프로그램만 바꿈
+    (font_file,) = _font_program_xrefs(b)
+    b.update_stream(font_file, b.xref_stream(font_file) + b"\0")
+    assert page_content_hash(a, a[0]) != page_content_hash(b, b[0])
+
+
+def test_page_hash_includes_nested_xobject_resources():
+    def with_form(text: str) -> "fitz.Document":
+        inner = _make_pdf(text)
+        outer = fitz.open()
+        page = outer.new_page()
+        page.show_pdf_page(page.rect, inner, 0)
+        return outer
+
+    a = with_form("hello")
+    b = with_form("world")
+    # 바깥 페이지의 콘텐츠 스트림은 폼 XObject를 그리는 명령뿐이라 같음
+    assert a[0].read_contents() == b[0].read_contents()
+    assert page_content_hash(a, a[0]) != page_content_hash(b, b[0])
+
+
+def _cyclic_objects() -> tuple:
+    """서로 참조하는 객체 두 개 (A → B → A)"""
+    doc = fitz.open()
+    doc.new_page()
+    a, b = doc.get_new_xref(), doc.get_new_xref()
+    doc.update_object(a, f"<< /Name /A /Next {b} 0 R >>")
+    doc.update_object(b, f"<< /Name /B /Next {a} 0 R >>")
+    return doc, a, b
+
+
+def test_object_hash_does_not_depend_on_traversal_order():
+    doc, a, b = _cyclic_objects()
+    expected = {a: _object_hash(doc, a, {}), b: _object_hash(doc, b, {})}
+
+    for order in ((a, b), (b, a)):
+        memo = {}
+        for xref in order:
+            assert _object_hash(doc, xref, memo) == expected[xref]
+        # 순환 참조 자리표시자로 계산한 해시는 저장하지 않음
+        assert a not in memo and b not in memo
+
+
+def test_object_hash_ignores_parent_back_reference():
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    first, second = doc.page_xref(0), doc.page_xref(1)
+    shared = doc.get_new_xref()
+    doc.update_object(shared, f"<< /Type /Annot /Subtype /Text /P {first} 0 R >>")
+    memo = {}
+    before = _object_hash(doc, shared, memo)
+    assert memo  # 역참조를 따라가지 않으므로 순환 없이 계산되어 저장됨
+
+    doc.update_object(shared, f"<< /Type /Annot /Subtype /Text /P {second} 0 R >>")
+    assert _object_hash(doc, shared, {}) == before
+
+
+def test_page_cache_key_depends_on_render_params():
+    base = page_cache_key("abc", 2.0, None, "kor+eng")
+    assert base == page_cache_key("abc", 2.0, None, "kor+eng")
+    assert base != page_cache_key("abc", 3.0, None, "kor+eng")
+    assert base != page_cache_key("abc", 2.0, (0, 0, 1, 0.5), "kor+eng")
+    assert base != page_cache_key("abc", 2.0, None, "eng")
+
+
+def test_disk_cache_get_set_and_stats(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    assert cache.get("aa01") is None
+    cache.set("aa01", "페이지 텍스트")
+    assert cache.get("aa01") == "페이지 텍스트"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size_bytes"] == len("페이지 텍스트".encode("utf-8"))
+
+    assert cache.delete("aa01")
+    assert not cache.delete("aa01")
+    assert cache.get("aa01") is None
+
+
+def test_disk_cache_overwrite_keeps_size_accurate(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    cache.set("aa01", "x" * 100)
+    for _ in range(5):
+        cache.set("aa01", "x" * 100)
+    assert cache.stats()["size_bytes"] == 100
+
+    cache.set("aa01", "x" * 40)
+    assert cache.stats()["size_bytes"] == 40
+    assert cache.stats()["size_bytes"] == cache._scan_size()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=250)
+    now = time.time()
+    for i, key in enumerate(["aa01", "bb02"]):
+        cache.set(key, "x" * 100)
+        # 파일 수정 시각을 최근 사용 시각으로 쓰므로 순서를 명시
+        os.utime(cache._path(key), (now - 100 + i, now - 100 + i))
+    # aa01을 가장 최근에 사용
+    assert cache.get("aa01") is not None
+
+    cache.set("dd04", "x" * 100)
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("dd04") is not None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_disk_cache_purge_older_than(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024 * 1024)
+    cache.set("aa01", "old")
+    cache.set("bb02", "new")
+    old = time.time() - 3600
+    os.utime(cache._path("aa01"), (old, old))
+
+    assert cache.purge_older_than(60) == 1
+    assert cache.get("aa01") is None
+    assert cache.get("bb02") == "new"
+
+
+def test_disabled_cache_is_noop(tmp_path):
+    cache = DiskLRUCache(str(tmp_path / "off"), max_bytes=0)
+    cache.set("aa01", "value")
+    assert cache.get("aa01") is None
+    assert not os.path.exists(tmp_path / "off")
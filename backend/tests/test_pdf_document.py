@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import fitz
+import pytest
+
+from app.services.executor import run_in_pool
+from app.services.pdf_document import (
+    PDFDocument,
+    _acquire_mapping,
+    _scoped_documents,
+    acquire_pdf,
+    pdf_document_scope,
+    pdf_mapping_stats,
+)
+
+
+def _write_pdf(tmp_path, text: str = "hello") -> str:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    path = str(tmp_path / "doc.pdf")
+    doc.save(path)
+    return path
+
+
+def test_scope_shares_handle_and_closes_on_exit(tmp_path):
+    path = _write_pdf(tmp_path)
+    with pdf_document_scope():
+        with acquire_pdf(path) as first, acquire_pdf(path) as second:
+            assert first is second
+            assert "hello" in first.page_text(0)
+    assert first._mapping is None
+    assert first._plumber_pdf is None
+
+
+def test_cancelled_scope_keeps_handle_open_for_pool_work(tmp_path):
+    path = _write_pdf(tmp_path)
+    started, resume, done = threading.Event(), threading.Event(), threading.Event()
+    seen = {}
+
+    def work():
+        with acquire_pdf(path) as pdf:
+            seen["pdf"] = pdf
+            started.set()
+            resume.wait(5)
+            # 요청이 취소된 뒤에도 핸들을 계속 사용할 수 있어야 함
+            seen["text"] = pdf.page_text(0)
+            seen["open_after_cancel"] = pdf._mapping is not None
+        done.set()
+
+    async def request():
+        with pdf_document_scope():
+            await run_in_pool("ocr", work)
+
+    async def main():
+        task = asyncio.create_task(request())
+        assert await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        resume.set()
+        assert await asyncio.to_thread(done.wait, 5)
+
+    asyncio.run(main())
+
+    assert "hello" in seen["text"]
+    assert seen["open_after_cancel"]
+    # 마지막 사용이 끝나면 닫힘
+    assert seen["pdf"]._mapping is None
+
+
+def test_acquire_after_scope_closed_uses_private_handle(tmp_path):
+    path = _write_pdf(tmp_path)
+    scopes = []
+
+    with pdf_document_scope():
+        scopes.append(_scoped_documents.get())
+
+    token = _scoped_documents.set(scopes[0])
+    try:
+        with acquire_pdf(path) as pdf:
+            assert "hello" in pdf.page_text(0)
+        assert pdf._mapping is None
+        assert scopes[0].documents == {}
+    finally:
+        _scoped_documents.reset(token)
+
+
+def test_handles_share_one_mapping_until_last_release(tmp_path):
+    path = _write_pdf(tmp_path)
+    before = pdf_mapping_stats()
+
+    first = PDFDocument(path)
+    second = PDFDocument(path)
+    mapping = first._mapping
+    assert mapping is not None
+    assert second._mapping is mapping
+    assert mapping.refs == 2
+    stats = pdf_mapping_stats()
+    assert stats["mapped"] == before["mapped"] + 1
+    assert stats["shared"] == before["shared"] + 1
+
+    first.close()
+    assert mapping.refs == 1
+    assert not mapping.buffer.closed
+    assert "hello" in second.page_text(0)
+
+    second.close()
+    assert mapping.refs == 0
+    assert mapping.buffer.closed
+    assert all(document["path"] != mapping.path for document in pdf_mapping_stats()["documents"])
+
+
+def test_release_mapping_and_fitz_stats_under_threads(tmp_path):
+    path = _write_pdf(tmp_path)
+    before = pdf_mapping_stats()["fitz_stream"]
+    documents = [PDFDocument(path) for _ in range(8)]
+    mapping = documents[0]._mapping
+
+    threads = [threading.Thread(target=lambda d=d: (d.page_count, d.close())) for d in documents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pdf_mapping_stats()["fitz_stream"] == before + len(documents)
+    assert mapping.refs == 0
+    assert mapping.buffer.closed
+
+
+def test_empty_file_is_not_mapped(tmp_path):
+    path = tmp_path / "empty.pdf"
+    path.write_bytes(b"")
+    assert _acquire_mapping(str(path)) is None
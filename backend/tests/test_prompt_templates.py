@@ -0,0 +1,41 @@
+from app.services.prompt_templates import (
+    MAX_DOCUMENT_CHARS,
+    format_chunk_notes,
+    get_analysis_prompt_parts,
+    get_chunk_prompt_parts,
+    get_reduce_prompt_parts,
+)
+
+
+def test_system_part_is_identical_across_documents():
+    a = get_analysis_prompt_parts("첫 번째 문서")
+    b = get_analysis_prompt_parts("두 번째 문서")
+    # 고정 부분이 같아야 provider 프롬프트 캐시에 적중
+    assert a.system == b.system
+    assert "첫 번째 문서" in a.user
+    assert "첫 번째 문서" not in a.system
+
+
+def test_prompt_text_joins_both_parts():
+    parts = get_analysis_prompt_parts("본문")
+    assert parts.text == f"{parts.system}\n{parts.user}"
+
+
+def test_document_text_is_truncated():
+    parts = get_analysis_prompt_parts("가" * (MAX_DOCUMENT_CHARS + 100))
+    assert parts.user.count("가") == MAX_DOCUMENT_CHARS
+
+
+def test_reduce_prompt_reuses_analysis_system_part():
+    reduce = get_reduce_prompt_parts(["메모 1", "메모 2"])
+    assert reduce.system == get_analysis_prompt_parts("").system
+    assert "[구간 1/2]\n메모 1" in reduce.user
+    assert "[구간 2/2]\n메모 2" in reduce.user
+
+
+def test_chunk_prompt_parts():
+    parts = get_chunk_prompt_parts("구간 본문", 2, 5, 800)
+    assert "구간 본문" in parts.user
+    assert "구간 본문" not in parts.system
+    assert get_chunk_prompt_parts("다른 본문", 1, 5, 800).system == parts.system
+    assert format_chunk_notes([" a ", "b"]) == "[구간 1/2]\na\n\n[구간 2/2]\nb"
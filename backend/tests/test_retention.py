@@ -0,0 +1,92 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+from app.services import retention
+from app.services.retention import RetentionManager, upload_ttl_seconds, DAY_SECONDS
+from app.services.storage import LocalStorage
+from app.services.upload_index import UploadIndex
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    idx = UploadIndex(str(tmp_path / "index.sqlite3"), LocalStorage(str(tmp_path / "uploads")))
+    monkeypatch.setattr(retention, "upload_index", idx)
+    monkeypatch.setattr(retention.job_manager, "active_file_ids", lambda: set())
+    monkeypatch.setattr(retention, "RETENTION_MIN_IDLE_SECONDS", 60)
+    monkeypatch.setattr(retention, "RETENTION_UPLOAD_QUOTA_BYTES", 0)
+    yield idx
+    idx.close()
+
+
+def _upload(index: UploadIndex, content: bytes, idle_seconds: float, doc_kind: str = None):
+    sha256 = hashlib.sha256(content).hexdigest()
+    temp_path = os.path.join(index.storage.staging_dir, f"{sha256}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    file_id, path, _, ref_id = index.register_upload(temp_path, sha256, ".pdf", len(content))
+    if doc_kind:
+        index.update_metadata(file_id, doc_kind=doc_kind)
+    index._connect().execute(
+        "UPDATE files SET last_accessed_at = ? WHERE file_id = ?", (time.time() - idle_seconds, file_id)
+    )
+    return file_id, ref_id
+
+
+def test_upload_ttl_per_document_kind(monkeypatch):
+    monkeypatch.setattr(retention, "RETENTION_UPLOAD_TTL_DAYS", 30)
+    monkeypatch.setenv("RETENTION_UPLOAD_TTL_DAYS_FINANCIAL_STATEMENT", "90")
+    assert upload_ttl_seconds(None) == 30 * DAY_SECONDS
+    assert upload_ttl_seconds("shareholder") == 30 * DAY_SECONDS
+    assert upload_ttl_seconds("financial-statement") == 90 * DAY_SECONDS
+
+
+def test_ttl_evicts_only_expired_uploads(index, monkeypatch):
+    monkeypatch.setenv("RETENTION_UPLOAD_TTL_DAYS_FINANCIAL_STATEMENT", "90")
+    expired, _ = _upload(index, b"expired", idle_seconds=40 * DAY_SECONDS)
+    fresh, _ = _upload(index, b"fresh", idle_seconds=DAY_SECONDS)
+    kept_by_kind, _ = _upload(index, b"kind", idle_seconds=40 * DAY_SECONDS, doc_kind="financial-statement")
+
+    summary = RetentionManager(interval_seconds=0).run_once()
+
+    assert summary["upload_ttl"] == 1
+    assert index.get(expired) is None
+    assert index.get(fresh) is not None
+    assert index.get(kept_by_kind) is not None
+
+
+def test_ttl_skips_files_in_use(index, monkeypatch):
+    busy, _ = _upload(index, b"busy", idle_seconds=40 * DAY_SECONDS)
+    monkeypatch.setattr(retention.job_manager, "active_file_ids", lambda: {busy})
+
+    assert RetentionManager(interval_seconds=0).run_once()["upload_ttl"] == 0
+    assert index.get(busy) is not None
+
+
+def test_quota_evicts_unreferenced_files_first(index, monkeypatch):
+    monkeypatch.setattr(retention, "RETENTION_UPLOAD_QUOTA_BYTES", 250)
+    # 가장 오래전에 사용했지만 참조가 남은 파일
+    referenced, _ = _upload(index, b"r" * 100, idle_seconds=3 * 3600)
+    unreferenced, _ = _upload(index, b"u" * 100, idle_seconds=2 * 3600)
+    index._connect().execute("UPDATE files SET ref_count = 0 WHERE file_id = ?", (unreferenced,))
+    newer, _ = _upload(index, b"n" * 100, idle_seconds=3600)
+
+    summary = RetentionManager(interval_seconds=0).run_once()
+
+    assert summary["upload_quota"] == 1
+    assert summary["freed_bytes"] == 100
+    assert index.get(unreferenced) is None
+    assert index.get(referenced) is not None
+    assert index.get(newer) is not None
+
+
+def test_quota_keeps_recently_used_files(index, monkeypatch):
+    monkeypatch.setattr(retention, "RETENTION_UPLOAD_QUOTA_BYTES", 150)
+    first, _ = _upload(index, b"a" * 100, idle_seconds=10)
+    second, _ = _upload(index, b"b" * 100, idle_seconds=10)
+
+    assert RetentionManager(interval_seconds=0).run_once()["upload_quota"] == 0
+    assert index.get(first) is not None
+    assert index.get(second) is not None
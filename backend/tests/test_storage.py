@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from app.services.storage import LocalStorage, StorageBackend, storage_key
+
+
+def _temp_file(backend: StorageBackend, content: bytes) -> str:
+    path = os.path.join(backend.staging_dir, f"{os.urandom(4).hex()}.tmp")
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend("unused")
+
+
+def test_local_store_fetch_and_remove(tmp_path):
+    backend = LocalStorage(str(tmp_path))
+    key = storage_key("abc", ".pdf")
+    assert key == "abc.pdf"
+    assert backend.fetch(key) is None
+    assert not backend.exists(key)
+
+    temp_path = _temp_file(backend, b"%PDF-1.4")
+    path = backend.store(temp_path, key)
+
+    assert not os.path.exists(temp_path)
+    assert path == backend.local_path(key)
+    assert backend.fetch(key) == path
+    assert backend.exists(key)
+
+    backend.remove_local(key)
+    assert not backend.exists(key)
+    # 이미 없는 파일을 지워도 오류 없음
+    backend.remove_local(key)
+    assert backend.trim() == 0
+
+
+@pytest.fixture
+def s3_storage(tmp_path):
+    pytest.importorskip("boto3")
+    from botocore.stub import Stubber
+    from app.services.storage import S3Storage
+
+    backend = S3Storage(bucket="uploads", region="us-east-1", spill_dir=str(tmp_path), spill_max_bytes=150)
+    # 예상 응답을 등록하지 않으므로 버킷 API를 호출하면 실패함
+    with Stubber(backend._client):
+        yield backend
+
+
+def test_s3_remove_local_keeps_bucket_object(s3_storage):
+    path = s3_storage.local_path("abc.pdf")
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4")
+
+    assert s3_storage.exists("abc.pdf")
+    assert s3_storage.fetch("abc.pdf") == path
+    s3_storage.remove_local("abc.pdf")
+    assert not os.path.exists(path)
+
+
+def test_s3_trim_removes_idle_spill_files_first(s3_storage):
+    now = time.time()
+    for key in ["old.pdf", "older.pdf", "recent.pdf"]:
+        path = s3_storage.local_path(key)
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+    os.utime(s3_storage.local_path("older.pdf"), (now - 7200, now - 7200))
+    os.utime(s3_storage.local_path("old.pdf"), (now - 3600, now - 3600))
+
+    assert s3_storage.trim() == 2
+    assert sorted(os.listdir(s3_storage.spill_dir)) == ["recent.pdf"]
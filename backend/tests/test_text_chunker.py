@@ -0,0 +1,39 @@
+from app.services.text_chunker import chunk_text, estimate_tokens
+
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("매출액") == 3
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("매출 100") == 2 + 1
+
+
+def test_short_text_is_single_chunk():
+    assert chunk_text("회사 개요\n\n사업 내용", 100) == ["회사 개요\n\n사업 내용"]
+
+
+def test_chunks_split_on_paragraphs_and_keep_order():
+    paragraphs = [f"{i}번 문단 " + "가" * 30 for i in range(10)]
+    chunks = chunk_text("\n\n".join(paragraphs), 80)
+
+    assert len(chunks) > 1
+    assert "\n\n".join(chunks) == "\n\n".join(paragraphs)
+    for chunk in chunks:
+        assert estimate_tokens(chunk) <= 80
+
+
+def test_oversized_paragraph_splits_on_lines_then_characters():
+    lines = ["표 " + "나" * 20 for _ in range(10)] + ["다" * 250]
+    chunks = chunk_text("\n".join(lines), 50)
+
+    for chunk in chunks:
+        assert estimate_tokens(chunk) <= 50
+    # 줄은 중간에 잘리지 않고, 예산보다 긴 줄만 글자 단위로 잘림
+    assert chunks[0].split("\n")[0] == lines[0]
+    assert "".join(chunks).count("다") == 250
+
+
+def test_blank_paragraphs_are_dropped():
+    assert chunk_text("\n\n  \n\n본문\n\n\n", 10) == ["본문"]
+    assert chunk_text("", 10) == []
@@ -0,0 +1,78 @@
+import hashlib
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import upload
+
+
+def _text(label: str) -> bytes:
+    # 다른 테스트의 업로드와 중복 제거되지 않도록 고유한 내용 사용
+    return f"배치 업로드 테스트 {label} {uuid.uuid4().hex}".encode("utf-8")
+
+
+def test_batch_reports_per_file_results_in_request_order(monkeypatch):
+    monkeypatch.setattr(upload, "MAX_FILE_SIZE", 1024)
+    original_register = upload._register_in_storage
+
+    def register(stored, file_ext, filename):
+        if filename == "broken.txt":
+            raise RuntimeError("storage unavailable")
+        return original_register(stored, file_ext, filename)
+
+    monkeypatch.setattr(upload, "_register_in_storage", register)
+    ok = _text("ok")
+    client = TestClient(app)
+
+    response = client.post("/api/upload/batch", files=[
+        ("files", ("ok.txt", ok, "text/plain")),
+        ("files", ("program.exe", b"MZ\x90\x00", "application/octet-stream")),
+        ("files", ("image.txt", b"\x89PNG\r\n\x1a\n" + b"\x00" * 16, "text/plain")),
+        ("files", ("big.txt", b"a" * 1025, "text/plain")),
+        ("files", ("broken.txt", _text("broken"), "text/plain")),
+        ("files", ("copy.txt", ok, "text/plain")),
+    ])
+
+    # 일부 파일이 실패해도 요청 자체는 성공
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 2
+    assert body["failed"] == 4
+
+    files = body["files"]
+    assert [item["filename"] for item in files] == [
+        "ok.txt", "program.exe", "image.txt", "big.txt", "broken.txt", "copy.txt"
+    ]
+    assert [item["status_code"] for item in files] == [200, 400, 400, 413, 500, 200]
+
+    first, unsupported, mismatch, too_large, broken, copy = files
+    assert first["error"] is None
+    assert first["file_id"] == hashlib.sha256(ok).hexdigest()
+    assert first["sha256"] == first["file_id"]
+    assert first["file_size"] == len(ok)
+    assert first["ref_id"]
+    for failed in (unsupported, mismatch, too_large, broken):
+        assert failed["error"]
+        assert failed["file_id"] is None
+    assert "지원하지 않는 파일 형식" in unsupported["error"]
+    assert "일치하지 않습니다" in mismatch["error"]
+    assert "파일 크기가 너무 큽니다" in too_large["error"]
+    # 예기치 않은 오류는 내부 메시지를 노출하지 않음
+    assert broken["error"] == "파일 업로드 중 오류가 발생했습니다."
+
+    # 같은 내용은 같은 file_id로 중복 제거되고 참조는 따로 발급 (동시에 저장하므로 어느 쪽이 먼저인지는 정해지지 않음)
+    assert copy["file_id"] == first["file_id"]
+    assert sorted([first["deduplicated"], copy["deduplicated"]]) == [False, True]
+    assert copy["ref_id"] != first["ref_id"]
+
+
+def test_batch_rejects_too_many_files(monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_BATCH_MAX_FILES", 2)
+    client = TestClient(app)
+    files = [("files", (f"doc{i}.txt", _text(str(i)), "text/plain")) for i in range(3)]
+
+    response = client.post("/api/upload/batch", files=files)
+
+    assert response.status_code == 400
+    assert "최대 2개" in response.json()["detail"]
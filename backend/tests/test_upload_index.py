@@ -0,0 +1,129 @@
+import hashlib
+import os
+
+import pytest
+
+from app.services.page_cache import page_text_cache
+from app.services.storage import LocalStorage
+from app.services.upload_index import UploadIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = UploadIndex(str(tmp_path / "index.sqlite3"), LocalStorage(str(tmp_path / "uploads")))
+    yield idx
+    idx.close()
+
+
+def _upload(index: UploadIndex, content: bytes, ext: str = ".pdf"):
+    sha256 = hashlib.sha256(content).hexdigest()
+    temp_path = os.path.join(index.storage.staging_dir, f"{sha256[:8]}-{os.urandom(4).hex()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    return index.register_upload(temp_path, sha256, ext, len(content), filename="doc.pdf")
+
+
+def test_same_content_is_deduplicated(index):
+    file_id, path, duplicate, first_ref = _upload(index, b"%PDF-1.4 same")
+    again_id, again_path, again_duplicate, second_ref = _upload(index, b"%PDF-1.4 same")
+
+    assert not duplicate
+    assert again_duplicate
+    assert (again_id, again_path) == (file_id, path)
+    assert first_ref != second_ref
+    assert index.get(file_id).ref_count == 2
+    # 중복 업로드의 임시 파일은 삭제되고 저장 파일 하나만 남음
+    assert os.listdir(index.storage.root) == [os.path.basename(path)]
+
+
+def test_concurrent_same_content_reports_one_new_upload(index, monkeypatch):
+    content = b"%PDF-1.4 concurrent"
+    sha256 = hashlib.sha256(content).hexdigest()
+    # 두 업로드가 모두 "아직 없음"을 본 뒤에 등록하는 경합 재현
+    monkeypatch.setattr(index, "get", lambda file_id: None)
+
+    first = _upload(index, content)
+    second = _upload(index, content)
+
+    assert (first[0], first[1]) == (second[0], second[1]) == (sha256, first[1])
+    assert [first[2], second[2]] == [False, True]
+    assert first[3] != second[3]
+    monkeypatch.undo()
+    assert index.get(sha256).ref_count == 2
+
+
+def test_release_requires_matching_token(index):
+    file_id, path, _, ref_id = _upload(index, b"%PDF-1.4 token")
+    other_id, _, _, other_ref = _upload(index, b"%PDF-1.4 other")
+
+    assert index.release(file_id, "unknown") is None
+    # 다른 파일의 토큰으로는 해제할 수 없음
+    assert index.release(file_id, other_ref) is None
+    assert index.get(file_id).ref_count == 1
+    assert os.path.exists(path)
+
+
+def test_release_deletes_file_when_last_reference_is_gone(index):
+    file_id, path, _, first_ref = _upload(index, b"%PDF-1.4 refs")
+    _, _, _, second_ref = _upload(index, b"%PDF-1.4 refs")
+    index.put_result(file_id, "shareholder", {"shareholders": []})
+
+    assert index.release(file_id, first_ref) == 1
+    # 같은 토큰은 한 번만 해제됨
+    assert index.release(file_id, first_ref) is None
+    assert os.path.exists(path)
+
+    assert index.release(file_id, second_ref) == 0
+    assert index.get(file_id) is None
+    assert index.get_result(file_id, "shareholder") is None
+    assert not os.path.exists(path)
+
+
+def test_evict_only_unreferenced_keeps_referenced_file(index):
+    file_id, path, _, _ = _upload(index, b"%PDF-1.4 keep")
+
+    assert index.evict(file_id, only_unreferenced=True) == 0
+    assert os.path.exists(path)
+
+    assert index.evict(file_id) == len(b"%PDF-1.4 keep")
+    assert index.get(file_id) is None
+    assert not os.path.exists(path)
+
+
+def test_evict_removes_only_orphaned_artifacts(index):
+    first_id, first_path, _, _ = _upload(index, b"%PDF-1.4 first")
+    _, second_path, _, _ = _upload(index, b"%PDF-1.4 second")
+    page_text_cache.set("aa-shared", "공유 페이지")
+    page_text_cache.set("bb-private", "첫 파일 페이지")
+    index.add_artifacts(first_path, "page_text", ["aa-shared", "bb-private"])
+    index.add_artifacts(second_path, "page_text", ["aa-shared"])
+
+    index.evict(first_id)
+
+    assert page_text_cache.get("bb-private") is None
+    assert page_text_cache.get("aa-shared") == "공유 페이지"
+    assert index.usage()["artifacts"] == 1
+
+
+def test_results_are_stored_per_kind(index):
+    file_id, _, _, _ = _upload(index, b"%PDF-1.4 results")
+    index.put_result(file_id, "financial-statement", {"pages": [], "revenue": "100"})
+
+    assert index.get_result(file_id, "financial-statement") == {"pages": [], "revenue": "100"}
+    assert index.get_result(file_id, "shareholder") is None
+    # 인덱스에 없는 파일의 결과는 저장하지 않음
+    index.put_result("missing", "shareholder", {"shareholders": []})
+    assert index.get_result("missing", "shareholder") is None
+
+
+def test_resolve_registers_legacy_upload_without_references(index):
+    legacy_path = os.path.join(index.storage.root, "legacy-upload.pdf")
+    with open(legacy_path, "wb") as f:
+        f.write(b"%PDF-1.4 legacy")
+
+    record = index.resolve("legacy-upload")
+
+    assert record is not None
+    assert record.path == legacy_path
+    assert record.ref_count == 0
+    assert index.resolve("../legacy-upload") is None
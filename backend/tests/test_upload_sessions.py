@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+
+import fitz
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import upload
+from app.services.upload_sessions import UploadSession, UploadSessionError, UploadSessionStore
+from app.services.upload_stream import UploadTooLargeError
+
+
+def _session(received):
+    return UploadSession("id", "doc.pdf", ".pdf", 10, 0.0, 0.0, received=[list(r) for r in received])
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_add_range_merges_overlapping_and_adjacent_ranges():
+    session = _session([])
+    session.add_range(6, 10)
+    session.add_range(0, 2)
+    assert session.received == [[0, 2], [6, 10]]
+    session.add_range(2, 4)
+    assert session.received == [[0, 4], [6, 10]]
+    session.add_range(3, 7)
+    assert session.received == [[0, 10]]
+    assert session.complete
+
+
+def test_remove_range_splits_received_ranges():
+    session = _session([[0, 10]])
+    session.remove_range(2, 6)
+    assert session.received == [[0, 2], [6, 10]]
+    session.remove_range(0, 3)
+    assert session.received == [[6, 10]]
+    session.remove_range(0, 10)
+    assert session.received == []
+    assert session.received_bytes == 0
+
+
+def test_create_rejects_oversized_upload(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    with pytest.raises(UploadTooLargeError):
+        store.create("doc.pdf", ".pdf", 11, max_bytes=10)
+
+
+def test_write_range_out_of_order(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    session = store.create("doc.pdf", ".pdf", 10, max_bytes=100)
+
+    asyncio.run(store.write_range(session.session_id, 6, 10, _chunks(b"6789")))
+    session = asyncio.run(store.write_range(session.session_id, 0, 6, _chunks(b"012", b"345")))
+
+    assert session.complete
+    with open(store.data_path(session), "rb") as f:
+        assert f.read() == b"0123456789"
+
+
+def test_failed_rewrite_unmarks_range(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    session = store.create("doc.pdf", ".pdf", 10, max_bytes=100)
+    asyncio.run(store.write_range(session.session_id, 0, 10, _chunks(b"0123456789")))
+
+    # 이미 받은 범위를 다시 보내다가 본문이 짧게 끊김
+    with pytest.raises(UploadSessionError):
+        asyncio.run(store.write_range(session.session_id, 2, 6, _chunks(b"ab")))
+
+    session = store.get(session.session_id)
+    assert session.received == [[0, 2], [6, 10]]
+    assert not session.complete
+
+
+def test_write_range_rejects_invalid_range(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    session = store.create("doc.pdf", ".pdf", 10, max_bytes=100)
+    with pytest.raises(UploadSessionError):
+        asyncio.run(store.write_range(session.session_id, 4, 11, _chunks(b"x" * 7)))
+    with pytest.raises(UploadSessionError):
+        asyncio.run(store.write_range(session.session_id, 0, 4, _chunks(b"toolong")))
+
+
+def test_purge_expired_removes_stale_sessions(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    stale = store.create("old.pdf", ".pdf", 4, max_bytes=100)
+    fresh = store.create("new.pdf", ".pdf", 4, max_bytes=100)
+    stale.updated_at = 0.0
+    store._save(stale)
+
+    assert store.purge_expired() == 1
+    assert store.get(stale.session_id) is None
+    assert store.get(fresh.session_id) is not None
+
+
+def _pdf_bytes() -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "resumable upload")
+    return doc.tobytes()
+
+
+def _put(client, session_id, content, start, end):
+    return client.put(
+        f"/api/upload/sessions/{session_id}",
+        content=content[start:end],
+        headers={"Content-Range": f"bytes {start}-{end - 1}/{len(content)}"},
+    )
+
+
+def test_session_finalize_registers_upload():
+    client = TestClient(app)
+    content = _pdf_bytes()
+    sha256 = hashlib.sha256(content).hexdigest()
+    created = client.post("/api/upload/sessions", json={"filename": "doc.pdf", "size": len(content), "sha256": sha256})
+    assert created.status_code == 201
+    session_id = created.json()["session_id"]
+    middle = len(content) // 2
+
+    assert _put(client, session_id, content, middle, len(content)).status_code == 200
+    incomplete = client.post(f"/api/upload/sessions/{session_id}/finalize")
+    assert incomplete.status_code == 409
+
+    assert _put(client, session_id, content, 0, middle).json()["complete"]
+    finalized = client.post(f"/api/upload/sessions/{session_id}/finalize")
+    assert finalized.status_code == 200
+    body = finalized.json()
+    assert body["file_id"] == sha256
+    assert body["ref_id"]
+    # 등록 후 세션은 삭제됨
+    assert client.get(f"/api/upload/sessions/{session_id}").status_code == 404
+
+
+def test_session_finalize_rejects_hash_mismatch():
+    client = TestClient(app)
+    content = _pdf_bytes()
+    created = client.post(
+        "/api/upload/sessions", json={"filename": "doc.pdf", "size": len(content), "sha256": "0" * 64}
+    )
+    session_id = created.json()["session_id"]
+    _put(client, session_id, content, 0, len(content))
+
+    assert client.post(f"/api/upload/sessions/{session_id}/finalize").status_code == 422
+    assert client.get(f"/api/upload/sessions/{session_id}").status_code == 404
+
+
+def test_concurrent_finalize_returns_conflict_to_loser():
+    client = TestClient(app)
+    content = _pdf_bytes()
+    created = client.post("/api/upload/sessions", json={"filename": "doc.pdf", "size": len(content)})
+    session_id = created.json()["session_id"]
+    _put(client, session_id, content, 0, len(content))
+
+    async def finalize_twice():
+        return await asyncio.gather(
+            upload.finalize_upload_session(session_id),
+            upload.finalize_upload_session(session_id),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(finalize_twice())
+    assert first.file_id == hashlib.sha256(content).hexdigest()
+    assert isinstance(second, HTTPException)
+    assert second.status_code == 409
+
+    # 완료 처리가 끝나면 표시도 지워지고 세션은 없음
+    assert not upload.upload_sessions.is_finalizing(session_id)
+    assert client.post(f"/api/upload/sessions/{session_id}/finalize").status_code == 404
+
+
+def test_finalizing_session_rejects_range_writes():
+    client = TestClient(app)
+    content = _pdf_bytes()
+    created = client.post("/api/upload/sessions", json={"filename": "doc.pdf", "size": len(content)})
+    session_id = created.json()["session_id"]
+
+    assert upload.upload_sessions.begin_finalize(session_id)
+    assert not upload.upload_sessions.begin_finalize(session_id)
+    try:
+        assert _put(client, session_id, content, 0, len(content)).status_code == 409
+        assert client.delete(f"/api/upload/sessions/{session_id}").status_code == 409
+    finally:
+        upload.upload_sessions.end_finalize(session_id)
+    assert client.delete(f"/api/upload/sessions/{session_id}").status_code == 200
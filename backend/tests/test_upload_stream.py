@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import upload
+from app.services.upload_stream import (
+    FileTypeMismatchError,
+    UploadTooLargeError,
+    inspect_file,
+    save_upload_stream,
+    sniff_file_type,
+)
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"%PDF-1.7\n", "pdf"),
+    (b"PK\x03\x04\x14\x00", "zip"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "ole"),
+    (b"", "text"),
+    (b"plain text\r\n\tindented", "text"),
+    ("사업자등록증".encode("utf-8"), "text"),
+    ("사업자등록증".encode("cp949"), "text"),
+    (b"\xef\xbb\xbfUTF-8 BOM", "text"),
+    ("UTF-16".encode("utf-16"), "text"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", None),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", None),
+    (b"GIF89a\x01\x01\x01\x01", None),
+    (b"{\\rtf1\\ansi", None),
+    (b"II*\x00\x08\x00", None),
+    (b"\x1f\x8b\x08\x00", None),
+    (b"text then \x01 control", None),
+    (b"\x7fELF\x02\x01\x01", None),
+])
+def test_sniff_file_type(head, expected):
+    assert sniff_file_type(head) == expected
+
+
+def _save(tmp_path, content: bytes, extension: str, max_bytes: int = 1024, chunk_size: int = 4):
+    file = UploadFile(io.BytesIO(content), filename=f"upload{extension}")
+    return asyncio.run(save_upload_stream(
+        file, str(tmp_path), None, max_bytes=max_bytes, extension=extension, chunk_size=chunk_size
+    ))
+
+
+def test_save_upload_stream_hashes_in_chunks(tmp_path):
+    content = b"%PDF-1.4\n" + b"x" * 1000
+    stored = _save(tmp_path, content, ".pdf", max_bytes=2048)
+
+    assert stored.size == len(content)
+    assert stored.sha256 == hashlib.sha256(content).hexdigest()
+    assert stored.detected_type == "pdf"
+    with open(stored.path, "rb") as f:
+        assert f.read() == content
+
+
+def test_save_upload_stream_enforces_size_limit(tmp_path):
+    with pytest.raises(UploadTooLargeError):
+        _save(tmp_path, b"a" * 1025, ".txt", max_bytes=1024)
+    # 중단된 임시 파일은 남지 않음
+    assert os.listdir(tmp_path) == []
+
+
+def test_save_upload_stream_rejects_renamed_image(tmp_path):
+    with pytest.raises(FileTypeMismatchError):
+        _save(tmp_path, b"\x89PNG\r\n\x1a\n" + b"\x00" * 64, ".txt")
+    assert os.listdir(tmp_path) == []
+
+
+def test_short_file_is_sniffed_after_stream_ends(tmp_path):
+    assert _save(tmp_path, b"hi", ".txt").detected_type == "text"
+
+
+def test_inspect_file_checks_extension(tmp_path):
+    path = tmp_path / "renamed.pdf"
+    path.write_bytes(b"PK\x03\x04" + b"\x00" * 16)
+    assert inspect_file(str(path)).detected_type == "zip"
+    with pytest.raises(FileTypeMismatchError):
+        inspect_file(str(path), ".pdf")
+
+
+def test_upload_route_returns_413_over_limit(monkeypatch):
+    monkeypatch.setattr(upload, "MAX_FILE_SIZE", 16)
+    client = TestClient(app)
+
+    response = client.post("/api/upload", files={"file": ("big.txt", b"a" * 17, "text/plain")})
+
+    assert response.status_code == 413
+
+
+def test_upload_route_rejects_content_mismatch():
+    client = TestClient(app)
+    response = client.post("/api/upload", files={"file": ("image.txt", b"\x89PNG\r\n\x1a\n", "text/plain")})
+    assert response.status_code == 400
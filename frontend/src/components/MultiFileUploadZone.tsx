@@ -1,5 +1,5 @@
 import React, { useCallback, useState } from 'react';
-import { uploadFile } from '../services/api';
+import { uploadFile, uploadFiles } from '../services/api';
 
 export type FileType = 'financial' | 'shareholder' | 'corporate';
 
@@ -17,6 +17,42 @@ interface MultiFileUploadZoneProps {
   onError: (error: string) => void;
 }
 
+// 파일명 키워드로 항목 배정 (키워드가 없으면 남은 빈 항목에 순서대로 배정)
+const fileTypeKeywords: Record<FileType, string[]> = {
+  financial: ['사업자등록증', '사업자'],
+  shareholder: ['주주명부', '주주'],
+  corporate: ['재무제표', '재무상태표', '손익계산서', '재무'],
+};
+
+const assignFileTypes = (
+  selected: File[],
+  current: Record<FileType, FileUploadState>,
+): Partial<Record<FileType, File>> => {
+  const assignments: Partial<Record<FileType, File>> = {};
+  const isFree = (fileType: FileType) =>
+    !assignments[fileType] && !current[fileType].isUploaded && !current[fileType].isUploading;
+  const unmatched: File[] = [];
+
+  selected.forEach(file => {
+    const name = file.name.normalize('NFC');
+    const matched = (Object.keys(fileTypeKeywords) as FileType[]).find(
+      fileType => isFree(fileType) && fileTypeKeywords[fileType].some(keyword => name.includes(keyword)),
+    );
+    if (matched) {
+      assignments[matched] = file;
+    } else {
+      unmatched.push(file);
+    }
+  });
+  unmatched.forEach(file => {
+    const free = (Object.keys(fileTypeKeywords) as FileType[]).find(isFree);
+    if (free) {
+      assignments[free] = file;
+    }
+  });
+  return assignments;
+};
+
 export const MultiFileUploadZone: React.FC<MultiFileUploadZoneProps> = ({ onAllFilesUploaded, onStartupCertificateChange, onError }) => {
   const [files, setFiles] = useState<Record<FileType, FileUploadState>>({
     financial: { file: null, fileId: null, filename: null, isUploading: false, isUploaded: false },
@@ -31,6 +67,42 @@ export const MultiFileUploadZone: React.FC<MultiFileUploadZoneProps> = ({ onAllF
     corporate: '재무제표',
   };
 
+  // 업로드 완료된 항목 반영 후, 사업자등록증이 준비되었으면 상위 컴포넌트에 알림
+  const applyUploaded = useCallback((uploaded: Partial<Record<FileType, { file: File; fileId: string; filename: string }>>) => {
+    setFiles(prev => {
+      const updatedFiles = { ...prev };
+      (Object.keys(uploaded) as FileType[]).forEach(fileType => {
+        const item = uploaded[fileType]!;
+        updatedFiles[fileType] = {
+          file: item.file,
+          fileId: item.fileId,
+          filename: item.filename,
+          isUploading: false,
+          isUploaded: true,
+        };
+      });
+
+      // ⚠️ 임시: 사업자등록증만 있어도 분석 시작할 수 있도록
+      // financial 파일이 준비되면 현재까지의 파일 상태를 그대로 넘김
+      if (updatedFiles.financial.isUploaded && updatedFiles.financial.fileId) {
+        const simplified = {
+          financial: updatedFiles.financial.fileId
+            ? { fileId: updatedFiles.financial.fileId, filename: updatedFiles.financial.filename! }
+            : undefined,
+          shareholder: updatedFiles.shareholder.fileId
+            ? { fileId: updatedFiles.shareholder.fileId, filename: updatedFiles.shareholder.filename! }
+            : undefined,
+          corporate: updatedFiles.corporate.fileId
+            ? { fileId: updatedFiles.corporate.fileId, filename: updatedFiles.corporate.filename! }
+            : undefined,
+        };
+        setTimeout(() => onAllFilesUploaded(simplified, hasStartupCertificate), 0);
+      }
+
+      return updatedFiles;
+    });
+  }, [onAllFilesUploaded, hasStartupCertificate]);
+
   const handleFile = useCallback(async (file: File, fileType: FileType) => {
     // 파일 형식 검증
     const allowedTypes = ['.pdf', '.docx', '.doc', '.txt'];
@@ -55,39 +127,7 @@ export const MultiFileUploadZone: React.FC<MultiFileUploadZoneProps> = ({ onAllF
 
     try {
       const result = await uploadFile(file);
-      
-      // 업데이트된 파일 상태를 계산
-      setFiles(prev => {
-        const updatedFiles = {
-          ...prev,
-          [fileType]: {
-            file,
-            fileId: result.file_id,
-            filename: result.filename,
-            isUploading: false,
-            isUploaded: true,
-          },
-        };
-
-        // ⚠️ 임시: 사업자등록증만 있어도 분석 시작할 수 있도록
-        // financial 파일이 준비되면 현재까지의 파일 상태를 그대로 넘김
-        if (updatedFiles.financial.isUploaded && updatedFiles.financial.fileId) {
-          const simplified = {
-            financial: updatedFiles.financial.fileId
-              ? { fileId: updatedFiles.financial.fileId, filename: updatedFiles.financial.filename! }
-              : undefined,
-            shareholder: updatedFiles.shareholder.fileId
-              ? { fileId: updatedFiles.shareholder.fileId, filename: updatedFiles.shareholder.filename! }
-              : undefined,
-            corporate: updatedFiles.corporate.fileId
-              ? { fileId: updatedFiles.corporate.fileId, filename: updatedFiles.corporate.filename! }
-              : undefined,
-          };
-          setTimeout(() => onAllFilesUploaded(simplified, hasStartupCertificate), 0);
-        }
-
-        return updatedFiles;
-      });
+      applyUploaded({ [fileType]: { file, fileId: result.file_id, filename: result.filename } });
     } catch (error: any) {
       setFiles(prev => ({
         ...prev,
@@ -95,7 +135,70 @@ export const MultiFileUploadZone: React.FC<MultiFileUploadZoneProps> = ({ onAllF
       }));
       onError(error.response?.data?.detail || '파일 업로드 중 오류가 발생했습니다.');
     }
-  }, [onError, onAllFilesUploaded]);
+  }, [onError, applyUploaded]);
+
+  // 여러 파일을 한 번에 업로드하고 파일명으로 항목(사업자등록증/주주명부/재무제표)을 배정
+  const handleBatch = useCallback(async (selected: File[]) => {
+    const allowedTypes = ['.pdf', '.docx', '.doc', '.txt'];
+    const valid = selected.filter(file => allowedTypes.includes('.' + file.name.split('.').pop()?.toLowerCase()));
+    if (valid.length === 0) {
+      onError('지원하지 않는 파일 형식입니다. PDF, DOCX, TXT 파일만 업로드 가능합니다.');
+      return;
+    }
+
+    const assignments = assignFileTypes(valid, files);
+    const assignedTypes = Object.keys(assignments) as FileType[];
+    if (assignedTypes.length === 0) {
+      onError('업로드할 수 있는 빈 항목이 없습니다.');
+      return;
+    }
+
+    setFiles(prev => {
+      const next = { ...prev };
+      assignedTypes.forEach(fileType => {
+        next[fileType] = { ...prev[fileType], file: assignments[fileType]!, isUploading: true, isUploaded: false };
+      });
+      return next;
+    });
+
+    try {
+      const orderedFiles = assignedTypes.map(fileType => assignments[fileType]!);
+      const response = await uploadFiles(orderedFiles);
+      const uploaded: Partial<Record<FileType, { file: File; fileId: string; filename: string }>> = {};
+      const failures: string[] = [];
+      response.files.forEach((item, index) => {
+        const fileType = assignedTypes[index];
+        if (item.file_id && !item.error) {
+          uploaded[fileType] = { file: orderedFiles[index], fileId: item.file_id, filename: item.filename };
+        } else {
+          failures.push(`${item.filename}: ${item.error || '업로드 실패'}`);
+        }
+      });
+
+      setFiles(prev => {
+        const next = { ...prev };
+        assignedTypes.forEach(fileType => {
+          if (!uploaded[fileType]) {
+            next[fileType] = { ...prev[fileType], isUploading: false, isUploaded: false };
+          }
+        });
+        return next;
+      });
+      applyUploaded(uploaded);
+      if (failures.length > 0) {
+        onError(failures.join('\n'));
+      }
+    } catch (error: any) {
+      setFiles(prev => {
+        const next = { ...prev };
+        assignedTypes.forEach(fileType => {
+          next[fileType] = { ...prev[fileType], isUploading: false, isUploaded: false };
+        });
+        return next;
+      });
+      onError(error.response?.data?.detail || '파일 업로드 중 오류가 발생했습니다.');
+    }
+  }, [files, onError, applyUploaded]);
 
   const handleDrop = useCallback((e: React.DragEvent<HTMLDivElement>, fileType: FileType) => {
     e.preventDefault();
@@ -201,6 +304,35 @@ export const MultiFileUploadZone: React.FC<MultiFileUploadZoneProps> = ({ onAllF
 
   return (
     <div className="space-y-6">
+      <div
+        className="border-2 border-dashed rounded-lg p-4 text-center border-gray-600 hover:border-primary-400 cursor-pointer"
+        onDrop={(e) => {
+          e.preventDefault();
+          e.stopPropagation();
+          handleBatch(Array.from(e.dataTransfer.files));
+        }}
+        onDragOver={handleDragOver}
+        onClick={() => document.getElementById('file-input-batch')?.click()}
+      >
+        <input
+          id="file-input-batch"
+          type="file"
+          multiple
+          accept=".pdf,.docx,.doc,.txt"
+          className="hidden"
+          onChange={(e) => {
+            handleBatch(Array.from(e.target.files || []));
+            e.target.value = '';
+          }}
+        />
+        <p className="text-gray-300 text-sm">
+          여러 파일을 한 번에 드래그하거나 클릭하여 업로드
+        </p>
+        <p className="text-gray-400 text-xs">
+          파일명에 사업자등록증/주주명부/재무제표가 포함되면 해당 항목에 자동 배정
+        </p>
+      </div>
+
       {renderUploadZone('financial')}
       {renderUploadZone('shareholder')}
       {renderUploadZone('corporate')}
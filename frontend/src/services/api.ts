@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { UploadResponse, AnalysisResult } from '../types/analysis';
+import { UploadResponse, BatchUploadResponse, AnalysisResult } from '../types/analysis';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
@@ -63,14 +63,88 @@ export const uploadFile = async (file: File): Promise<UploadResponse> => {
   return response.data;
 };
 
-export const analyzeDocument = async (fileId: string): Promise<AnalysisResult> => {
+// 여러 파일을 한 번의 요청으로 업로드 (파일별 성공/실패는 응답 항목으로 확인)
+export const uploadFiles = async (files: File[]): Promise<BatchUploadResponse> => {
+  const formData = new FormData();
+  files.forEach((file) => formData.append('files', file));
+  
+  const response = await api.post<BatchUploadResponse>('/api/upload/batch', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+  
+  return response.data;
+};
+
+export const analyzeDocument = async (fileId: string, forceRefresh = false): Promise<AnalysisResult> => {
   const response = await api.post<AnalysisResult>('/api/analyze', {
     file_id: fileId,
+    force_refresh: forceRefresh,
   });
   
   return response.data;
 };
 
+export interface AnalysisStreamHandlers {
+  onProgress?: (event: Record<string, unknown>) => void;
+  onField?: (name: string, value: unknown) => void;
+}
+
+// 분석 결과를 SSE로 받아 필드가 완성될 때마다 onField 호출 (EventSource는 POST를 지원하지 않아 fetch 사용)
+export const analyzeDocumentStream = async (
+  fileId: string,
+  handlers: AnalysisStreamHandlers = {},
+  forceRefresh = false,
+): Promise<AnalysisResult> => {
+  const response = await fetch(`${API_BASE_URL}/api/analyze/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ file_id: fileId, force_refresh: forceRefresh }),
+  });
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || `분석 요청 실패 (${response.status})`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result: AnalysisResult | null = null;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (!data) continue;
+      const payload = JSON.parse(data);
+
+      if (event === 'progress') handlers.onProgress?.(payload);
+      else if (event === 'field') handlers.onField?.(payload.name, payload.value);
+      else if (event === 'result') result = payload;
+      else if (event === 'error') throw new Error(payload.detail);
+    }
+  }
+
+  if (!result) {
+    throw new Error('분석 결과를 받지 못했습니다.');
+  }
+  return result;
+};
+
 export interface BusinessRegistrationInfo {
   company_name?: string;
   opening_date_raw?: string;
@@ -125,6 +199,23 @@ export const analyzeFinancialStatement = async (fileId: string): Promise<Financi
   return response.data;
 };
 
+export type DocumentKind = 'business-registration' | 'shareholder' | 'financial-statement' | 'general';
+
+export interface AutoAnalysisResult {
+  kind: DocumentKind;
+  confidence?: number | null;
+  result: BusinessRegistrationInfo | ShareholderResult | FinancialStatementResult | AnalysisResult;
+}
+
+export const analyzeAuto = async (fileId: string, filename?: string): Promise<AutoAnalysisResult> => {
+  const response = await api.post<AutoAnalysisResult>('/api/analyze/auto', {
+    file_id: fileId,
+    filename: filename,
+  });
+
+  return response.data;
+};
+
 export const kakaoLogin = async (code: string) => {
   const response = await api.post('/api/auth/kakao/callback', {
     code: code,
@@ -25,4 +25,24 @@ export interface UploadResponse {
   file_id: string;
   filename: string;
   file_size: number;
+  sha256?: string;
+  deduplicated?: boolean;
+  ref_id?: string; // 업로드 참조 토큰 (삭제 요청에 필요)
+}
+
+export interface BatchUploadItem {
+  filename: string;
+  file_id?: string;
+  file_size?: number;
+  sha256?: string;
+  deduplicated?: boolean;
+  ref_id?: string;
+  status_code: number;
+  error?: string;
+}
+
+export interface BatchUploadResponse {
+  files: BatchUploadItem[];
+  succeeded: number;
+  failed: number;
 }